@@ -9,6 +9,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 from collections import Counter
+from utils import build_ingredient_map, parse_ingredient_labels, IngredientCategorizer
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -16,6 +17,17 @@ warnings.filterwarnings('ignore')
 plt.rcParams['font.family'] = ['Arial Unicode MS', 'Malgun Gothic', 'DejaVu Sans']
 plt.rcParams['axes.unicode_minus'] = False
 
+# 재료 카테고리 (재료명에 키워드가 포함된 첫 카테고리로 분류)
+INGREDIENT_CATEGORIES = {
+    'Spirits': ['Gin', 'Vodka', 'Rum', 'Whiskey', 'Tequila', 'Mezcal', 'Bourbon', 'Brandy'],
+    'Liqueurs': ['Liqueur', 'Aperitivo', 'Amaretto', 'Cointreau', 'Triple Sec', 'Vermouth'],
+    'Juices': ['Juice', 'Lemon', 'Lime', 'Orange', 'Cranberry', 'Pineapple'],
+    'Mixers': ['Syrup', 'Bitters', 'Soda', 'Tonic', 'Ginger', 'Club Soda'],
+    'Garnish': ['Mint', 'Cherry', 'Olive', 'Twist', 'Salt', 'Sugar'],
+    'Others': []
+}
+INGREDIENT_CATEGORIZER = IngredientCategorizer(INGREDIENT_CATEGORIES)
+
 class TopIngredientsAnalyzer:
     def __init__(self):
         self.orders_df = None
@@ -23,6 +35,7 @@ class TopIngredientsAnalyzer:
         self.cocktail_info = {}
         self.ingredient_usage = {}
         self.menu_ingredients = {}
+        self.cocktail_ingredients = {}
         
     def load_data(self, orders_path='data/orders.csv', cocktails_path='data/cocktails.csv'):
         """주문 데이터와 칵테일 메뉴 데이터를 로딩합니다."""
@@ -49,6 +62,7 @@ class TopIngredientsAnalyzer:
             self.cocktails_df = pd.read_csv(cocktails_path)
             cocktails_df_unique = self.cocktails_df.drop_duplicates(subset=['Cocktail Name'], keep='first')
             self.cocktail_info = cocktails_df_unique.set_index('Cocktail Name').to_dict('index')
+            self.cocktail_ingredients = build_ingredient_map(self.cocktail_info)
             
             print(f"주문 데이터: {len(self.orders_df)}건")
             print(f"칵테일 메뉴: {len(self.cocktails_df)}개")
@@ -67,15 +81,9 @@ class TopIngredientsAnalyzer:
             if pd.isna(ingredients_str) or not ingredients_str:
                 continue
             
-            # 재료 파싱 (쉼표로 구분)
-            ingredients = [ing.strip() for ing in ingredients_str.split(',')]
-            
-            for ingredient in ingredients:
-                if ingredient:
-                    # 재료명 정리 (수량 정보 제거)
-                    clean_ingredient = ingredient.split('(')[0].strip()
-                    if clean_ingredient:
-                        self.menu_ingredients[clean_ingredient] = self.menu_ingredients.get(clean_ingredient, 0) + 1
+            # 재료 파싱 (공용 파서 사용, 괄호 안 메모 제거)
+            for clean_ingredient in parse_ingredient_labels(ingredients_str):
+                self.menu_ingredients[clean_ingredient] = self.menu_ingredients.get(clean_ingredient, 0) + 1
     
     def calculate_actual_usage(self):
         """실제 주문 데이터 기반으로 재료 사용량을 계산합니다."""
@@ -85,16 +93,9 @@ class TopIngredientsAnalyzer:
             cocktail_name = order['cocktail_name']
             quantity = order['quantity']
             
-            # 해당 칵테일의 재료 찾기
-            if cocktail_name in self.cocktail_info:
-                ingredients_str = self.cocktail_info[cocktail_name].get('Ingredients', '')
-                if ingredients_str:
-                    ingredients = [ing.strip().split('(')[0].strip() 
-                                 for ing in ingredients_str.split(',')]
-                    
-                    for ingredient in ingredients:
-                        if ingredient:
-                            self.ingredient_usage[ingredient] = self.ingredient_usage.get(ingredient, 0) + quantity
+            # 해당 칵테일의 재료 찾기 (로딩 시 미리 파싱된 목록 사용)
+            for ingredient in self.cocktail_ingredients.get(cocktail_name, []):
+                self.ingredient_usage[ingredient] = self.ingredient_usage.get(ingredient, 0) + quantity
     
     def get_top_ingredients(self, top_n=10):
         """TOP N 재료를 반환합니다."""
@@ -110,31 +111,7 @@ class TopIngredientsAnalyzer:
     
     def analyze_ingredient_categories(self):
         """재료를 카테고리별로 분류합니다."""
-        categories = {
-            'Spirits': ['Gin', 'Vodka', 'Rum', 'Whiskey', 'Tequila', 'Mezcal', 'Bourbon', 'Brandy'],
-            'Liqueurs': ['Liqueur', 'Aperitivo', 'Amaretto', 'Cointreau', 'Triple Sec', 'Vermouth'],
-            'Juices': ['Juice', 'Lemon', 'Lime', 'Orange', 'Cranberry', 'Pineapple'],
-            'Mixers': ['Syrup', 'Bitters', 'Soda', 'Tonic', 'Ginger', 'Club Soda'],
-            'Garnish': ['Mint', 'Cherry', 'Olive', 'Twist', 'Salt', 'Sugar'],
-            'Others': []
-        }
-        
-        category_usage = {cat: 0 for cat in categories.keys()}
-        ingredient_classification = {}
-        
-        for ingredient, usage in self.ingredient_usage.items():
-            categorized = False
-            for category, keywords in categories.items():
-                if any(keyword.lower() in ingredient.lower() for keyword in keywords):
-                    category_usage[category] += usage
-                    ingredient_classification[ingredient] = category
-                    categorized = True
-                    break
-            if not categorized:
-                category_usage['Others'] += usage
-                ingredient_classification[ingredient] = 'Others'
-        
-        return category_usage, ingredient_classification
+        return INGREDIENT_CATEGORIZER.usage_by_category(self.ingredient_usage)
     
     def create_visualizations(self, show_plots=True):
         """TOP 10 재료 분석 시각화를 생성합니다."""
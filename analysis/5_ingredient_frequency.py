@@ -9,6 +9,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 from scipy import stats
+from utils import build_ingredient_map
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -23,6 +24,7 @@ class IngredientFrequencyAnalyzer:
         self.cocktail_info = {}
         self.ingredient_usage = {}
         self.frequency_stats = {}
+        self.cocktail_ingredients = {}
         
     def load_data(self, orders_path='data/orders.csv', cocktails_path='data/cocktails.csv'):
         """주문 데이터와 칵테일 메뉴 데이터를 로딩합니다."""
@@ -49,6 +51,7 @@ class IngredientFrequencyAnalyzer:
             self.cocktails_df = pd.read_csv(cocktails_path)
             cocktails_df_unique = self.cocktails_df.drop_duplicates(subset=['Cocktail Name'], keep='first')
             self.cocktail_info = cocktails_df_unique.set_index('Cocktail Name').to_dict('index')
+            self.cocktail_ingredients = build_ingredient_map(self.cocktail_info)
             
             print(f"주문 데이터: {len(self.orders_df)}건")
             print(f"칵테일 메뉴: {len(self.cocktails_df)}개")
@@ -66,16 +69,9 @@ class IngredientFrequencyAnalyzer:
             cocktail_name = order['cocktail_name']
             quantity = order['quantity']
             
-            # 해당 칵테일의 재료 찾기
-            if cocktail_name in self.cocktail_info:
-                ingredients_str = self.cocktail_info[cocktail_name].get('Ingredients', '')
-                if ingredients_str:
-                    ingredients = [ing.strip().split('(')[0].strip() 
-                                 for ing in ingredients_str.split(',')]
-                    
-                    for ingredient in ingredients:
-                        if ingredient:
-                            self.ingredient_usage[ingredient] = self.ingredient_usage.get(ingredient, 0) + quantity
+            # 해당 칵테일의 재료 찾기 (로딩 시 미리 파싱된 목록 사용)
+            for ingredient in self.cocktail_ingredients.get(cocktail_name, []):
+                self.ingredient_usage[ingredient] = self.ingredient_usage.get(ingredient, 0) + quantity
     
     def analyze_frequency_distribution(self):
         """사용 빈도 분포를 분석합니다."""
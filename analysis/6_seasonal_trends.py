@@ -8,6 +8,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+from utils import build_ingredient_map, IngredientCategorizer
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -15,6 +16,15 @@ warnings.filterwarnings('ignore')
 plt.rcParams['font.family'] = ['Arial Unicode MS', 'Malgun Gothic', 'DejaVu Sans']
 plt.rcParams['axes.unicode_minus'] = False
 
+# 계절별 분포에 쓰는 재료 카테고리 (재료명에 키워드가 포함된 첫 카테고리로 분류)
+SEASONAL_CATEGORIES = {
+    'Spirits': ['Gin', 'Vodka', 'Rum', 'Whiskey', 'Tequila', 'Mezcal', 'Bourbon'],
+    'Liqueurs': ['Liqueur', 'Aperitivo', 'Amaretto', 'Cointreau'],
+    'Citrus': ['Lemon', 'Lime', 'Orange'],
+    'Others': []
+}
+SEASONAL_CATEGORIZER = IngredientCategorizer(SEASONAL_CATEGORIES)
+
 class SeasonalIngredientAnalyzer:
     def __init__(self):
         self.orders_df = None
@@ -22,6 +32,7 @@ class SeasonalIngredientAnalyzer:
         self.cocktail_info = {}
         self.seasonal_ingredients = {}
         self.seasonal_patterns = {}
+        self.cocktail_ingredients = {}
         
     def load_data(self, orders_path='data/orders.csv', cocktails_path='data/cocktails.csv'):
         """주문 데이터와 칵테일 메뉴 데이터를 로딩합니다."""
@@ -58,6 +69,7 @@ class SeasonalIngredientAnalyzer:
             self.cocktails_df = pd.read_csv(cocktails_path)
             cocktails_df_unique = self.cocktails_df.drop_duplicates(subset=['Cocktail Name'], keep='first')
             self.cocktail_info = cocktails_df_unique.set_index('Cocktail Name').to_dict('index')
+            self.cocktail_ingredients = build_ingredient_map(self.cocktail_info)
             
             print(f"주문 데이터: {len(self.orders_df)}건")
             print(f"칵테일 메뉴: {len(self.cocktails_df)}개")
@@ -80,15 +92,9 @@ class SeasonalIngredientAnalyzer:
                 cocktail_name = order['cocktail_name']
                 quantity = order['quantity']
                 
-                if cocktail_name in self.cocktail_info:
-                    ingredients_str = self.cocktail_info[cocktail_name].get('Ingredients', '')
-                    if ingredients_str:
-                        ingredients = [ing.strip().split('(')[0].strip() 
-                                     for ing in ingredients_str.split(',')]
-                        
-                        for ingredient in ingredients:
-                            if ingredient:
-                                season_ingredient_usage[ingredient] = season_ingredient_usage.get(ingredient, 0) + quantity
+                # 로딩 시 미리 파싱된 재료 목록 사용
+                for ingredient in self.cocktail_ingredients.get(cocktail_name, []):
+                    season_ingredient_usage[ingredient] = season_ingredient_usage.get(ingredient, 0) + quantity
             
             self.seasonal_ingredients[season] = season_ingredient_usage
     
@@ -288,31 +294,13 @@ class SeasonalIngredientAnalyzer:
         axes[2,0].set_xticks(range(1, 13))
         
         # 6. 계절별 재료 카테고리 분포
-        ingredient_categories = {
-            'Spirits': ['Gin', 'Vodka', 'Rum', 'Whiskey', 'Tequila', 'Mezcal', 'Bourbon'],
-            'Liqueurs': ['Liqueur', 'Aperitivo', 'Amaretto', 'Cointreau'],
-            'Citrus': ['Lemon', 'Lime', 'Orange'],
-            'Others': []
-        }
-        
         seasonal_category_data = {}
         for season in ['봄', '여름', '가을', '겨울']:
-            category_usage = {cat: 0 for cat in ingredient_categories.keys()}
-            
-            for ingredient, usage in self.seasonal_ingredients[season].items():
-                categorized = False
-                for category, keywords in ingredient_categories.items():
-                    if any(keyword.lower() in ingredient.lower() for keyword in keywords):
-                        category_usage[category] += usage
-                        categorized = True
-                        break
-                if not categorized:
-                    category_usage['Others'] += usage
-            
+            category_usage, _ = SEASONAL_CATEGORIZER.usage_by_category(self.seasonal_ingredients[season])
             seasonal_category_data[season] = category_usage
         
         # 스택 바 차트
-        categories = list(ingredient_categories.keys())
+        categories = list(SEASONAL_CATEGORIES.keys())
         seasons = ['봄', '여름', '가을', '겨울']
         
         bottom = np.zeros(len(seasons))
@@ -338,12 +326,7 @@ class SeasonalIngredientAnalyzer:
     
     def _get_ingredients(self, cocktail_name):
         """칵테일명으로부터 재료 리스트를 반환합니다."""
-        if cocktail_name in self.cocktail_info:
-            ingredients_str = self.cocktail_info[cocktail_name].get('Ingredients', '')
-            if ingredients_str:
-                return [ing.strip().split('(')[0].strip() 
-                       for ing in ingredients_str.split(',') if ing.strip()]
-        return []
+        return self.cocktail_ingredients.get(cocktail_name, [])
     
     def generate_report(self):
         """계절별 재료 트렌드 분석 리포트를 생성합니다."""
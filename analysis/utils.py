@@ -3,8 +3,18 @@ Analysis 모듈을 위한 공통 유틸리티 함수들
 """
 
 import os
+import sys
 import pandas as pd
 
+# src 패키지(공용 재료 파서)를 사용하기 위해 프로젝트 루트를 Python 경로에 추가
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
+
+from src.utils.ingredient_parser import split_ingredients
+from src.utils.ingredient_canon import canonical_ingredient
+from src.utils.aho_corasick import AhoCorasick
+
 def get_data_path(filename):
     """
     프로젝트 루트에서 데이터 파일의 절대 경로를 반환합니다.
@@ -100,6 +110,72 @@ def load_cocktails_data(file_path=None):
         print(f"ERROR: 칵테일 데이터 로딩 실패: {e}")
         return None
 
+def parse_ingredient_labels(ingredients_str):
+    """재료 문자열을 분석용 기본 재료명(canonical_ingredient) 리스트로 변환합니다."""
+    if not isinstance(ingredients_str, str) or not ingredients_str:
+        return []
+    labels = [canonical_ingredient(raw) for raw in split_ingredients(ingredients_str)]
+    return [label for label in labels if label]
+
+def build_ingredient_map(cocktail_info):
+    """
+    칵테일명 -> 재료 키 리스트 매핑을 만듭니다.
+    메뉴 로딩 시 한 번만 파싱하여 주문 단위 반복문에서 문자열을 다시 나누지 않도록 합니다.
+    """
+    return {
+        name: parse_ingredient_labels(info.get('Ingredients', ''))
+        for name, info in cocktail_info.items()
+    }
+
+class IngredientCategorizer:
+    """
+    재료명 -> 카테고리 분류기 (분석 4, 6 공용)
+
+    categories는 {카테고리: [키워드, ...]} 이며, 재료명에 키워드가 (대소문자 무시) 포함된
+    카테고리 중 먼저 나온 카테고리로 분류합니다. 아무 키워드도 없으면 default 입니다.
+    모든 키워드를 Aho–Corasick 오토마톤 하나로 만들어 재료명을 한 번만 훑고,
+    같은 재료명은 처음 한 번만 분류합니다.
+    """
+
+    def __init__(self, categories, default='Others'):
+        self.categories = list(categories)
+        self.default = default
+        self._automaton = AhoCorasick(
+            (keyword.lower(), rank)
+            for rank, keywords in enumerate(categories.values())
+            for keyword in keywords
+        )
+        self._memo = {}
+
+    def classify(self, ingredient):
+        category = self._memo.get(ingredient)
+        if category is None:
+            best = len(self.categories)
+            for _, rank in self._automaton.search(ingredient.lower()):
+                if rank < best:
+                    best = rank
+                    if best == 0:
+                        break
+            category = self.categories[best] if best < len(self.categories) else self.default
+            self._memo[ingredient] = category
+        return category
+
+    def usage_by_category(self, ingredient_usage):
+        """
+        {재료명: 사용량} 을 카테고리별 합계로 묶습니다.
+
+        Returns:
+            ({카테고리: 사용량}, {재료명: 카테고리})
+        """
+        category_usage = {category: 0 for category in self.categories}
+        category_usage.setdefault(self.default, 0)
+        classification = {}
+        for ingredient, usage in ingredient_usage.items():
+            category = self.classify(ingredient)
+            category_usage[category] += usage
+            classification[ingredient] = category
+        return category_usage, classification
+
 # GUI에서 사용할 수 있는 분석 함수들의 매핑
 ANALYSIS_FUNCTIONS = {
     '시간대별 판매량 트렌드': '1_hourly_sales_trend.run_hourly_sales_analysis',
@@ -1,8 +1,13 @@
 from .conn import db_connect
+from src.utils.ingredient_parser import parse_ingredients
 
 conn = db_connect()
 cur = conn.cursor()
 
+# 가격순 정렬식 (가격이 없는 행은 맨 뒤)
+PRICE_NULL_SORT = 1e308
+PRICE_SORT = f"COALESCE(price, {PRICE_NULL_SORT!r})"
+
 """
 Create Cocktail Table
 """
@@ -21,6 +26,10 @@ def cockail_create():
 """
   
   cur.execute(query)
+  # 가격순 키셋 페이지네이션용 인덱스 (name은 PRIMARY KEY 인덱스 사용)
+  # 정렬식(PRICE_SORT)과 똑같은 식으로 만들어야 ORDER BY / 키 비교에 인덱스가 쓰입니다.
+  cur.execute("DROP INDEX IF EXISTS idx_cocktail_price_name")
+  cur.execute(f"CREATE INDEX IF NOT EXISTS idx_cocktail_price_key ON Cocktail ({PRICE_SORT}, name)")
 
 
 
@@ -28,47 +37,189 @@ def cockail_create():
 Cocktail Select
 
 칵테일 테이블의 전체 조회
+조회 함수는 cursor를 넘기면 해당 커서(예: 작업 스레드 전용 연결)로 실행합니다.
+모듈 연결(cur)은 이 모듈을 처음 import한 스레드에서만 사용할 수 있습니다.
 """
 
-def cocktail_select():
+def cocktail_select(cursor=None):
+    cursor = cursor or cur
     query = """
     select * from Cocktail;
     """
-    cur.execute(query)
-    result = cur.fetchall()
+    cursor.execute(query)
+    result = cursor.fetchall()
     return result
 
 
+"""
+Cocktail Select Page
+
+키셋(keyset) 페이지네이션으로 한 페이지만 조회
+- order_by='name'  : after_key = 마지막 행의 name
+- order_by='price' : after_key = 마지막 행의 (정렬용 가격, name) -> cocktail_page_key 사용
+- filters: name_contains, min_price, max_price
+
+가격이 없는(NULL) 행은 NULL끼리 행 값 비교가 되지 않아 페이지가 끊기므로
+COALESCE로 가장 큰 값(PRICE_NULL_SORT)으로 바꿔 맨 뒤에 둡니다.
+"""
+
+PAGE_ORDERS = {
+    'name': ('name',),
+    'price': (PRICE_SORT, 'name'),
+}
+
+
+def _page_filters(name_contains=None, min_price=None, max_price=None):
+    clauses = []
+    params = []
+    if name_contains:
+        escaped = name_contains.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        clauses.append("name LIKE ? ESCAPE '\\'")
+        params.append(f"%{escaped}%")
+    if min_price is not None:
+        clauses.append("price >= ?")
+        params.append(min_price)
+    if max_price is not None:
+        clauses.append("price <= ?")
+        params.append(max_price)
+    return clauses, params
+
+
+def cocktail_select_page(after_key=None, limit=10, order_by='name', cursor=None, **filters):
+    if order_by not in PAGE_ORDERS:
+        raise ValueError(f"지원하지 않는 정렬 기준: {order_by}")
+    key_columns = PAGE_ORDERS[order_by]
+
+    clauses, params = _page_filters(**filters)
+    if after_key is not None:
+        if len(key_columns) == 1:
+            clauses.append(f"{key_columns[0]} > ?")
+            params.append(after_key)
+        else:
+            # 앞의 범위 조건은 인덱스 탐색(SEARCH)용, 행 값 비교가 실제 키 조건
+            clauses.append(f"{key_columns[0]} >= ?")
+            clauses.append(f"({', '.join(key_columns)}) > ({', '.join('?' for _ in key_columns)})")
+            params.append(after_key[0])
+            params.extend(after_key)
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    query = f"""
+    SELECT * FROM Cocktail
+    {where}
+    ORDER BY {', '.join(key_columns)}
+    LIMIT ?;
+    """
+    cursor = cursor or cur
+    cursor.execute(query, (*params, limit))
+    return cursor.fetchall()
+
+
+def cocktail_page_key(row, order_by='name'):
+    """행에서 다음 페이지 조회용 키를 만듭니다."""
+    if order_by == 'price':
+        return (row[5] if row[5] is not None else PRICE_NULL_SORT, row[0])
+    return row[0]
+
+
+def cocktail_count(cursor=None, **filters):
+    cursor = cursor or cur
+    clauses, params = _page_filters(**filters)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    cursor.execute(f"SELECT COUNT(*) FROM Cocktail {where}", params)
+    return cursor.fetchone()[0]
+
+
+"""
+Cocktail Price Statistics
+
+가격 백분위수 / 히스토그램을 가격 목록을 읽지 않고 SQL로 계산합니다.
+가격이 있는 행은 PRICE_SORT 값이 price와 같으므로 price 대신 PRICE_SORT를 읽어
+가격순 인덱스 범위만 읽고 테이블 행은 읽지 않습니다.
+"""
+
+def cocktail_prices_at(positions, cursor=None):
+    """
+    가격이 있는 행을 가격순으로 세웠을 때 positions번째(0부터) 가격 {위치: 가격}
+    가격순 커버링 인덱스를 가장 뒤 위치까지 한 번만 훑으며, 행이 모자라 없는 위치는 결과에서 빠집니다.
+    """
+    wanted = set(positions)
+    if not wanted:
+        return {}
+    cursor = cursor or cur
+    cursor.execute(f"""
+    SELECT {PRICE_SORT} FROM Cocktail
+    WHERE {PRICE_SORT} < ?
+    ORDER BY {PRICE_SORT}
+    LIMIT ?
+    """, (PRICE_NULL_SORT, max(wanted) + 1))
+    return {pos: row[0] for pos, row in enumerate(cursor) if pos in wanted}
+
+
+def cocktail_price_histogram(low, width, bins, cursor=None):
+    """[low + width * i, low + width * (i + 1)) 구간별 개수 {i: count} (마지막 구간은 최댓값 포함)"""
+    cursor = cursor or cur
+    cursor.execute(f"""
+    SELECT MIN(CAST(({PRICE_SORT} - ?) / ? AS INTEGER), ?) AS bucket, COUNT(*)
+    FROM Cocktail
+    WHERE {PRICE_SORT} < ?
+    GROUP BY bucket
+    """, (low, width, bins - 1, PRICE_NULL_SORT))
+    return dict(cursor.fetchall())
+
+
 """
 Coctail Insert
 
 칵테일 
 """
 
-def coctail_insert(name, ingredients, garnish=None, glassware=None, preparation=None, price=0.0, note=None):
+def coctail_insert(name, ingredients, garnish=None, glassware=None, preparation=None, price=0.0, note=None,
+                   cursor=None):
+    cursor = cursor or cur
     query = """
     INSERT INTO Cocktail (name, ingredients, garnish, glassware, preparation, price, note)
     VALUES (?, ?, ?, ?, ?, ?, ?)
     """
-    cur.execute(query, (name, ingredients, garnish, glassware, preparation, price, note))
-    conn.commit()
+    cursor.execute(query, (name, ingredients, garnish, glassware, preparation, price, note))
+    cocktail_ingredient_replace(name, ingredients, cursor)
+    cursor.connection.commit()
     return True
 
 
 """
 Coctail Update
+
+전달된 컬럼만 수정합니다. 재료가 바뀌면 CocktailIngredient도 다시 채웁니다.
 """
 
-def coctail_update():
-  return 0
+COCKTAIL_COLUMNS = ('ingredients', 'garnish', 'glassware', 'preparation', 'price', 'note')
+
+def coctail_update(name, **fields):
+    fields = {k: v for k, v in fields.items() if k in COCKTAIL_COLUMNS}
+    if not fields:
+        return 0
+
+    assignments = ", ".join(f"{column} = ?" for column in fields)
+    query = f"UPDATE Cocktail SET {assignments} WHERE name = ?"
+    cur.execute(query, (*fields.values(), name))
+    updated = cur.rowcount
+
+    if updated and 'ingredients' in fields:
+        cocktail_ingredient_replace(name, fields['ingredients'])
+    conn.commit()
+    return updated
 
 
 """
 Coctail Delete
 """
 
-def coctail_delete():
-  return 0
+def coctail_delete(name):
+    cur.execute("DELETE FROM Cocktail WHERE name = ?", (name,))
+    deleted = cur.rowcount
+    cur.execute("DELETE FROM CocktailIngredient WHERE cocktail = ?", (name,))
+    conn.commit()
+    return deleted
 
 """
 Coctail where
@@ -77,3 +228,361 @@ Coctail where
 def coctail_name_where(name : str):
     query = """
     """
+
+
+"""
+Create CocktailIngredient Table
+
+재료 문자열을 수입 시 한 번만 파싱하여 (칵테일, 순서) 단위로 저장
+"""
+
+def cocktail_ingredient_create():
+    query = """
+    CREATE TABLE IF NOT EXISTS CocktailIngredient (
+      cocktail TEXT NOT NULL,
+      position INTEGER NOT NULL,
+      amount REAL,
+      unit TEXT,
+      raw TEXT NOT NULL,
+      ingredient TEXT NOT NULL,
+      PRIMARY KEY (cocktail, position)
+    );
+    """
+    cur.execute(query)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_cocktail_ingredient_ingredient ON CocktailIngredient (ingredient)")
+    conn.commit()
+
+
+"""
+CocktailIngredient Replace
+
+칵테일 한 개의 재료 행을 다시 채웁니다. (commit은 호출자 책임)
+cursor를 넘기면 해당 커서(예: 일괄 수입용 연결)로 실행합니다.
+"""
+
+def cocktail_ingredient_rows(name, ingredients):
+    return [
+        (name, p.position, p.amount, p.unit, p.raw, p.ingredient)
+        for p in parse_ingredients(ingredients or "")
+    ]
+
+
+def cocktail_ingredient_replace(name, ingredients, cursor=None):
+    cursor = cursor or cur
+    cursor.execute("DELETE FROM CocktailIngredient WHERE cocktail = ?", (name,))
+    cursor.executemany("""
+    INSERT INTO CocktailIngredient (cocktail, position, amount, unit, raw, ingredient)
+    VALUES (?, ?, ?, ?, ?, ?)
+    """, cocktail_ingredient_rows(name, ingredients))
+
+
+"""
+CocktailIngredient Rebuild
+
+Cocktail 테이블 전체로부터 재료 테이블을 다시 만듭니다.
+"""
+
+def cocktail_ingredient_rebuild(cursor=None):
+    cursor = cursor or cur
+    rows = cursor.execute("SELECT name, ingredients FROM Cocktail").fetchall()
+    cursor.execute("DELETE FROM CocktailIngredient")
+    for name, ingredients in rows:
+        cocktail_ingredient_replace(name, ingredients, cursor)
+    cursor.connection.commit()
+    return len(rows)
+
+
+"""
+CocktailIngredient Select
+"""
+
+def cocktail_ingredient_select(name, cursor=None):
+    cursor = cursor or cur
+    query = """
+    SELECT position, amount, unit, raw, ingredient
+    FROM CocktailIngredient
+    WHERE cocktail = ?
+    ORDER BY position;
+    """
+    cursor.execute(query, (name,))
+    return cursor.fetchall()
+
+
+def cocktail_ingredient_select_all(cursor=None):
+    cursor = cursor or cur
+    query = """
+    SELECT cocktail, position, amount, unit, raw, ingredient
+    FROM CocktailIngredient
+    ORDER BY cocktail, position;
+    """
+    cursor.execute(query)
+    return cursor.fetchall()
+
+
+"""
+Catalog Version
+
+Cocktail 테이블이 바뀔 때마다 트리거로 version을 1씩 올립니다.
+token은 DB 파일마다 한 번 생성되는 값으로, DB 파일 자체가 교체된 경우를 구분합니다.
+스냅샷/캐시는 (token, version)이 같으면 최신으로 간주합니다.
+"""
+
+def catalog_version_create():
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS CatalogVersion (
+      id INTEGER PRIMARY KEY CHECK (id = 1),
+      token TEXT NOT NULL,
+      version INTEGER NOT NULL DEFAULT 0
+    );
+    """)
+    cur.execute("INSERT OR IGNORE INTO CatalogVersion (id, token, version) VALUES (1, lower(hex(randomblob(8))), 0)")
+    for event in ('INSERT', 'UPDATE', 'DELETE'):
+        cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_cocktail_version_{event.lower()}
+        AFTER {event} ON Cocktail
+        BEGIN
+          UPDATE CatalogVersion SET version = version + 1 WHERE id = 1;
+        END;
+        """)
+    conn.commit()
+
+
+def catalog_version(cursor=None):
+    cursor = cursor or cur
+    row = cursor.execute("SELECT token, version FROM CatalogVersion WHERE id = 1").fetchone()
+    return (row[0], row[1]) if row else None
+
+
+"""
+Cocktail Search (FTS5)
+
+name / ingredients / garnish / glassware / note 전문 검색용 외부 콘텐츠(external content) 테이블
+Cocktail 행의 rowid를 그대로 사용하며 트리거로 동기화합니다.
+INSERT OR REPLACE로 덮어쓰는 경우 DELETE 트리거가 실행되지 않으므로
+BEFORE INSERT 트리거에서 같은 이름의 기존 항목을 먼저 지웁니다.
+
+Cocktail은 name이 PRIMARY KEY라 rowid가 암묵적이고 VACUUM 때 번호가 바뀔 수 있습니다.
+그러면 색인의 rowid가 다른 행을 가리키므로, (rowid, name) 체크섬을 CocktailSearchState에
+트리거로 유지하고 시작할 때 실제 값과 다르면 색인을 다시 만듭니다.
+"""
+
+SEARCH_COLUMNS = ('name', 'ingredients', 'garnish', 'glassware', 'note')
+
+# bm25() 컬럼 가중치 (SEARCH_COLUMNS 순서)
+SEARCH_WEIGHTS = (10.0, 4.0, 2.0, 1.0, 1.0)
+
+
+def _search_row_checksum(prefix=''):
+    """Cocktail 행 하나의 (rowid, name) 체크섬 SQL 식 (prefix: 'new.' / 'old.' / '')"""
+    name = f"{prefix}name"
+    return (f"({prefix}rowid * ifnull((length({name}) * 131 + unicode({name}) * 31"
+            f" + unicode(substr({name}, -1))) % 1000003, 0))")
+
+
+def cocktail_search_create():
+    columns = ', '.join(SEARCH_COLUMNS)
+    old_columns = ', '.join(f"old.{c}" for c in SEARCH_COLUMNS)
+    new_columns = ', '.join(f"new.{c}" for c in SEARCH_COLUMNS)
+    delete_old = f"""
+      INSERT INTO CocktailSearch (CocktailSearch, rowid, {columns})
+      VALUES ('delete', old.rowid, {old_columns});"""
+    insert_new = f"""
+      INSERT INTO CocktailSearch (rowid, {columns})
+      VALUES (new.rowid, {new_columns});"""
+
+    created = not cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'CocktailSearch'"
+    ).fetchone()
+    cur.execute(f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS CocktailSearch USING fts5(
+      {columns},
+      content='Cocktail',
+      content_rowid='rowid',
+      tokenize='unicode61 remove_diacritics 2',
+      prefix='2 3'
+    );
+    """)
+
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_cocktail_search_replace
+    BEFORE INSERT ON Cocktail
+    BEGIN
+      INSERT INTO CocktailSearch (CocktailSearch, rowid, {columns})
+      SELECT 'delete', rowid, {columns} FROM Cocktail WHERE name = new.name;
+    END;
+    """)
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_cocktail_search_insert
+    AFTER INSERT ON Cocktail
+    BEGIN{insert_new}
+    END;
+    """)
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_cocktail_search_update
+    AFTER UPDATE ON Cocktail
+    BEGIN{delete_old}{insert_new}
+    END;
+    """)
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_cocktail_search_delete
+    AFTER DELETE ON Cocktail
+    BEGIN{delete_old}
+    END;
+    """)
+
+    # 색인을 만든 뒤의 (rowid, name) 체크섬 - 쓰기 트리거로 함께 갱신
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS CocktailSearchState (
+      id INTEGER PRIMARY KEY CHECK (id = 1),
+      checksum INTEGER NOT NULL
+    );
+    """)
+    update_sum = "UPDATE CocktailSearchState SET checksum = checksum {} {} WHERE id = 1;"
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_cocktail_search_sum_replace
+    BEFORE INSERT ON Cocktail
+    BEGIN
+      UPDATE CocktailSearchState SET checksum = checksum - (
+        SELECT ifnull(SUM({_search_row_checksum()}), 0) FROM Cocktail WHERE name = new.name
+      ) WHERE id = 1;
+    END;
+    """)
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_cocktail_search_sum_insert
+    AFTER INSERT ON Cocktail
+    BEGIN
+      {update_sum.format('+', _search_row_checksum('new.'))}
+    END;
+    """)
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_cocktail_search_sum_update
+    AFTER UPDATE OF name ON Cocktail
+    BEGIN
+      {update_sum.format('-', _search_row_checksum('old.'))}
+      {update_sum.format('+', _search_row_checksum('new.'))}
+    END;
+    """)
+    cur.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_cocktail_search_sum_delete
+    AFTER DELETE ON Cocktail
+    BEGIN
+      {update_sum.format('-', _search_row_checksum('old.'))}
+    END;
+    """)
+
+    # 처음 만들었거나 rowid가 바뀌었으면(VACUUM 등) Cocktail 전체로 색인을 다시 채웁니다.
+    if created or not cocktail_search_is_current():
+        cocktail_search_rebuild()
+    conn.commit()
+
+
+def cocktail_search_checksum(cursor=None):
+    """현재 Cocktail 행들의 (rowid, name) 체크섬"""
+    cursor = cursor or cur
+    return cursor.execute(f"SELECT ifnull(SUM({_search_row_checksum()}), 0) FROM Cocktail").fetchone()[0]
+
+
+def cocktail_search_is_current(cursor=None):
+    """색인을 만든 뒤 rowid가 바뀌지 않았는지 (저장된 체크섬 == 현재 체크섬)"""
+    cursor = cursor or cur
+    row = cursor.execute("SELECT checksum FROM CocktailSearchState WHERE id = 1").fetchone()
+    return row is not None and row[0] == cocktail_search_checksum(cursor)
+
+
+def cocktail_search_rebuild(cursor=None):
+    cursor = cursor or cur
+    cursor.execute("INSERT INTO CocktailSearch (CocktailSearch) VALUES ('rebuild')")
+    cursor.execute("INSERT OR REPLACE INTO CocktailSearchState (id, checksum) VALUES (1, ?)",
+                   (cocktail_search_checksum(cursor),))
+    cursor.connection.commit()
+
+
+def cocktail_search(match, limit=20, weights=SEARCH_WEIGHTS, cursor=None):
+    """
+    FTS5 MATCH 식으로 검색하여 (Cocktail 행..., bm25 점수) 를 점수순으로 반환합니다.
+    bm25 점수는 낮을수록(더 음수일수록) 관련도가 높습니다.
+    """
+    query = f"""
+    SELECT c.*, bm25(CocktailSearch, {', '.join('?' for _ in SEARCH_COLUMNS)}) AS rank
+    FROM CocktailSearch
+    JOIN Cocktail c ON c.rowid = CocktailSearch.rowid
+    WHERE CocktailSearch MATCH ?
+    ORDER BY rank
+    LIMIT ?;
+    """
+    cursor = cursor or cur
+    cursor.execute(query, (*weights, match, limit))
+    return cursor.fetchall()
+
+
+"""
+Cocktail Similarity
+
+칵테일별 재료 Jaccard 유사도 상위 N개 (src.services.similarity 작업으로 채움)
+CocktailSimilarityVersion에는 계산 당시의 카탈로그 (token, version)을 기록합니다.
+"""
+
+def cocktail_similarity_create():
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS CocktailSimilarity (
+      cocktail TEXT NOT NULL,
+      rank INTEGER NOT NULL,
+      similar TEXT NOT NULL,
+      score REAL NOT NULL,
+      PRIMARY KEY (cocktail, rank)
+    );
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS CocktailSimilarityVersion (
+      id INTEGER PRIMARY KEY CHECK (id = 1),
+      token TEXT NOT NULL,
+      version INTEGER NOT NULL
+    );
+    """)
+    conn.commit()
+
+
+def cocktail_similarity_replace(rows, stamp, cursor=None):
+    """rows: [(cocktail, rank, similar, score), ...] 로 전체를 교체합니다."""
+    cursor = cursor or cur
+    cursor.execute("DELETE FROM CocktailSimilarity")
+    cursor.executemany("""
+    INSERT INTO CocktailSimilarity (cocktail, rank, similar, score)
+    VALUES (?, ?, ?, ?)
+    """, rows)
+    cursor.execute("""
+    INSERT OR REPLACE INTO CocktailSimilarityVersion (id, token, version)
+    VALUES (1, ?, ?)
+    """, stamp)
+    cursor.connection.commit()
+
+
+def cocktail_similarity_stamp(cursor=None):
+    cursor = cursor or cur
+    row = cursor.execute("SELECT token, version FROM CocktailSimilarityVersion WHERE id = 1").fetchone()
+    return (row[0], row[1]) if row else None
+
+
+def cocktail_similarity_select(name, k=5, cursor=None):
+    cursor = cursor or cur
+    query = """
+    SELECT c.*, s.score
+    FROM CocktailSimilarity s
+    JOIN Cocktail c ON c.name = s.similar
+    WHERE s.cocktail = ?
+    ORDER BY s.rank
+    LIMIT ?;
+    """
+    cursor.execute(query, (name, k))
+    return cursor.fetchall()
+
+
+cockail_create()
+cocktail_ingredient_create()
+catalog_version_create()
+cocktail_search_create()
+cocktail_similarity_create()
+
+# 기존 DB에 재료 테이블이 비어 있으면 한 번 채워둡니다.
+if not cur.execute("SELECT 1 FROM CocktailIngredient LIMIT 1").fetchone():
+    cocktail_ingredient_rebuild()
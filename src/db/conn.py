@@ -1,7 +1,12 @@
 from sqlite3 import connect
 from os import path
 
+from .query_trace import tracing_enabled, TracingConnection
+
 DB_PATH = path.join(path.dirname(path.abspath(__file__)), "dev.db")
 
 def db_connect():
+    # KTAIL_SQL_TRACE=1 이면 쿼리별 실행 시간을 집계하는 연결을 사용
+    if tracing_enabled():
+        return connect(DB_PATH, factory=TracingConnection)
     return connect(DB_PATH)
@@ -0,0 +1,109 @@
+import math
+
+from .conn import db_connect
+
+conn = db_connect()
+cur = conn.cursor()
+
+"""
+Create CocktailPopularity Table
+
+주문 수량을 시간 감쇠(반감기 half_life 초)한 인기도 누적값
+score는 forward decay 방식으로 저장합니다.
+    주문 1건의 기여 = 수량 * 2 ^ ((주문 시각 - landmark) / half_life)
+모든 칵테일에 같은 비율로 감쇠가 적용되므로, 조회 시점과 관계없이 score의 대소/비율이
+"현재 시점 기준 감쇠된 주문량"의 대소/비율과 같습니다. (조회 시 감쇠 계산 불필요)
+"""
+
+# 지수가 이 값을 넘으면 landmark를 옮겨 score를 다시 맞춤 (float 범위 보호)
+REBASE_EXPONENT = 512
+
+
+def popularity_create():
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS CocktailPopularity (
+      cocktail TEXT PRIMARY KEY,
+      score REAL NOT NULL,
+      orders INTEGER NOT NULL DEFAULT 0,
+      last_ordered REAL
+    );
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS PopularityState (
+      id INTEGER PRIMARY KEY CHECK (id = 1),
+      landmark REAL NOT NULL,
+      half_life REAL NOT NULL,
+      version INTEGER NOT NULL DEFAULT 0
+    );
+    """)
+    conn.commit()
+
+
+"""
+Popularity State
+"""
+
+def popularity_state(cursor=None):
+    """(landmark, half_life, version) 또는 아직 초기화 전이면 None"""
+    cursor = cursor or cur
+    row = cursor.execute("SELECT landmark, half_life, version FROM PopularityState WHERE id = 1").fetchone()
+    return (row[0], row[1], row[2]) if row else None
+
+
+def popularity_reset(landmark, half_life):
+    """인기도를 모두 지우고 새 기준 시각/반감기로 초기화합니다. (commit은 호출자 책임)"""
+    cur.execute("DELETE FROM CocktailPopularity")
+    cur.execute("""
+    INSERT OR REPLACE INTO PopularityState (id, landmark, half_life, version)
+    VALUES (1, ?, ?, COALESCE((SELECT version FROM PopularityState WHERE id = 1), 0) + 1)
+    """, (landmark, half_life))
+
+
+"""
+Popularity Record
+
+주문 한 건을 누적합니다. 칵테일 이름은 대소문자 구분 없이 Cocktail 테이블의 이름으로 맞추며,
+카탈로그에 없는 칵테일은 무시합니다.
+"""
+
+def popularity_record(name, quantity, ordered_at, commit=True):
+    landmark, half_life, _ = popularity_state()
+
+    exponent = (ordered_at - landmark) / half_life
+    if exponent > REBASE_EXPONENT:
+        # 기준 시각을 주문 시각으로 옮기고 기존 score를 같은 비율로 줄임
+        cur.execute("UPDATE CocktailPopularity SET score = score * ?", (math.pow(2.0, -exponent),))
+        cur.execute("UPDATE PopularityState SET landmark = ? WHERE id = 1", (ordered_at,))
+        exponent = 0.0
+
+    cur.execute("""
+    INSERT INTO CocktailPopularity (cocktail, score, orders, last_ordered)
+    SELECT name, ?, ?, ? FROM Cocktail WHERE LOWER(name) = LOWER(?)
+    ON CONFLICT(cocktail) DO UPDATE SET
+      score = score + excluded.score,
+      orders = orders + excluded.orders,
+      last_ordered = MAX(COALESCE(last_ordered, 0), excluded.last_ordered)
+    """, (quantity * math.pow(2.0, exponent), quantity, ordered_at, name.strip()))
+    recorded = cur.rowcount
+    cur.execute("UPDATE PopularityState SET version = version + 1 WHERE id = 1")
+    if commit:
+        conn.commit()
+    return recorded
+
+
+"""
+Popularity Select
+"""
+
+def popularity_select_all(cursor=None):
+    cursor = cursor or cur
+    query = """
+    SELECT cocktail, score, orders, last_ordered
+    FROM CocktailPopularity
+    ORDER BY score DESC;
+    """
+    cursor.execute(query)
+    return cursor.fetchall()
+
+
+popularity_create()
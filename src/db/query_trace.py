@@ -0,0 +1,372 @@
+"""
+SQLite 쿼리 추적 (opt-in)
+
+환경 변수 KTAIL_SQL_TRACE=1 이거나 enable_tracing()을 호출한 뒤 만들어진 연결은
+모든 SQL 문의 실행 시간(execute + fetch)을 문장별로 집계합니다.
+지연 시간 히스토그램도 문장 전체 시간(execute + fetch) 기준입니다.
+
+- KTAIL_SQL_SLOW_MS   : 느린 쿼리 기준 (ms, 기본 50). 넘으면 EXPLAIN QUERY PLAN과 함께 로그 출력
+- KTAIL_SQL_TRACE_FILE: 프로세스 종료 시 집계 결과를 저장할 JSON 파일
+
+집계 결과 확인:
+    python -m src.db.query_trace [trace.json] [--top 20]
+
+추적 동작 점검 (메모리 DB):
+    python -m src.db.query_trace --check
+"""
+
+import argparse
+import atexit
+import bisect
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+
+logger = logging.getLogger("k-tail.sql")
+
+# 지연 시간 히스토그램 버킷 상한 (ms)
+BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, float('inf'))
+
+_SPACE_RE = re.compile(r'\s+')
+
+_enabled = os.environ.get("KTAIL_SQL_TRACE", "").lower() in ("1", "true", "yes", "on")
+_slow_ms = float(os.environ.get("KTAIL_SQL_SLOW_MS", "50"))
+_trace_file = os.environ.get("KTAIL_SQL_TRACE_FILE")
+
+_stats = {}
+_lock = threading.Lock()
+# 아직 끝나지 않은 문장이 있는 커서 (종료 시 히스토그램에 넣음)
+_open_cursors = weakref.WeakSet()
+
+
+def tracing_enabled() -> bool:
+    return _enabled
+
+
+def enable_tracing(slow_ms: float = None, trace_file: str = None):
+    """이후에 생성되는 연결부터 쿼리 추적을 켭니다."""
+    global _enabled, _slow_ms, _trace_file
+    _enabled = True
+    if slow_ms is not None:
+        _slow_ms = slow_ms
+    if trace_file is not None:
+        _trace_file = trace_file
+
+
+def disable_tracing():
+    global _enabled
+    _enabled = False
+
+
+def normalize_sql(sql: str) -> str:
+    return _SPACE_RE.sub(' ', sql).strip().rstrip(';').strip()
+
+
+def record(sql: str, elapsed_ms: float, rows: int = 0):
+    """문장 하나의 실행 결과를 집계에 반영합니다."""
+    _record_key(normalize_sql(sql), elapsed_ms, rows)
+
+
+def _record_key(key: str, elapsed_ms: float, rows: int = 0, histogram: bool = True):
+    """histogram=False면 히스토그램은 문장이 끝난 뒤 _add_histogram으로 전체 시간 기준으로 넣습니다."""
+    with _lock:
+        stat = _stats.get(key)
+        if stat is None:
+            stat = _stats[key] = {
+                'count': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+                'rows': 0,
+                'histogram': [0] * len(BUCKETS_MS),
+            }
+        stat['count'] += 1
+        stat['total_ms'] += elapsed_ms
+        stat['max_ms'] = max(stat['max_ms'], elapsed_ms)
+        stat['rows'] += rows
+        if histogram:
+            stat['histogram'][bisect.bisect_left(BUCKETS_MS, elapsed_ms)] += 1
+
+
+def _add_histogram(key: str, statement_ms: float):
+    """끝난 문장의 전체 시간(execute + fetch)을 히스토그램에 넣습니다."""
+    with _lock:
+        stat = _stats.get(key)
+        if stat is not None:
+            stat['histogram'][bisect.bisect_left(BUCKETS_MS, statement_ms)] += 1
+
+
+def _add_fetch(key: str, elapsed_ms: float, rows: int, statement_ms: float):
+    """
+    이미 기록된 문장에 결과를 읽는 데 걸린 시간과 행 수를 더합니다. (count는 그대로)
+    statement_ms는 지금까지의 문장 전체 시간(execute + fetch)으로 max_ms에 반영합니다.
+    """
+    with _lock:
+        stat = _stats.get(key)
+        if stat is None:
+            return
+        stat['total_ms'] += elapsed_ms
+        stat['rows'] += rows
+        stat['max_ms'] = max(stat['max_ms'], statement_ms)
+
+
+def get_stats() -> dict:
+    with _lock:
+        return {sql: dict(stat, histogram=list(stat['histogram'])) for sql, stat in _stats.items()}
+
+
+def reset_stats():
+    with _lock:
+        _stats.clear()
+
+
+def top_statements(stats: dict = None, top: int = 20) -> list:
+    """총 소요 시간 기준 상위 문장 [(sql, stat), ...]"""
+    stats = get_stats() if stats is None else stats
+    return sorted(stats.items(), key=lambda item: item[1]['total_ms'], reverse=True)[:top]
+
+
+def format_stats(stats: dict = None, top: int = 20) -> str:
+    lines = [f"{'total ms':>10} {'count':>7} {'avg ms':>8} {'max ms':>8} {'rows':>8}  statement"]
+    for sql, stat in top_statements(stats, top):
+        avg = stat['total_ms'] / stat['count'] if stat['count'] else 0
+        lines.append(
+            f"{stat['total_ms']:10.2f} {stat['count']:7d} {avg:8.3f} {stat['max_ms']:8.2f} "
+            f"{stat['rows']:8d}  {sql[:120]}"
+        )
+        hist = ' '.join(
+            f"<={b:g}:{n}" if b != float('inf') else f">{BUCKETS_MS[-2]:g}:{n}"
+            for b, n in zip(BUCKETS_MS, stat['histogram']) if n
+        )
+        lines.append(f"{'':>46}  [{hist}]")
+    return '\n'.join(lines)
+
+
+def dump_stats(path: str = None):
+    """집계 결과를 JSON 파일로 저장합니다."""
+    path = path or _trace_file
+    if not path:
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'buckets_ms': [b if b != float('inf') else None for b in BUCKETS_MS],
+                   'statements': get_stats()}, f, ensure_ascii=False, indent=2)
+
+
+def _explain(connection, sql: str, params) -> str:
+    try:
+        cursor = sqlite3.Cursor(connection)
+        rows = cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params or ()).fetchall()
+        cursor.close()
+        return '\n'.join(f"    {row[-1]}" for row in rows)
+    except sqlite3.Error as e:
+        return f"    (EXPLAIN 실패: {e})"
+
+
+class TracingCursor(sqlite3.Cursor):
+    """
+    문장 단위로 실행 시간을 기록하는 커서
+
+    execute가 끝나는 즉시 문장을 집계에 넣고(count), 이후 fetch에 걸린 시간과 읽은 행 수를 같은 항목에 더합니다.
+    따라서 fetchone() 한 번으로 끝나는 조회나 close() 없이 버려지는 커서의 문장도 빠지지 않습니다.
+    SQLite는 SELECT 작업 대부분을 행을 읽으면서 하므로, 히스토그램은 문장이 끝났을 때
+    (결과를 다 읽음 / 다시 execute / close / 커서가 버려짐) execute + fetch 전체 시간으로 한 번 넣습니다.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._trace_key = None
+        self._trace_sql = None
+        self._trace_params = None
+        self._trace_ms = 0.0
+        self._trace_logged = False
+
+    def _executed(self, sql, params, func, *args):
+        self._finish()
+        start = time.perf_counter()
+        func(*args)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        key = normalize_sql(sql)
+        _record_key(key, elapsed, histogram=False)
+        self._trace_key, self._trace_sql, self._trace_params = key, sql, params
+        self._trace_ms, self._trace_logged = elapsed, False
+        _open_cursors.add(self)
+        self._check_slow()
+        return self
+
+    def _fetched(self, func, *args, size=None):
+        start = time.perf_counter()
+        try:
+            result = func(*args)
+        except StopIteration:
+            self._add_fetch_time((time.perf_counter() - start) * 1000, 0)
+            self._finish()
+            raise
+        elapsed = (time.perf_counter() - start) * 1000
+        if self._trace_key is not None:
+            rows = len(result) if isinstance(result, list) else int(result is not None)
+            self._add_fetch_time(elapsed, rows)
+            # fetchall, 빈 fetchone, 요청보다 적게 돌려준 fetchmany는 결과를 다 읽은 것
+            if result is None or (isinstance(result, list) and (size is None or rows < size)):
+                self._finish()
+        return result
+
+    def _add_fetch_time(self, elapsed, rows):
+        if self._trace_key is not None:
+            self._trace_ms += elapsed
+            _add_fetch(self._trace_key, elapsed, rows, self._trace_ms)
+            self._check_slow()
+
+    def _finish(self):
+        """진행 중인 문장을 끝난 것으로 보고 전체 시간을 히스토그램에 넣습니다. (한 번만)"""
+        key = getattr(self, '_trace_key', None)
+        if key is not None:
+            self._trace_key = None
+            _open_cursors.discard(self)
+            _add_histogram(key, self._trace_ms)
+
+    def _check_slow(self):
+        if not self._trace_logged and self._trace_ms >= _slow_ms:
+            self._trace_logged = True
+            logger.warning("slow query %.2f ms: %s\n%s", self._trace_ms, self._trace_key,
+                           _explain(self.connection, self._trace_sql, self._trace_params))
+
+    def execute(self, sql, parameters=()):
+        return self._executed(sql, parameters, super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._executed(sql, None, super().executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self._executed(sql_script, None, super().executescript, sql_script)
+
+    def fetchone(self):
+        return self._fetched(super().fetchone)
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        return self._fetched(super().fetchmany, size, size=size)
+
+    def fetchall(self):
+        return self._fetched(super().fetchall)
+
+    def __next__(self):
+        # 다 읽으면 문장을 끝내고 StopIteration이 그대로 올라가며, 그 전까지는 한 행씩 더합니다
+        return self._fetched(super().__next__)
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # close() 없이 버려지는 커서 (conn.execute(...).fetchone() 등)
+        self._finish()
+
+
+class TracingConnection(sqlite3.Connection):
+    """cursor()와 conn.execute()가 TracingCursor를 사용하도록 하는 연결"""
+
+    def cursor(self, factory=TracingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+@atexit.register
+def _dump_at_exit():
+    if _enabled and _stats:
+        # 모듈 연결처럼 끝까지 열려 있는 커서의 마지막 문장도 히스토그램에 넣음
+        for cursor in list(_open_cursors):
+            cursor._finish()
+        dump_stats()
+
+
+def self_check() -> list:
+    """
+    메모리 DB로 추적 커서를 점검하고 문제 목록을 반환합니다. (비어 있으면 정상)
+    execute(...).fetchone() 한 번으로 끝나는 조회, close() 없이 버려지는 커서도 집계되어야 하고,
+    히스토그램은 fetch까지 포함한 문장 전체 시간 구간에 한 번씩 들어가야 합니다.
+    """
+    saved = dict(_stats)
+    reset_stats()
+    problems = []
+    try:
+        conn = sqlite3.connect(':memory:', factory=TracingConnection)
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(10)])
+        conn.execute("SELECT COUNT(*) FROM t").fetchone()
+        cursor = conn.cursor()
+        cursor.execute("SELECT x FROM t WHERE x < ?", (3,))
+        cursor.fetchall()
+        for _ in conn.execute("SELECT x FROM t ORDER BY x LIMIT 4"):
+            pass
+        conn.execute("SELECT MAX(x) FROM t")  # 결과를 읽지 않고 버리는 커서
+        # 행마다 2ms 걸리는 조회 - 작업 대부분이 fetch에서 일어나도 히스토그램은 전체 시간 기준
+        conn.create_function("slow", 1, lambda x: time.sleep(0.002) or x)
+        conn.execute("SELECT slow(x) FROM t").fetchall()
+        conn.close()
+
+        stats = get_stats()
+        expected = {
+            "SELECT COUNT(*) FROM t": 1,
+            "SELECT x FROM t WHERE x < ?": 3,
+            "SELECT x FROM t ORDER BY x LIMIT 4": 4,
+            "SELECT MAX(x) FROM t": 0,
+            "SELECT slow(x) FROM t": 10,
+        }
+        for sql, rows in expected.items():
+            stat = stats.get(sql)
+            if stat is None:
+                problems.append(f"집계 누락: {sql}")
+            elif stat['count'] != 1 or stat['rows'] != rows:
+                problems.append(f"{sql}: count={stat['count']}, rows={stat['rows']} (기대 1, {rows})")
+            elif sum(stat['histogram']) != 1:
+                problems.append(f"{sql}: 히스토그램 {stat['histogram']} (문장 1개가 한 번 들어가야 함)")
+
+        slow = stats.get("SELECT slow(x) FROM t")
+        if slow and slow['histogram'][bisect.bisect_left(BUCKETS_MS, slow['total_ms'])] != 1:
+            problems.append(f"히스토그램이 전체 시간({slow['total_ms']:.1f}ms) 구간이 아님: {slow['histogram']}")
+    finally:
+        with _lock:
+            _stats.clear()
+            _stats.update(saved)
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="쿼리 추적 결과를 총 소요 시간 순으로 출력합니다.")
+    parser.add_argument('path', nargs='?', default=_trace_file, help="KTAIL_SQL_TRACE_FILE로 저장된 JSON")
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--check', action='store_true', help="메모리 DB로 추적 동작을 점검")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        problems = self_check()
+        for line in problems:
+            print(f"  {line}")
+        print("점검 실패" if problems else "점검 통과")
+        return 1 if problems else 0
+
+    if not args.path:
+        parser.error("추적 파일 경로를 지정하세요 (또는 KTAIL_SQL_TRACE_FILE 설정)")
+
+    with open(args.path, encoding='utf-8') as f:
+        data = json.load(f)
+    print(format_stats(data['statements'], args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
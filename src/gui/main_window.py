@@ -6,7 +6,8 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(os.path.dirname(current_dir))
 sys.path.insert(0, project_root)
 
-from src.services.cocktail_service import CocktailService
+from src.services.search_client import SearchClient
+from src.services.cocktail_record import Cocktail
 from src.services.order_service import OrderService
 
 # 테마 및 색상 정의
@@ -26,26 +27,23 @@ WARNING_COLOR = "#ffb84e"
 # 전역 변수들
 cocktail_service = None
 ALL_MENUS = []
+# 칵테일명 -> Cocktail (장바구니 단가 조회용)
+MENU_BY_NAME = {}
 
 def initialize_services():
     """서비스 초기화 함수"""
-    global cocktail_service, ALL_MENUS
+    global cocktail_service, ALL_MENUS, MENU_BY_NAME
     try:
-        cocktail_service = CocktailService()
-        ALL_MENUS = cocktail_service.get_all_cocktails()
+        # 검색 데몬이 떠 있으면 공유하고, 없으면 프로세스 내 CocktailService로 처리
+        cocktail_service = SearchClient()
+        # 카탈로그 스냅샷으로 빠르게 시작 (오래된 경우 SQL 조회 후 백그라운드 갱신)
+        ALL_MENUS = cocktail_service.get_all_cocktails_snapshot()
+        MENU_BY_NAME = {item.name: item for item in ALL_MENUS}
         return True
     except Exception as e:
         print(f"서비스 초기화 오류: {e}")
         return False
 
-# 가격 문자열을 float(달러 단위)로 변환하는 함수
-def parse_price(price_str):
-    try:
-        # "$12.00" -> 12.00
-        return float(price_str.replace("$", "").replace(",", ""))
-    except Exception:
-        return 0.0
-
 # --- UI 컴포넌트 클래스 ---
 
 class Toast(ctk.CTkToplevel):
@@ -169,8 +167,8 @@ class MenuCard(ctk.CTkFrame):
         self.cart_callback = cart_callback
         self.configure(width=fixed_width, height=fixed_height)
         self.grid_propagate(False)
-        ctk.CTkLabel(self, text=item['name'], font=fonts['item'], text_color=TEXT_COLOR).pack(pady=(12, 4))
-        ctk.CTkLabel(self, text=item['price'], font=fonts['small'], text_color=ACCENT_COLOR).pack(pady=(0, 8))
+        ctk.CTkLabel(self, text=item.name, font=fonts['item'], text_color=TEXT_COLOR).pack(pady=(12, 4))
+        ctk.CTkLabel(self, text=item.price_text, font=fonts['small'], text_color=ACCENT_COLOR).pack(pady=(0, 8))
         btn_frame = ctk.CTkFrame(self, fg_color="transparent")
         btn_frame.pack(pady=(0, 12))
         if show_detail_btn:
@@ -217,10 +215,10 @@ class CartListItem(ctk.CTkFrame):
         # 이름
         left = ctk.CTkFrame(self, fg_color="transparent")
         left.grid(row=0, column=0, sticky="nsew", padx=(12, 0), pady=8)
-        ctk.CTkLabel(left, text=item['name'], font=fonts['item'], text_color=TEXT_COLOR, anchor="w").pack(anchor="w")
+        ctk.CTkLabel(left, text=item.name, font=fonts['item'], text_color=TEXT_COLOR, anchor="w").pack(anchor="w")
 
-        # 단가
-        unit_price = parse_price(item.get('price', '0'))
+        # 단가 (숫자 그대로 사용, 표시할 때만 문자열로)
+        unit_price = item.price or 0.0
 
         # 합계 가격 라벨
         self.total_price_lbl = ctk.CTkLabel(self, text="", font=fonts['item'], text_color=ACCENT_COLOR, width=110, anchor="center")
@@ -235,7 +233,7 @@ class CartListItem(ctk.CTkFrame):
         ctk.CTkButton(right, text="+", width=30, command=self._increase_qty).pack(side="left", padx=2)
 
         # 단가(작게) 표시
-        self.unit_price_lbl = ctk.CTkLabel(self, text=f"(each {item.get('price', '')})", font=fonts['small'], text_color="#888888", anchor="w")
+        self.unit_price_lbl = ctk.CTkLabel(self, text=f"(each {item.price_text})", font=fonts['small'], text_color="#888888", anchor="w")
         self.unit_price_lbl.grid(row=0, column=3, sticky="w", padx=(0, 0), pady=8)
 
         # 삭제 버튼
@@ -323,12 +321,11 @@ class CartListTab(ctk.CTkFrame):
         total_sum = 0.0
         for idx, (name, qty) in enumerate(self.cart.items()):
             # 메뉴 정보 찾기
-            item = next((m for m in ALL_MENUS if m['name'] == name), None)
-            if not item:
+            item = MENU_BY_NAME.get(name)
+            if item is None:
                 # 혹시 메뉴가 삭제된 경우 등
-                item = {"name": name, "desc": "", "price": ""}
-            unit_price = parse_price(item.get('price', '0'))
-            total_sum += unit_price * qty
+                item = Cocktail(name, "")
+            total_sum += (item.price or 0.0) * qty
             row_frame = CartListItem(
                 self.scroll_frame,
                 item,
@@ -436,12 +433,12 @@ class MenuListItem(ctk.CTkFrame):
         # 왼쪽: 이름만
         left = ctk.CTkFrame(self, fg_color="transparent")
         left.grid(row=0, column=0, sticky="nsew", padx=(12, 0), pady=8)
-        name_label = ctk.CTkLabel(left, text=item['name'], font=fonts['item'], text_color=TEXT_COLOR, anchor="w")
+        name_label = ctk.CTkLabel(left, text=item.name, font=fonts['item'], text_color=TEXT_COLOR, anchor="w")
         name_label.pack(anchor="w")
         # 설명(재료)는 표시하지 않음
 
         # 가운데: 가격
-        price_lbl = ctk.CTkLabel(self, text=item['price'], font=fonts['item'], text_color=ACCENT_COLOR, width=90, anchor="center")
+        price_lbl = ctk.CTkLabel(self, text=item.price_text, font=fonts['item'], text_color=ACCENT_COLOR, width=90, anchor="center")
         price_lbl.grid(row=0, column=1, sticky="nsew", padx=8, pady=8)
 
         # 오른쪽: 수량/장바구니 버튼
@@ -475,8 +472,8 @@ class MenuListItem(ctk.CTkFrame):
         tooltip_btn.grid(row=0, column=3, sticky="e", padx=(0, 8), pady=8)
 
         # Tooltip 인스턴스: Ingredients(재료) 정보를 표시
-        # ingredients 필드가 있으면 사용, 없으면 desc, garnish 순서로 대체
-        ingredients = item.get('ingredients', '') or item.get('desc', '') or item.get('garnish', '')
+        # ingredients 필드가 있으면 사용, 없으면 garnish로 대체
+        ingredients = item.ingredients or item.garnish or ""
         self._tooltip = Tooltip(tooltip_btn, ingredients)
 
         # 마우스 오버/아웃 이벤트 바인딩
@@ -514,21 +511,21 @@ class MenuListItem(ctk.CTkFrame):
 
                 ctk.CTkLabel(
                     info_frame,
-                    text=f"이름: {self.item['name']}",
+                    text=f"이름: {self.item.name}",
                     font=self.fonts['item'],
                     text_color=TEXT_COLOR,
                     anchor="w"
                 ).pack(anchor="w", padx=16, pady=(12, 2))
                 ctk.CTkLabel(
                     info_frame,
-                    text=f"가격: {self.item['price']}",
+                    text=f"가격: {self.item.price_text}",
                     font=self.fonts['item'],
                     text_color=ACCENT_COLOR,
                     anchor="w"
                 ).pack(anchor="w", padx=16, pady=2)
                 ctk.CTkLabel(
                     info_frame,
-                    text=f"설명: {self.item.get('desc', '')}",
+                    text=f"설명: {self.item.ingredients or ''}",
                     font=self.fonts['small'],
                     text_color="#bbbbbb",
                     anchor="w",
@@ -566,7 +563,7 @@ class MenuListItem(ctk.CTkFrame):
 
                     ctk.CTkLabel(
                         confirm,
-                        text=f"'{self.item['name']}'",
+                        text=f"'{self.item.name}'",
                         font=ctk.CTkFont(size=14),
                         text_color=ACCENT_COLOR
                     ).pack(pady=(0, 12))
@@ -634,6 +631,7 @@ class MenuListItem(ctk.CTkFrame):
 
 class MenuTab(ctk.CTkFrame):
     PAGE_SIZE = 10
+    SUGGESTION_LIMIT = 5
 
     def __init__(self, parent, fonts, cart_callback, admin_mode=False, on_edit=None, on_delete=None):
         super().__init__(parent, fg_color=BG_COLOR)
@@ -643,13 +641,11 @@ class MenuTab(ctk.CTkFrame):
         self.on_edit = on_edit
         self.on_delete = on_delete
         self._search_var = ctk.StringVar()
-        # DB에서 메뉴 불러오기
-        global cocktail_service
-        if cocktail_service:
-            self._all_menus = cocktail_service.get_all_cocktails()
-        else:
-            self._all_menus = []
-        self._filtered_menus = self._all_menus.copy()
+        # DB에서 현재 페이지만 불러오기 (키셋 페이지네이션)
+        self._keyword = ""
+        self._page_keys = [None]  # 각 페이지의 시작 키 (이전 페이지 이동용)
+        self._next_key = None
+        self._total_items = 0
         self._current_page = 0
         self._build()
         self._bind_mousewheel(self)
@@ -702,6 +698,10 @@ class MenuTab(ctk.CTkFrame):
         # 입력할 때마다 자동 검색
         self._search_var.trace_add("write", lambda *args: self._on_search())
 
+        # 자동완성 후보 (오타 허용, 누르면 해당 이름으로 검색)
+        self.suggest_frame = ctk.CTkFrame(self, fg_color=BG_COLOR)
+        self.suggest_frame.pack(fill="x", padx=PADDING, pady=(4, 0))
+
         # 한줄 리스트 형식 UI, grid로 정렬
         self.sec = ctk.CTkScrollableFrame(self, fg_color=BG_COLOR)
         self.sec.pack(fill="both", expand=True, padx=PADDING, pady=PADDING)
@@ -710,18 +710,28 @@ class MenuTab(ctk.CTkFrame):
         self.paging_frame = ctk.CTkFrame(self, fg_color=BG_COLOR)
         self.paging_frame.pack(fill="x", padx=PADDING, pady=(0, PADDING))
 
-        self._draw_menu_list()
+        self.search("")
+
+    def _fetch_page(self):
+        """현재 페이지의 메뉴만 서비스에서 가져옵니다."""
+        if not cocktail_service:
+            self._next_key = None
+            return []
+        page = cocktail_service.get_cocktails_page(
+            self._page_keys[self._current_page],
+            self.PAGE_SIZE,
+            name_contains=self._keyword or None
+        )
+        self._next_key = page['next_key']
+        return page['items']
 
     def _draw_menu_list(self):
         for w in self.sec.winfo_children():
             w.destroy()
         # 페이징 처리
-        total_items = len(self._filtered_menus)
+        page_items = self._fetch_page()
+        total_items = self._total_items
         total_pages = max(1, (total_items + self.PAGE_SIZE - 1) // self.PAGE_SIZE)
-        self._current_page = max(0, min(self._current_page, total_pages - 1))
-        start_idx = self._current_page * self.PAGE_SIZE
-        end_idx = min(start_idx + self.PAGE_SIZE, total_items)
-        page_items = self._filtered_menus[start_idx:end_idx]
 
         for idx, item in enumerate(page_items):
             row_frame = MenuListItem(
@@ -765,7 +775,7 @@ class MenuTab(ctk.CTkFrame):
             fg_color="#444444",
             corner_radius=6,
             width=80,
-            state="normal" if self._current_page < total_pages-1 else "disabled",
+            state="normal" if self._next_key is not None else "disabled",
             command=self._go_next_page
         )
         btn_next.pack(side="left", padx=8, pady=4)
@@ -776,25 +786,49 @@ class MenuTab(ctk.CTkFrame):
             self._draw_menu_list()
 
     def _go_next_page(self):
-        total_items = len(self._filtered_menus)
-        total_pages = max(1, (total_items + self.PAGE_SIZE - 1) // self.PAGE_SIZE)
-        if self._current_page < total_pages - 1:
+        if self._next_key is not None:
+            del self._page_keys[self._current_page + 1:]
+            self._page_keys.append(self._next_key)
             self._current_page += 1
             self._draw_menu_list()
 
-    def _on_search(self, *args):
-        keyword = self._search_var.get().strip()
-        if not keyword:
-            self._filtered_menus = self._all_menus.copy()
-        else:
-            kw = keyword.lower()
-            self._filtered_menus = [
-                item for item in self._all_menus
-                if kw in item['name'].lower()
-            ]
+    def search(self, keyword):
+        """이름 검색어로 첫 페이지부터 다시 조회합니다."""
+        self._keyword = keyword.strip()
+        self._page_keys = [None]
         self._current_page = 0
+        self._total_items = (
+            cocktail_service.count_cocktails(name_contains=self._keyword or None)
+            if cocktail_service else 0
+        )
         self._draw_menu_list()
 
+    def _on_search(self, *args):
+        keyword = self._search_var.get()
+        self.search(keyword)
+        self._draw_suggestions(keyword)
+
+    def _draw_suggestions(self, keyword):
+        for w in self.suggest_frame.winfo_children():
+            w.destroy()
+        keyword = keyword.strip()
+        if not keyword or not cocktail_service:
+            return
+        # 메뉴명 검색이므로 칵테일 이름 후보만, 입력과 같은 이름은 제외
+        suggestions = [
+            s for s in cocktail_service.autocomplete(keyword, limit=self.SUGGESTION_LIMIT * 2)
+            if s['kind'] == 'name' and s['text'].lower() != keyword.lower()
+        ][:self.SUGGESTION_LIMIT]
+        for s in suggestions:
+            ctk.CTkButton(
+                self.suggest_frame,
+                text=s['text'],
+                font=self.fonts['small'],
+                fg_color=CARD_COLOR,
+                corner_radius=6,
+                command=lambda text=s['text']: self._search_var.set(text)
+            ).pack(side="left", padx=(0, 4))
+
     def destroy(self):
         super().destroy()
 
@@ -830,11 +864,30 @@ class DetailFrame(ctk.CTkFrame):
     def show_detail(self, item):
         for w in self.inner.winfo_children():
             w.destroy()
-        ctk.CTkLabel(self.inner, text=item['name'], font=self.fonts['head'], text_color=ACCENT_COLOR).pack(pady=(20,8))
-        ctk.CTkLabel(self.inner, text=item['desc'], font=self.fonts['item'], text_color=TEXT_COLOR).pack(pady=5)
-        ctk.CTkLabel(self.inner, text=item['price'], font=self.fonts['item'], text_color=ACCENT_COLOR).pack(pady=5)
+        ctk.CTkLabel(self.inner, text=item.name, font=self.fonts['head'], text_color=ACCENT_COLOR).pack(pady=(20,8))
+        ctk.CTkLabel(self.inner, text=item.ingredients or '', font=self.fonts['item'], text_color=TEXT_COLOR).pack(pady=5)
+        ctk.CTkLabel(self.inner, text=item.price_text, font=self.fonts['item'], text_color=ACCENT_COLOR).pack(pady=5)
+        self._show_similar(item.name)
         ctk.CTkButton(self.inner, text="뒤로", fg_color=ACCENT_COLOR, corner_radius=6, command=self.back_callback).pack(pady=20)
 
+    def _show_similar(self, name, k=5):
+        # 재료가 비슷한 칵테일 (미리 계산된 유사도 테이블 조회)
+        similar = cocktail_service.similar_cocktails(name, k) if cocktail_service else []
+        if not similar:
+            return
+        ctk.CTkLabel(self.inner, text="비슷한 칵테일", font=self.fonts['item'], text_color=TEXT_COLOR).pack(pady=(16, 4))
+        row = ctk.CTkFrame(self.inner, fg_color="transparent")
+        row.pack(pady=(0, 8))
+        for other in similar:
+            ctk.CTkButton(
+                row,
+                text=f"{other['name']} ({other['similarity']:.0%})",
+                font=self.fonts['small'],
+                fg_color=CARD_COLOR,
+                corner_radius=6,
+                command=lambda o=other: self.show_detail(Cocktail.from_dict(o))
+            ).pack(side="left", padx=4)
+
 # --- 메인 애플리케이션 ---
 
 class App(ctk.CTk):
@@ -844,8 +897,9 @@ class App(ctk.CTk):
         # 서비스 초기화
         if not initialize_services():
             # 초기화 실패 시 기본값으로 설정
-            global ALL_MENUS
+            global ALL_MENUS, MENU_BY_NAME
             ALL_MENUS = []
+            MENU_BY_NAME = {}
             print("서비스 초기화에 실패했습니다. 기본값으로 실행합니다.")
         
         self.fonts = {
@@ -949,21 +1003,21 @@ class App(ctk.CTk):
         Toast(self, message)
 
     def _add_to_cart(self, item, qty):
-        self.cart[item['name']] = self.cart.get(item['name'], 0) + qty
-        self._show_toast(f"{item['name']} {qty} added to cart.")
+        self.cart[item.name] = self.cart.get(item.name, 0) + qty
+        self._show_toast(f"{item.name} {qty} added to cart.")
         self._refresh_cart()
 
     def _on_cart_qty_change(self, item, qty):
         if qty < 1:
             self._on_cart_remove(item)
             return
-        self.cart[item['name']] = qty
+        self.cart[item.name] = qty
         self._refresh_cart()
 
     def _on_cart_remove(self, item):
-        if item['name'] in self.cart:
-            del self.cart[item['name']]
-            self._show_toast(f"{item['name']} removed from cart.")
+        if item.name in self.cart:
+            del self.cart[item.name]
+            self._show_toast(f"{item.name} removed from cart.")
             self._refresh_cart()
 
     def _on_search(self):
@@ -975,17 +1029,8 @@ class App(ctk.CTk):
         if not search_tab or not menu_tab:
             return
         keyword = search_tab.search_entry.get().strip()
-        if not keyword:
-            # 검색어 없으면 전체 메뉴 보여주기
-            menu_tab._filtered_menus = menu_tab._all_menus.copy()
-        else:
-            kw = keyword.lower()
-            menu_tab._filtered_menus = [
-                item for item in menu_tab._all_menus
-                if kw in item['name'].lower()
-            ]
-        menu_tab._current_page = 0
-        menu_tab._draw_menu_list()
+        # 검색어 없으면 전체 메뉴 보여주기 (검색창 값이 바뀌면 해당 페이지를 다시 조회)
+        menu_tab._search_var.set(keyword)
         # 전체메뉴 탭으로 전환
         self.tabview.set("전체메뉴")
 
@@ -1013,10 +1058,10 @@ class App(ctk.CTk):
 
     # 관리자 모드에서 전체메뉴 상품 수정/삭제 콜백
     def _on_menu_edit(self, item):
-        self._show_toast(f"'{item['name']}' menu edit feature is not implemented yet.")
+        self._show_toast(f"'{item.name}' menu edit feature is not implemented yet.")
 
     def _on_menu_delete(self, item):
-        self._show_toast(f"'{item['name']}' menu delete feature is not implemented yet.")
+        self._show_toast(f"'{item.name}' menu delete feature is not implemented yet.")
 
     def _on_close(self):
         # 안전하게 종료
@@ -0,0 +1,111 @@
+"""
+자동완성(AutocompleteIndex) 지연 시간 벤치마크
+
+카탈로그 이름의 단어를 섞어 합성 칵테일 이름을 --names개 만들고, 그중 일부 이름을
+오타 0~2개를 넣어 한 글자씩 입력하는 것처럼 매 키 입력마다 search()를 호출하여
+중앙값 / p95 / 최댓값을 출력합니다. (결과 캐시 없이 인덱스 탐색 시간만 측정)
+
+사용 예:
+    python -m src.services.autocomplete_benchmark --names 100000 --queries 300
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+from typing import Dict, List
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.services.cocktail_service import CocktailService
+from src.services.search_index import AutocompleteIndex
+
+
+def synthetic_names(words: List[str], n: int, seed: int = 7) -> List[str]:
+    """카탈로그 단어 2~4개를 이어 붙인 서로 다른 이름 n개"""
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < n:
+        names.add(' '.join(rng.choice(words) for _ in range(rng.randint(2, 4))).title())
+    return sorted(names)
+
+
+def add_typos(text: str, typos: int, rng: random.Random) -> str:
+    """첫 글자를 제외한 위치에 치환/삭제/삽입 오타를 typos개 넣습니다."""
+    for _ in range(typos):
+        if len(text) < 3:
+            break
+        pos = rng.randrange(1, len(text))
+        op = rng.choice(('sub', 'del', 'ins'))
+        ch = rng.choice(string.ascii_lowercase)
+        if op == 'sub':
+            text = text[:pos] + ch + text[pos + 1:]
+        elif op == 'del':
+            text = text[:pos] + text[pos + 1:]
+        else:
+            text = text[:pos] + ch + text[pos:]
+    return text
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def run(index: AutocompleteIndex, names: List[str], queries: int, seed: int = 7,
+        limit: int = 8) -> Dict[int, List[float]]:
+    """{넣은 오타 수: 키 입력별 지연 시간(ms) 리스트}"""
+    rng = random.Random(seed)
+    latencies = {0: [], 1: [], 2: []}
+    for i in range(queries):
+        typos = i % 3
+        target = rng.choice(names).lower()
+        typed = add_typos(target[:rng.randint(4, min(len(target), 16))], typos, rng)
+        for end in range(1, len(typed) + 1):
+            start = time.perf_counter()
+            index.search(typed[:end], limit)
+            latencies[typos].append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="자동완성 키 입력별 지연 시간 측정")
+    parser.add_argument('--names', type=int, default=100_000, help="합성 칵테일 이름 수")
+    parser.add_argument('--queries', type=int, default=300, help="입력해 볼 이름 수 (오타 0/1/2개 번갈아)")
+    parser.add_argument('--limit', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    service = CocktailService(cache_size=0)
+    catalog = service.get_all_cocktails()
+    words = sorted({word for item in catalog for word in AutocompleteIndex.normalize(item.name).split()})
+    ingredients = sorted({
+        item['ingredient'] for cocktail in catalog for item in service.get_cocktail_ingredients(cocktail.name)
+    })
+
+    start = time.perf_counter()
+    names = synthetic_names(words, args.names, args.seed)
+    index = AutocompleteIndex(names, ingredients)
+    print(f"이름 {len(names)}개, 재료 {len(ingredients)}개, 항목 {len(index)}개 "
+          f"(생성 {time.perf_counter() - start:.1f}초)")
+
+    latencies = run(index, names, args.queries, args.seed, args.limit)
+    print(f"{'오타':>4} {'키 입력':>8} {'median ms':>10} {'p95 ms':>8} {'max ms':>8}")
+    everything = []
+    for typos, values in latencies.items():
+        values.sort()
+        everything.extend(values)
+        print(f"{typos:>4} {len(values):>8} {percentile(values, 0.5):10.3f} "
+              f"{percentile(values, 0.95):8.3f} {values[-1] if values else 0:8.3f}")
+    everything.sort()
+    print(f"{'전체':>4} {len(everything):>8} {percentile(everything, 0.5):10.3f} "
+          f"{percentile(everything, 0.95):8.3f} {everything[-1] if everything else 0:8.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
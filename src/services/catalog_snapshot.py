@@ -0,0 +1,138 @@
+"""
+칵테일 카탈로그 스냅샷
+Cocktail / CocktailIngredient 테이블을 미리 정리해 하나의 바이너리 파일로 저장하고,
+GUI 시작 시 SQL 조회 대신 한 번의 파일 읽기로 카탈로그를 불러옵니다.
+
+스냅샷에는 DB의 (token, version) 스탬프가 기록되며, DB와 다르면 SQL로 대체 조회한 뒤
+백그라운드 스레드에서 스냅샷을 다시 만듭니다.
+"""
+
+import os
+import pickle
+import sys
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.db.conn import db_connect, DB_PATH
+from src.db.cocktail import catalog_version
+
+SNAPSHOT_PATH = os.path.splitext(DB_PATH)[0] + ".snapshot"
+SNAPSHOT_FORMAT = 1
+
+
+def build_snapshot(conn) -> Dict:
+    """
+    DB에서 스냅샷 데이터를 만듭니다.
+
+    Returns:
+        {
+            'format': 스냅샷 형식 버전,
+            'stamp': (token, version),
+            'cocktails': [(name, ingredients, garnish, glassware, preparation, price, note), ...],
+            'ingredients': {name: [재료명, ...]}
+        }
+    """
+    cursor = conn.cursor()
+    # 읽는 도중 카탈로그가 바뀌지 않도록 하나의 읽기 트랜잭션에서 조회
+    cursor.execute("BEGIN")
+    try:
+        stamp = catalog_version(cursor)
+        cocktails = [
+            (name, ingredients, garnish, glassware, preparation,
+             float(price) if price is not None else None, note)
+            for name, ingredients, garnish, glassware, preparation, price, note
+            in cursor.execute("SELECT * FROM Cocktail")
+        ]
+        ingredients = {}
+        for cocktail, ingredient in cursor.execute(
+            "SELECT cocktail, ingredient FROM CocktailIngredient ORDER BY cocktail, position"
+        ):
+            ingredients.setdefault(cocktail, []).append(ingredient)
+    finally:
+        cursor.execute("COMMIT")
+
+    return {
+        'format': SNAPSHOT_FORMAT,
+        'stamp': stamp,
+        'cocktails': cocktails,
+        'ingredients': ingredients,
+    }
+
+
+def save_snapshot(data: Dict, path: str = SNAPSHOT_PATH):
+    """임시 파일에 쓴 뒤 교체하여, 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 합니다."""
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str = SNAPSHOT_PATH) -> Optional[Dict]:
+    """스냅샷 파일을 읽습니다. 없거나 형식이 다르면 None."""
+    try:
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+
+    if not isinstance(data, dict) or data.get('format') != SNAPSHOT_FORMAT:
+        return None
+    return data
+
+
+def refresh_snapshot(path: str = SNAPSHOT_PATH) -> Dict:
+    """DB로부터 스냅샷을 다시 만들어 저장합니다."""
+    conn = db_connect()
+    try:
+        data = build_snapshot(conn)
+    finally:
+        conn.close()
+    save_snapshot(data, path)
+    return data
+
+
+def refresh_snapshot_async(path: str = SNAPSHOT_PATH, data: Dict = None) -> threading.Thread:
+    """
+    백그라운드 스레드에서 스냅샷을 갱신합니다.
+    data가 주어지면 그대로 저장하고, 없으면 스레드 안에서 별도 DB 연결로 새로 만듭니다.
+    """
+    def run():
+        try:
+            if data is not None:
+                save_snapshot(data, path)
+            else:
+                refresh_snapshot(path)
+        except Exception as e:
+            print(f"스냅샷 갱신 오류: {e}")
+
+    thread = threading.Thread(target=run, name="catalog-snapshot", daemon=True)
+    thread.start()
+    return thread
+
+
+def load_catalog(path: str = SNAPSHOT_PATH) -> Tuple[List[tuple], Dict[str, List[str]], bool]:
+    """
+    카탈로그를 불러옵니다.
+    스냅샷 스탬프가 DB와 같으면 스냅샷을 그대로 사용하고,
+    다르면 SQL로 조회한 뒤 백그라운드에서 스냅샷 파일을 갱신합니다.
+
+    Returns:
+        (칵테일 행 리스트, {칵테일명: 재료명 리스트}, 스냅샷 사용 여부)
+    """
+    snapshot = load_snapshot(path)
+    conn = db_connect()
+    try:
+        current = catalog_version(conn.cursor())
+        if snapshot is not None and snapshot['stamp'] == current:
+            return snapshot['cocktails'], snapshot['ingredients'], True
+
+        data = build_snapshot(conn)
+    finally:
+        conn.close()
+
+    # 이미 조회한 데이터로 스냅샷 파일만 백그라운드에서 다시 기록
+    refresh_snapshot_async(path, data)
+    return data['cocktails'], data['ingredients'], False
@@ -0,0 +1,39 @@
+"""
+칵테일 레코드
+
+Cocktail 테이블 한 행을 그대로 담는 가벼운 불변 레코드입니다. (NamedTuple, 인스턴스 __dict__ 없음)
+가격은 숫자(float, 없으면 None)로 두고 "$12.00" 같은 표시 문자열은 화면에서 필요할 때만 만듭니다.
+"""
+
+from typing import Dict, NamedTuple, Optional
+
+
+def format_price(price: Optional[float]) -> str:
+    """가격을 표시용 문자열로 바꿉니다. (12 -> "$12.00", 없으면 "N/A")"""
+    return f"${price:,.2f}" if price else 'N/A'
+
+
+class Cocktail(NamedTuple):
+    name: str
+    ingredients: str
+    garnish: Optional[str] = None
+    glassware: Optional[str] = None
+    preparation: Optional[str] = None
+    price: Optional[float] = None
+    note: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row) -> "Cocktail":
+        """Cocktail 테이블 행 (name, ingredients, garnish, glassware, preparation, price, note, ...)"""
+        price = row[5]
+        return cls(row[0], row[1], row[2], row[3], row[4],
+                   float(price) if price is not None else None, row[6])
+
+    @classmethod
+    def from_dict(cls, info: Dict) -> "Cocktail":
+        """검색 결과 딕셔너리(점수 등 추가 키 포함)에서 레코드 필드만 가져옵니다."""
+        return cls(*(info.get(field) for field in cls._fields))
+
+    @property
+    def price_text(self) -> str:
+        return format_price(self.price)
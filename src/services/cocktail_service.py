@@ -3,68 +3,184 @@
 사용자의 입력(칵테일 이름 또는 맛/재료)을 기반으로 칵테일을 추천하는 서비스
 """
 
+import heapq
 import re
 import sqlite3
 import sys
 import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from os import remove
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from difflib import SequenceMatcher
 
+import numpy as np
+
 # 프로젝트 루트를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from src.db.conn import db_connect
-from src.db.cocktail import cocktail_select, coctail_insert
+from src.db.cocktail import (
+    cocktail_select, coctail_insert, cocktail_ingredient_select,
+    cocktail_select_page, cocktail_page_key, cocktail_count, catalog_version,
+    cocktail_search, SEARCH_COLUMNS, cocktail_similarity_select, cocktail_similarity_stamp,
+    cocktail_prices_at, cocktail_price_histogram
+)
+from src.utils.ingredient_parser import clean_ingredient_text, parse_ingredients
+from src.utils.ingredient_canon import canonical_ingredient
+from src.utils.flavor_profile import FLAVOR_DIMS, taste_vector
+from src.services.catalog_snapshot import load_catalog
+from src.services.cocktail_record import Cocktail, format_price
+from src.services.search_index import CatalogIndex, IngredientIndex
+from src.services.query_cache import QueryCache
+from src.services.similarity import refresh_similarity, DEFAULT_TOP_N
+from src.services.minhash_lsh import MinHashLSH, load_lsh
+from src.services.popularity import ensure_popularity, popularity_snapshot, popularity_version
 
 
 class CocktailService:
-    def __init__(self):
+    # recommend_by_taste_ingredients 에서 선택 가능한 점수 방식
+    SCORERS = ('bm25', 'legacy')
+    # 인기도를 섞을 때 관련도 기준으로 먼저 뽑아 두는 후보 수 (top_n * 배수, 최소값)
+    POPULARITY_POOL_FACTOR = 5
+    POPULARITY_POOL_MIN = 50
+    # recommend_many에서 작업 프로세스를 띄울 최소 (중복 제거한) 질의 수
+    BATCH_MIN_PARALLEL = 64
+
+    def __init__(self, cache_size: int = 256):
         """
         칵테일 서비스 초기화 (DB 기반)
-        """
-        self.conn = db_connect()
-        self.cursor = self.conn.cursor()
 
-    def get_all_cocktails(self) -> List[Dict]:
+        여러 스레드에서 같은 서비스를 호출해도 됩니다.
+        SQLite 연결은 스레드마다 따로 열고(self.conn / self.cursor), 카탈로그 인덱스처럼
+        메모리에 만든 인덱스는 만든 뒤 바꾸지 않고 공유합니다.
+
+        Args:
+            cache_size: 추천/퍼지 검색 결과 LRU 캐시 크기 (0이면 캐시 사용 안 함)
+        """
+        # 스레드별 DB 연결
+        self._local = threading.local()
+        # 공유 인덱스를 새로 만들거나 유사도/LSH 파일을 갱신할 때 쓰는 잠금
+        self._lock = threading.RLock()
+        # 인기도 테이블 첫 초기화는 DAO 모듈 연결을 쓰므로 만든 스레드에서 미리 확인
+        ensure_popularity()
+        # (카탈로그 버전, 히스토그램 구간 수, 통계) - 카탈로그가 바뀌면 다시 계산
+        self._stats_cache = None
+        # (카탈로그 버전, CatalogIndex)
+        self._catalog_index = None
+        # 추천/퍼지 검색 결과 캐시 - 카탈로그가 바뀌면 비움
+        self._query_cache = QueryCache(cache_size)
+        # 품절 기본 재료 (canonical_ingredient 기준) - 나머지 재료는 모두 재고 있음으로 간주
+        # 바꿀 때마다 새 frozenset으로 교체하므로 읽는 쪽은 잠금 없이 사용
+        self._out_of_stock = frozenset()
+        # MinHash LSH 근사 이웃 인덱스 (처음 사용할 때 파일에서 읽음)
+        self._lsh = None
+        # 유사도 테이블 백그라운드 갱신 (add_cocktail 이후) - 실행 중인 스레드, 다시 계산할 일이 남았는지
+        self._similarity_worker = None
+        self._similarity_pending = False
+        # (인기도 버전, {칵테일명: 인기도}) - 새 주문이 반영되면 다시 읽음
+        self._popularity = None
+        # 마지막 recommend_many 처리량 집계
+        self.batch_stats = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """호출한 스레드 전용 DB 연결 (처음 사용할 때 엶)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = db_connect()
+            self._local.cursor = conn.cursor()
+        return conn
+
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        """호출한 스레드 전용 커서"""
+        cursor = getattr(self._local, 'cursor', None)
+        if cursor is None:
+            self.conn
+            cursor = self._local.cursor
+        return cursor
+
+    def close(self):
+        """호출한 스레드의 DB 연결을 닫습니다. (다른 스레드의 연결은 스레드가 끝날 때 정리됨)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = self._local.cursor = None
+            conn.close()
+
+    def get_all_cocktails(self) -> List[Cocktail]:
         """모든 칵테일을 반환합니다."""
-        rows = cocktail_select()  # 이미 정의된 함수 사용
+        return [Cocktail.from_row(row) for row in cocktail_select(self.cursor)]
 
-        cocktails = []
-        for row in rows:
-            cocktail = {
-                'name': row[0],
-                'ingredients': row[1],
-                'garnish': row[2] if row[2] else 'N/A',
-                'glassware': row[3] if row[3] else 'N/A',
-                'preparation': row[4] if row[4] else 'N/A',
-                'price': f"${row[5]:.2f}" if row[5] else 'N/A',
-                'note': row[6] if row[6] else 'N/A'
-            }
-            cocktails.append(cocktail)
+    def get_all_cocktails_snapshot(self) -> List[Cocktail]:
+        """
+        모든 칵테일을 반환합니다. (카탈로그 스냅샷 사용)
+        스냅샷이 최신이면 파일 한 번 읽기로 끝나고, 오래된 경우에만 SQL로 조회합니다.
+        """
+        rows, _, _ = load_catalog()
+        return [Cocktail.from_row(row) for row in rows]
+
+    def get_cocktails_page(self, after_key=None, limit: int = 10, order_by: str = 'name',
+                           name_contains: str = None, min_price: float = None,
+                           max_price: float = None) -> Dict:
+        """
+        키셋 페이지네이션으로 칵테일 한 페이지를 반환합니다.
 
-        return cocktails
+        Args:
+            after_key: 이전 페이지의 next_key (첫 페이지는 None)
+            limit: 페이지 크기
+            order_by: 'name' 또는 'price'
+            name_contains: 이름 부분 검색어
+            min_price / max_price: 가격 범위
 
-    def _clean_ingredients(self, ingredients: str) -> str:
-        """재료 문자열을 정리합니다."""
-        if not ingredients:
-            return ""
+        Returns:
+            {'items': Cocktail 리스트, 'next_key': 다음 페이지 키 (마지막 페이지면 None)}
+        """
+        rows = cocktail_select_page(
+            after_key, limit + 1, order_by, cursor=self.cursor,
+            name_contains=name_contains, min_price=min_price, max_price=max_price
+        )
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+
+        return {
+            'items': [Cocktail.from_row(row) for row in rows],
+            'next_key': cocktail_page_key(rows[-1], order_by) if has_next else None
+        }
+
+    def count_cocktails(self, name_contains: str = None, min_price: float = None,
+                        max_price: float = None) -> int:
+        """필터 조건에 맞는 칵테일 수를 반환합니다."""
+        return cocktail_count(self.cursor, name_contains=name_contains, min_price=min_price, max_price=max_price)
 
-        # 불필요한 기호와 수량 제거, 소문자 변환
-        cleaned = re.sub(r'\d+\.?\d*\s*(oz|ml|dash|drops?|cup|tsp|tbsp)', '', ingredients.lower())
-        cleaned = re.sub(r'[,\n\r\*\-\+\(\)]', ' ', cleaned)
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        return cleaned
+    def _clean_ingredients(self, ingredients: str) -> str:
+        """재료 문자열을 정리합니다. (같은 문자열은 한 번만 정리하도록 캐시됨)"""
+        return clean_ingredient_text(ingredients)
+
+    def get_cocktail_ingredients(self, name: str) -> List[Dict]:
+        """CocktailIngredient 테이블에서 파싱된 재료 목록을 반환합니다."""
+        return [
+            {
+                'position': position,
+                'amount': amount,
+                'unit': unit,
+                'raw': raw,
+                'ingredient': ingredient
+            }
+            for position, amount, unit, raw, ingredient in cocktail_ingredient_select(name, self.cursor)
+        ]
 
-    def find_cocktail_by_name(self, name: str) -> Dict:
-        """칵테일 이름으로 정확한 칵테일을 찾습니다."""
+    def find_cocktail_by_name(self, name: str) -> Optional[Cocktail]:
+        """칵테일 이름으로 정확한 칵테일을 찾습니다. (없으면 None)"""
         # 정확한 이름 매칭 (대소문자 무시)
         query = "SELECT * FROM Cocktail WHERE LOWER(name) = LOWER(?)"
         self.cursor.execute(query, (name.strip(),))
         row = self.cursor.fetchone()
 
         if row:
-            return self._format_cocktail_info(row)
+            return Cocktail.from_row(row)
 
         # 부분 매칭
         query = "SELECT * FROM Cocktail WHERE LOWER(name) LIKE LOWER(?)"
@@ -72,39 +188,298 @@ class CocktailService:
         row = self.cursor.fetchone()
 
         if row:
-            return self._format_cocktail_info(row)
-
-        return {}
-
-    def recommend_by_taste_ingredients(self, user_input: str, top_n: int = 5) -> List[Dict]:
+            return Cocktail.from_row(row)
+
+        return None
+
+    def _get_catalog(self) -> Tuple[Tuple, CatalogIndex]:
+        """(카탈로그 버전, 검색 인덱스 묶음)을 반환합니다. 카탈로그 버전이 바뀌면 다시 만듭니다."""
+        stamp = catalog_version(self.cursor)
+        current = self._catalog_index
+        if current is None or current[0] != stamp:
+            with self._lock:
+                current = self._catalog_index
+                if current is None or current[0] != stamp:
+                    current = (stamp, CatalogIndex(cocktail_select(self.cursor)))
+                    self._catalog_index = current
+                    self._query_cache.clear()
+        return current
+
+    def _get_catalog_index(self) -> CatalogIndex:
+        """검색 인덱스 묶음을 반환합니다. 카탈로그 버전이 바뀌면 다시 만듭니다."""
+        return self._get_catalog()[1]
+
+    def query_cache_stats(self) -> Dict:
+        """결과 캐시의 hit / miss / eviction 집계를 반환합니다."""
+        return self._query_cache.stats()
+
+    def clear_query_cache(self):
+        self._query_cache.clear()
+
+    def _cached(self, stamp, key, compute) -> List[Dict]:
+        """
+        key로 캐시된 결과를 반환하고, 없으면 compute()로 계산해 저장합니다.
+        stamp는 compute가 사용하는 인덱스를 만든 카탈로그 버전으로 키에 함께 넣습니다.
+        (다른 스레드가 인덱스를 다시 만들며 캐시를 비운 뒤에 옛 인덱스의 결과가 저장되어도 다시 쓰이지 않음)
+        호출자가 결과를 고쳐도 캐시가 바뀌지 않도록 항상 복사본을 돌려줍니다.
+        """
+        key = (stamp,) + key
+        results = self._query_cache.get(key)
+        if results is None:
+            results = compute()
+            self._query_cache.put(key, results)
+        return self._copy_results(results)
+
+    @staticmethod
+    def _copy_results(results: List[Dict]) -> List[Dict]:
+        return [
+            {k: v.copy() if isinstance(v, (list, dict)) else v for k, v in item.items()}
+            for item in results
+        ]
+
+    def _get_ingredient_index(self) -> IngredientIndex:
+        """재료 키워드 역색인을 반환합니다."""
+        return self._get_catalog_index().ingredients
+
+    def recommend_by_taste_ingredients(self, user_input: str, top_n: int = 5,
+                                       scorer: str = 'bm25',
+                                       popularity_weight: float = 0.0) -> List[Dict]:
         """
         사용자가 입력한 맛/재료를 기반으로 칵테일을 추천합니다.
 
         Args:
             user_input: 사용자가 입력한 맛/재료 설명 (예: "gin tonic lime lemon pitch Mezcal")
             top_n: 추천할 칵테일 개수
+            scorer: 'bm25' (BM25 희소 행렬 점수) 또는 'legacy' (키워드 겹침 0.7 + SequenceMatcher 0.3)
+            popularity_weight: 최근 주문 인기도를 섞는 비율 (0~1, 0이면 관련도만 사용)
 
         Returns:
             추천 칵테일 리스트 (유사도 점수 및 매칭 키워드 포함)
+            popularity_weight > 0 이면 'popularity', 'blended_score'가 추가되고 blended_score 순으로 정렬됩니다.
         """
-        # 모든 칵테일 가져오기
-        rows = cocktail_select()  # 이미 정의된 함수 사용
+        if scorer not in self.SCORERS:
+            raise ValueError(f"지원하지 않는 scorer: {scorer}")
+        if not 0.0 <= popularity_weight <= 1.0:
+            raise ValueError(f"popularity_weight는 0~1 사이여야 합니다: {popularity_weight}")
+
+        # 재료 키워드 역색인 (카탈로그가 바뀌었을 때만 다시 만듦)
+        stamp, catalog = self._get_catalog()
+        index = catalog.ingredients
 
-        if not rows:
+        if not len(index):
             return []
 
         user_input_cleaned = self._clean_ingredients(user_input)
         user_keywords = set(user_input_cleaned.split())
 
+        # 인기도로 순위가 바뀔 수 있으므로 관련도 후보를 넉넉히 뽑은 뒤 다시 정렬
+        pool_n = top_n
+        if popularity_weight > 0 and top_n > 0:
+            pool_n = max(top_n * self.POPULARITY_POOL_FACTOR, self.POPULARITY_POOL_MIN)
+
+        # bm25는 키워드 집합만으로 결과가 정해지고,
+        # legacy는 정리된 문자열 전체를 SequenceMatcher로 비교하므로 문자열을 키로 사용
+        if scorer == 'legacy':
+            recommendations = self._cached(
+                stamp, ('legacy', user_input_cleaned, pool_n),
+                lambda: self._recommend_legacy(index, user_input_cleaned, user_keywords, pool_n)
+            )
+        else:
+            recommendations = self._cached(
+                stamp, ('bm25', tuple(sorted(user_keywords)), pool_n),
+                lambda: self._recommend_bm25(index, user_keywords, pool_n)
+            )
+
+        if popularity_weight > 0:
+            recommendations = self._blend_popularity(recommendations, popularity_weight, top_n)
+        return recommendations
+
+    def _recommend_uncached(self, index: IngredientIndex, user_input: str, top_n: int,
+                            scorer: str) -> List[Dict]:
+        """캐시와 DB를 거치지 않고 주어진 인덱스로 질의 하나를 추천합니다. (recommend_many 작업 단위)"""
+        user_input_cleaned = self._clean_ingredients(user_input)
+        user_keywords = set(user_input_cleaned.split())
+        if scorer == 'legacy':
+            return self._recommend_legacy(index, user_input_cleaned, user_keywords, top_n)
+        return self._recommend_bm25(index, user_keywords, top_n)
+
+    def recommend_many(self, queries: List[str], top_n: int = 5, scorer: str = 'bm25',
+                       workers: int = None, chunksize: int = None) -> List[List[Dict]]:
+        """
+        여러 맛/재료 질의를 한 번에 추천합니다. (메뉴 전체 "비슷한 칵테일" 목록, 설문 응답 채점 등)
+
+        카탈로그 인덱스는 한 번만 만들어 작업 프로세스에 넘기고, 같은 질의는 한 번만 계산합니다.
+        결과는 입력 순서와 같으며, 처리량은 batch_stats에 기록됩니다.
+
+        Args:
+            queries: 맛/재료 질의 리스트
+            top_n / scorer: recommend_by_taste_ingredients와 같음
+            workers: 작업 프로세스 수 (기본 CPU 수, 1이면 현재 프로세스에서 처리)
+            chunksize: 작업 프로세스에 한 번에 넘기는 질의 수 (기본 자동)
+
+        Returns:
+            질의별 추천 칵테일 리스트의 리스트
+        """
+        if scorer not in self.SCORERS:
+            raise ValueError(f"지원하지 않는 scorer: {scorer}")
+
+        start = time.perf_counter()
+        queries = list(queries)
+        unique = list(dict.fromkeys(queries))
+        workers = max(1, min(workers or os.cpu_count() or 1, len(unique)))
+
+        index = self._get_ingredient_index()
+        if not len(index):
+            results = [[] for _ in unique]
+        elif workers == 1 or len(unique) < self.BATCH_MIN_PARALLEL:
+            workers = 1
+            results = [self._recommend_uncached(index, query, top_n, scorer) for query in unique]
+        else:
+            # 작업 프로세스마다 다시 만들지 않도록 BM25 행렬을 미리 만든 뒤 넘김
+            index.bm25
+            if chunksize is None:
+                chunksize = max(1, len(unique) // (workers * 4))
+            with ProcessPoolExecutor(workers, initializer=_init_batch_worker, initargs=(index,)) as pool:
+                results = list(pool.map(
+                    partial(_recommend_batch, top_n=top_n, scorer=scorer), unique, chunksize=chunksize
+                ))
+
+        by_query = dict(zip(unique, results))
+        elapsed = time.perf_counter() - start
+        self.batch_stats = {
+            'queries': len(queries),
+            'unique': len(unique),
+            'workers': workers,
+            'seconds': elapsed,
+            'queries_per_sec': len(queries) / elapsed if elapsed > 0 else 0.0,
+        }
+        # 같은 질의가 여러 번 있어도 결과를 따로 고칠 수 있도록 복사본을 돌려줌
+        return [self._copy_results(by_query[query]) for query in queries]
+
+    def _get_popularity(self) -> Dict[str, float]:
+        """칵테일별 인기도(0~1)를 반환합니다. 주문이 반영되어 버전이 바뀐 경우에만 다시 읽습니다."""
+        current = self._popularity
+        if current is None or current[0] != popularity_version(self.cursor):
+            current = self._popularity = popularity_snapshot(self.cursor)
+        return current[1]
+
+    def _blend_popularity(self, recommendations: List[Dict], weight: float, top_n: int) -> List[Dict]:
+        """
+        blended_score = (1 - weight) * similarity_score + weight * popularity 로 다시 정렬합니다.
+        같은 점수는 기존 관련도 순서를 유지합니다.
+        """
+        popularity = self._get_popularity()
+        for cocktail_info in recommendations:
+            score = popularity.get(cocktail_info['name'], 0.0)
+            cocktail_info['popularity'] = round(score, 3)
+            cocktail_info['blended_score'] = round(
+                (1 - weight) * cocktail_info['similarity_score'] + weight * score, 3
+            )
+        recommendations.sort(key=lambda x: x['blended_score'], reverse=True)
+        return recommendations[:top_n] if top_n > 0 else recommendations
+
+    def _recommend_bm25(self, index: IngredientIndex, user_keywords: set, top_n: int) -> List[Dict]:
+        """
+        BM25 점수로 상위 top_n개를 추천합니다.
+        similarity_score는 질의 용어로 얻을 수 있는 최대 점수 대비 비율(0~1)입니다.
+        """
+        bm25 = index.bm25
+        max_score = bm25.max_score(user_keywords) or 1.0
+
         recommendations = []
+        for doc_id, score in bm25.top_k(user_keywords, top_n):
+            row, _, cocktail_keywords = index.docs[doc_id]
+            cocktail_info = self._format_cocktail_info(row)
+            cocktail_info['similarity_score'] = round(score / max_score, 3)
+            cocktail_info['matching_keywords'] = list(user_keywords.intersection(cocktail_keywords))
+            recommendations.append(cocktail_info)
+        return recommendations
 
-        for row in rows:
-            if not row[0] or not row[1]:  # name 또는 ingredients가 없으면 건너뛰기
-                continue
+    def _recommend_legacy(self, index: IngredientIndex, user_input_cleaned: str,
+                          user_keywords: set, top_n: int) -> List[Dict]:
+        """
+        기존 방식: 키워드 겹침 비율 0.7 + 문자열 유사도 0.3
+
+        상위 top_n개만 힙으로 유지하며, 점수 상한이 현재 k번째를 넘지 못하는 칵테일은
+        SequenceMatcher 계산과 결과 포맷팅을 건너뜁니다.
+        점수 상한 = 키워드 점수 * 0.7 + 2 * min(la, lb) / (la + lb) * 0.3 (real_quick_ratio)
+        키워드가 겹치지 않는 칵테일도 문자열 유사도만으로 임계값을 넘을 수 있으므로 후보에서 빼지 않습니다.
+        순위는 기존과 같이 반올림 점수 내림차순, 같은 점수는 카탈로그 순서입니다.
+        """
+        if top_n <= 0:
+            return self._recommend_legacy_all(index, user_input_cleaned, user_keywords)[:top_n]
+
+        query_len = len(user_input_cleaned)
+        matched = index.candidates(user_keywords)
+
+        # (반올림 점수, -doc id, 공통 키워드) 최소 힙 - heap[0]이 현재 k번째
+        heap = []
+        matcher = SequenceMatcher(None, user_input_cleaned)
+
+        # 검색어 키워드를 하나라도 포함한 칵테일부터 보고, 키워드가 겹치지 않는 칵테일은
+        # 문자열 유사도만으로 받을 수 있는 최대 점수(0.3)가 현재 k번째 이상일 때만 봄
+        for overlap in (True, False):
+            if overlap:
+                doc_ids = matched
+            elif len(heap) >= top_n and heap[0][0] > 0.3:
+                break
+            else:
+                matched_ids = set(matched)
+                doc_ids = [doc_id for doc_id in range(len(index.docs)) if doc_id not in matched_ids]
+
+            # 키워드 점수와 점수 상한
+            bounded = []
+            for doc_id in doc_ids:
+                _, cocktail_ingredients_cleaned, cocktail_keywords = index.docs[doc_id]
+                common_keywords = user_keywords.intersection(cocktail_keywords) if overlap else set()
+                keyword_score = len(common_keywords) / max(len(user_keywords), 1)
+
+                doc_len = len(cocktail_ingredients_cleaned)
+                total_len = query_len + doc_len
+                text_bound = 2 * min(query_len, doc_len) / total_len if total_len else 1.0
+                upper = (keyword_score * 0.7) + (text_bound * 0.3)
+                if upper > 0.1:  # 최소 임계값
+                    bounded.append((upper, doc_id, keyword_score, common_keywords))
+
+            # 상한이 큰 순서로 보면 k번째 점수가 빨리 올라가 나머지를 일찍 건너뛸 수 있음
+            bounded.sort(key=lambda item: (-item[0], item[1]))
+
+            for upper, doc_id, keyword_score, common_keywords in bounded:
+                if len(heap) >= top_n:
+                    floor = heap[0][:2]
+                    upper_rounded = round(upper, 3)
+                    if upper_rounded < floor[0]:
+                        break  # 이후 후보의 상한은 모두 이보다 작거나 같음
+                    if (upper_rounded, -doc_id) <= floor:
+                        continue
+
+                matcher.set_seq2(index.docs[doc_id].cleaned)
+                final_score = (keyword_score * 0.7) + (matcher.ratio() * 0.3)
+                if final_score <= 0.1:
+                    continue
+
+                entry = (round(final_score, 3), -doc_id, common_keywords)
+                if len(heap) < top_n:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
 
-            # 재료 기반 유사도 계산
-            cocktail_ingredients_cleaned = self._clean_ingredients(row[1])
-            cocktail_keywords = set(cocktail_ingredients_cleaned.split())
+        recommendations = []
+        for rounded, neg_doc_id, common_keywords in sorted(heap, reverse=True):
+            cocktail_info = self._format_cocktail_info(index.docs[-neg_doc_id].row)
+            cocktail_info['similarity_score'] = rounded
+            cocktail_info['matching_keywords'] = list(common_keywords)
+            recommendations.append(cocktail_info)
+        return recommendations
+
+    def _recommend_legacy_all(self, index: IngredientIndex, user_input_cleaned: str,
+                              user_keywords: set) -> List[Dict]:
+        """임계값을 넘는 모든 칵테일을 점수순으로 반환합니다. (top_n <= 0 일 때의 기존 동작)"""
+        recommendations = []
+
+        # 키워드가 겹치지 않아도 문자열 유사도로 임계값을 넘을 수 있으므로 전체를 봄
+        for doc_id in range(len(index.docs)):
+            row, cocktail_ingredients_cleaned, cocktail_keywords = index.docs[doc_id]
 
             # 공통 키워드 개수 기반 점수
             common_keywords = user_keywords.intersection(cocktail_keywords)
@@ -126,21 +501,45 @@ class CocktailService:
                 cocktail_info['matching_keywords'] = list(common_keywords)
                 recommendations.append(cocktail_info)
 
-        # 점수 순으로 정렬하여 상위 n개 반환
+        # 점수 순으로 정렬
         recommendations.sort(key=lambda x: x['similarity_score'], reverse=True)
-        return recommendations[:top_n]
+        return recommendations
+
+    def recommend_by_flavor(self, user_input: str, top_n: int = 5) -> List[Dict]:
+        """
+        맛 표현("sweet sour refreshing", "스모키하고 독한")으로 칵테일을 추천합니다.
+        입력을 맛 벡터로 바꾼 뒤, 칵테일 맛 벡터 k-d 트리에서 가장 가까운 top_n개를 찾습니다.
+
+        Returns:
+            추천 칵테일 리스트 (flavor_score: 코사인 유사도, flavor_profile: 칵테일 맛 벡터)
+        """
+        vector = taste_vector(user_input)
+        if vector is None:
+            return []
+
+        stamp, catalog = self._get_catalog()
+        flavors = catalog.flavors
+
+        def compute():
+            recommendations = []
+            for doc_id, score in flavors.nearest(vector, top_n):
+                cocktail_info = self._format_cocktail_info(flavors.rows[doc_id])
+                cocktail_info['flavor_score'] = round(score, 3)
+                cocktail_info['flavor_profile'] = {
+                    dim: round(float(value), 3)
+                    for dim, value in zip(FLAVOR_DIMS, flavors.profiles[doc_id]) if value > 0
+                }
+                recommendations.append(cocktail_info)
+            return recommendations
+
+        return self._cached(stamp, ('flavor', tuple(np.round(vector, 6)), top_n), compute)
 
     def _format_cocktail_info(self, row) -> Dict:
-        """칵테일 정보를 딕셔너리로 포맷팅합니다."""
-        return {
-            'name': row[0],
-            'ingredients': row[1],
-            'garnish': row[2] if row[2] else 'N/A',
-            'glassware': row[3] if row[3] else 'N/A',
-            'preparation': row[4] if row[4] else 'N/A',
-            'price': f"${row[5]:.2f}" if row[5] else 'N/A',
-            'note': row[6] if row[6] else 'N/A'
-        }
+        """
+        검색 결과 한 건을 딕셔너리로 만듭니다. (Cocktail 필드 + 호출한 쪽에서 점수 키를 추가)
+        가격은 숫자 그대로이며 표시용 문자열은 화면에서 format_price()로 만듭니다.
+        """
+        return Cocktail.from_row(row)._asdict()
 
     def search_cocktails_fuzzy(self, query: str, threshold: float = 0.6) -> List[Dict]:
         """
@@ -154,20 +553,53 @@ class CocktailService:
             유사한 칵테일 리스트
         """
         query_lower = query.lower().strip()
+        stamp, catalog = self._get_catalog()
+
+        return self._cached(
+            stamp, ('fuzzy', query_lower, threshold),
+            lambda: self._search_fuzzy(catalog.names, query_lower, threshold)
+        )
+
+    def autocomplete(self, query: str, limit: int = 8, max_typos: int = 2) -> List[Dict]:
+        """
+        검색창 자동완성 후보 (칵테일 이름 + 재료, 오타 허용)
 
-        # 모든 칵테일 가져오기
-        rows = cocktail_select()  # 이미 정의된 함수 사용
+        Args:
+            query: 지금까지 입력한 검색어
+            limit: 최대 후보 수
+            max_typos: 허용할 최대 오타 수 (0~2, 짧은 입력은 자동으로 줄어듦)
 
+        Returns:
+            [{'text': 표시 이름, 'kind': 'name' 또는 'ingredient', 'typos': 오타 수}, ...]
+            오타 수가 적은 순, 이름 앞부분이 맞는 후보 먼저
+        """
+        if not 0 <= max_typos <= 2:
+            raise ValueError(f"max_typos는 0~2 사이여야 합니다: {max_typos}")
+        stamp, catalog = self._get_catalog()
+        index = catalog.autocomplete
+
+        return self._cached(
+            stamp, ('autocomplete', index.normalize(query), limit, max_typos),
+            lambda: [
+                {'text': text, 'kind': kind, 'typos': typos}
+                for text, kind, typos in index.search(query, limit, max_typos)
+            ]
+        )
+
+    def _search_fuzzy(self, index, query_lower: str, threshold: float) -> List[Dict]:
+        """
+        trigram 인덱스로 threshold를 넘을 수 없는 이름을 먼저 제외하고,
+        남은 후보만 정확히 비교합니다. (후보는 카탈로그 순서)
+        """
         fuzzy_matches = []
 
-        for row in rows:
-            if not row[0]:  # name이 없으면 건너뛰기
-                continue
+        for doc_id in index.candidates(query_lower, threshold):
+            row = index.rows[doc_id]
 
             similarity = SequenceMatcher(
                 None,
                 query_lower,
-                row[0].lower()
+                index.names[doc_id]
             ).ratio()
 
             if similarity >= threshold:
@@ -179,37 +611,333 @@ class CocktailService:
         fuzzy_matches.sort(key=lambda x: x['name_similarity'], reverse=True)
         return fuzzy_matches
 
-    def get_cocktail_statistics(self) -> Dict:
-        """데이터베이스 통계 정보를 반환합니다."""
-        stats = {}
+    def similar_cocktails(self, name: str, k: int = 5) -> List[Dict]:
+        """
+        재료가 비슷한 칵테일을 반환합니다. (미리 계산된 Jaccard 유사도 테이블 조회)
+        읽기만 하며 여기서 테이블을 다시 계산하지 않습니다. 카탈로그가 바뀐 뒤 아직 갱신되지 않았으면
+        이전 결과(삭제된 칵테일은 빠짐)를, 한 번도 계산하지 않았으면 빈 리스트를 반환합니다.
+        갱신은 저장 경로(add_cocktail, catalog_import, data_to_db)나
+        `python -m src.services.similarity` 작업에서 합니다.
 
-        # 전체 칵테일 수
-        self.cursor.execute("SELECT COUNT(*) FROM Cocktail")
-        stats['total_cocktails'] = self.cursor.fetchone()[0]
+        Args:
+            name: 기준 칵테일 이름
+            k: 반환할 개수 (최대 similarity.DEFAULT_TOP_N)
+
+        Returns:
+            비슷한 칵테일 리스트 (similarity: 재료 Jaccard 유사도)
+        """
+        results = []
+        for row in cocktail_similarity_select(name, k, self.cursor):
+            cocktail_info = self._format_cocktail_info(row)
+            cocktail_info['similarity'] = round(row[-1], 3)
+            results.append(cocktail_info)
+        return results
+
+    def similarity_is_stale(self) -> bool:
+        """유사도 테이블이 현재 카탈로그보다 오래되었는지"""
+        cursor = self.cursor
+        return cocktail_similarity_stamp(cursor) != catalog_version(cursor)
+
+    def refresh_similarity_in_background(self):
+        """
+        유사도 테이블을 백그라운드 스레드(별도 연결)에서 다시 계산합니다.
+        이미 계산 중이면 그 계산이 끝난 뒤 한 번 더 계산하도록 표시만 합니다.
+        """
+        with self._lock:
+            self._similarity_pending = True
+            if self._similarity_worker is None:
+                self._similarity_worker = threading.Thread(
+                    target=self._similarity_loop, name="k-tail-similarity", daemon=True
+                )
+                self._similarity_worker.start()
+
+    def _similarity_loop(self):
+        conn = db_connect()
+        try:
+            while True:
+                with self._lock:
+                    if not self._similarity_pending:
+                        self._similarity_worker = None
+                        return
+                    self._similarity_pending = False
+                refresh_similarity(DEFAULT_TOP_N, conn.cursor())
+        except sqlite3.Error as e:
+            print(f"Error refreshing similarity: {e}")
+            with self._lock:
+                self._similarity_worker = None
+        finally:
+            conn.close()
+
+    def _get_lsh(self) -> MinHashLSH:
+        """LSH 인덱스를 반환합니다. 카탈로그가 바뀌었으면 다시 만들어 저장합니다."""
+        stamp = catalog_version(self.cursor)
+        current = self._lsh
+        if current is None or current.stamp != stamp:
+            with self._lock:
+                current = self._lsh
+                if current is None or current.stamp != stamp:
+                    current = self._lsh = load_lsh(cursor=self.cursor)
+        return current
+
+    def _format_neighbors(self, neighbors) -> List[Dict]:
+        catalog = self._get_catalog_index()
+        results = []
+        for name, estimate in neighbors:
+            row = catalog.by_name.get(name)
+            if row is None:
+                continue
+            cocktail_info = self._format_cocktail_info(row)
+            cocktail_info['similarity'] = round(estimate, 3)
+            results.append(cocktail_info)
+        return results
+
+    def similar_cocktails_approx(self, name: str, k: int = 5) -> List[Dict]:
+        """
+        재료가 비슷한 칵테일을 MinHash LSH로 근사 검색합니다. (대용량 카탈로그용)
+        similarity는 MinHash로 추정한 Jaccard 유사도입니다.
+        """
+        return self._format_neighbors(self._get_lsh().query_name(name, k))
+
+    def similar_to_ingredients(self, ingredients: List[str], k: int = 5) -> List[Dict]:
+        """
+        주어진 재료 목록과 재료 구성이 비슷한 칵테일을 MinHash LSH로 근사 검색합니다.
+        각 항목은 "2 oz Tequila" 처럼 수량이 붙거나 쉼표로 이어진 원문이어도 되며,
+        인덱스와 같은 방식(parse_ingredients -> canonical_ingredient)으로 기본 재료로 바꿔 비교합니다.
+        """
+        keys = {
+            canonical_ingredient(parsed.ingredient)
+            for text in ingredients
+            for parsed in parse_ingredients(text or "")
+        }
+        keys.discard(None)
+        if not keys:
+            return []
+        return self._format_neighbors(self._get_lsh().query(sorted(keys), k))
+
+    def ingredient_vocabulary(self) -> List[str]:
+        """카탈로그에 쓰인 기본 재료 목록 (재고 설정용, 상표/수량 구분 없음)"""
+        return sorted(self._get_catalog_index().bitsets.vocab)
+
+    def set_ingredient_stock(self, ingredient: str, available: bool) -> bool:
+        """
+        재료 하나의 재고 여부를 바꿉니다.
+
+        Returns:
+            바뀌었으면 True, 이미 같은 상태였으면 False
+        """
+        key = canonical_ingredient(ingredient)
+        if key not in self._get_catalog_index().bitsets.vocab:
+            raise ValueError(f"카탈로그에 없는 재료: {ingredient}")
+
+        with self._lock:
+            if available == (key not in self._out_of_stock):
+                return False
+            if available:
+                self._out_of_stock = self._out_of_stock - {key}
+            else:
+                self._out_of_stock = self._out_of_stock | {key}
+        return True
+
+    def out_of_stock_ingredients(self) -> List[str]:
+        return sorted(self._out_of_stock)
+
+    def makeable_cocktails(self, stock=None) -> List[Cocktail]:
+        """
+        지금 재고로 만들 수 있는 칵테일을 카탈로그 순서로 반환합니다.
+        필요한 재료 비트셋이 재고 비트셋의 부분집합인지를 전체 칵테일에 대해 한 번에 검사합니다.
+
+        Args:
+            stock: 재고 재료 목록. None이면 set_ingredient_stock()으로 품절 처리한 재료만 제외
+
+        Returns:
+            만들 수 있는 칵테일 리스트
+        """
+        catalog = self._get_catalog_index()
+        bitsets = catalog.bitsets
+        if not len(bitsets):
+            return []
+
+        if stock is None:
+            missing = bitsets.mask(self._out_of_stock)
+        else:
+            missing = ~bitsets.mask(canonical_ingredient(ingredient) for ingredient in stock)
+
+        # 필요한 재료 중 하나라도 missing에 있으면 만들 수 없음
+        makeable = ~np.any(bitsets.bits & missing, axis=1)
+        return [
+            Cocktail.from_row(catalog.by_name[bitsets.names[doc_id]])
+            for doc_id in np.flatnonzero(makeable)
+        ]
+
+    @staticmethod
+    def _build_match_query(text: str, columns=None, prefix: bool = True) -> str:
+        """
+        사용자 입력을 FTS5 MATCH 식으로 바꿉니다.
+        단어마다 따옴표로 감싸 FTS5 문법 문자를 무력화하고, 모든 단어가 포함되어야 합니다(AND).
+        """
+        terms = re.findall(r'\w+', text.lower())
+        if not terms:
+            return ""
+        suffix = '*' if prefix else ''
+        expression = ' '.join(f'"{term}"{suffix}' for term in terms)
+        if columns:
+            return f"{{{' '.join(columns)}}} : ({expression})"
+        return expression
+
+    def search_cocktails_text(self, query: str, columns: List[str] = None, prefix: bool = True,
+                              limit: int = 20, raw: bool = False) -> List[Dict]:
+        """
+        FTS5 전문 검색으로 칵테일을 찾습니다. (bm25 순위, 이름 > 재료 > 가니시 > 잔/노트 가중치)
 
-        # 고유 칵테일 수 (실제로는 name이 PRIMARY KEY이므로 total과 같음)
-        self.cursor.execute("SELECT COUNT(DISTINCT name) FROM Cocktail")
-        stats['unique_cocktails'] = self.cursor.fetchone()[0]
+        Args:
+            query: 검색어 (raw=True면 FTS5 MATCH 식을 그대로 사용)
+            columns: 검색할 컬럼 (name, ingredients, garnish, glassware, note 중), None이면 전체
+            prefix: 각 단어를 접두어로 검색 ("marg" -> margarita)
+            limit: 최대 결과 수
+
+        Returns:
+            칵테일 리스트 (text_score: 클수록 관련도가 높음)
+        """
+        if columns:
+            unknown = [c for c in columns if c not in SEARCH_COLUMNS]
+            if unknown:
+                raise ValueError(f"검색할 수 없는 컬럼: {', '.join(unknown)}")
+
+        match = query if raw else self._build_match_query(query, columns, prefix)
+        if not match.strip():
+            return []
+
+        try:
+            rows = cocktail_search(match, limit, cursor=self.cursor)
+        except sqlite3.OperationalError as e:
+            print(f"전문 검색 오류: {e}")
+            return []
+
+        results = []
+        for row in rows:
+            cocktail_info = self._format_cocktail_info(row)
+            cocktail_info['text_score'] = round(-row[-1], 3)
+            results.append(cocktail_info)
+        return results
 
-        # 재료가 있는 칵테일 수
-        self.cursor.execute("SELECT COUNT(*) FROM Cocktail WHERE ingredients IS NOT NULL AND ingredients != ''")
-        stats['has_ingredients'] = self.cursor.fetchone()[0]
+    def get_catalog_statistics(self, histogram_bins: int = 10) -> Dict:
+        """
+        카탈로그 통계를 반환합니다.
+        개수/가격 집계는 한 번의 집계 쿼리로, 백분위수는 가격순 인덱스 한 번 훑기로,
+        히스토그램은 GROUP BY로 계산합니다. 세 조회는 하나의 읽기 트랜잭션에서 실행되어 같은 카탈로그를 보며,
+        결과는 카탈로그 버전이 바뀔 때까지 캐시됩니다.
+        (캐시된 값은 복사해서 반환)
+
+        Returns:
+            {
+                'total_cocktails', 'unique_cocktails', 'has_ingredients', 'has_garnish',
+                'has_glassware', 'has_preparation',
+                'price_count', 'min_price', 'max_price', 'average_price',
+                'percentiles': {25: ..., 50: ..., 75: ..., 90: ...},
+                'histogram': [{'low': ..., 'high': ..., 'count': ...}, ...]
+            }
+        """
+        stamp = catalog_version(self.cursor)
+        cached = self._stats_cache
+        if cached and cached[0] == stamp and cached[1] == histogram_bins:
+            return self._copy_stats(cached[2])
+
+        # 집계 / 백분위수 / 히스토그램이 같은 카탈로그를 보도록 하나의 읽기 트랜잭션에서 조회
+        cursor = self.cursor
+        own_transaction = not self.conn.in_transaction
+        if own_transaction:
+            cursor.execute("BEGIN")
+        try:
+            stamp = catalog_version(cursor)
+            cursor.execute("""
+            SELECT
+                COUNT(*),
+                COUNT(DISTINCT name),
+                SUM(ingredients IS NOT NULL AND ingredients != ''),
+                SUM(garnish IS NOT NULL AND garnish != ''),
+                SUM(glassware IS NOT NULL AND glassware != ''),
+                SUM(preparation IS NOT NULL AND preparation != ''),
+                COUNT(price),
+                MIN(price),
+                MAX(price),
+                AVG(price)
+            FROM Cocktail
+            """)
+            (total, unique, has_ingredients, has_garnish, has_glassware, has_preparation,
+             price_count, min_price, max_price, avg_price) = cursor.fetchone()
+
+            stats = {
+                'total_cocktails': total,
+                'unique_cocktails': unique,
+                'has_ingredients': has_ingredients or 0,
+                'has_garnish': has_garnish or 0,
+                'has_glassware': has_glassware or 0,
+                'has_preparation': has_preparation or 0,
+                'price_count': price_count,
+                'min_price': min_price,
+                'max_price': max_price,
+                'average_price': avg_price,
+                'percentiles': self._percentiles(price_count, (25, 50, 75, 90)),
+                'histogram': self._histogram(price_count, min_price, max_price, histogram_bins),
+            }
+        finally:
+            if own_transaction:
+                cursor.execute("COMMIT")
 
-        # 가니쉬가 있는 칵테일 수
-        self.cursor.execute("SELECT COUNT(*) FROM Cocktail WHERE garnish IS NOT NULL AND garnish != ''")
-        stats['has_garnish'] = self.cursor.fetchone()[0]
+        self._stats_cache = (stamp, histogram_bins, stats)
+        return self._copy_stats(stats)
 
-        # 글라스웨어가 있는 칵테일 수
-        self.cursor.execute("SELECT COUNT(*) FROM Cocktail WHERE glassware IS NOT NULL AND glassware != ''")
-        stats['has_glassware'] = self.cursor.fetchone()[0]
+    @staticmethod
+    def _copy_stats(stats: Dict) -> Dict:
+        """캐시된 통계를 호출자가 고쳐도 캐시에 남지 않도록 중첩 값까지 복사"""
+        return dict(stats, percentiles=dict(stats['percentiles']),
+                    histogram=[dict(bucket) for bucket in stats['histogram']])
 
-        # 준비방법이 있는 칵테일 수
-        self.cursor.execute("SELECT COUNT(*) FROM Cocktail WHERE preparation IS NOT NULL AND preparation != ''")
-        stats['has_preparation'] = self.cursor.fetchone()[0]
+    def _percentiles(self, price_count: int, ps) -> Dict:
+        """
+        가격의 p 백분위수들 (선형 보간). 필요한 위치의 값만 가격순 인덱스 한 번 훑기로 읽음
+        읽은 값이 모자라면(조회 사이에 행이 줄어든 경우 등) 해당 백분위수는 None
+        """
+        if not price_count:
+            return {p: None for p in ps}
+        bounds = {}
+        for p in ps:
+            pos = (price_count - 1) * p / 100
+            lower = int(pos)
+            bounds[p] = (pos, lower, min(lower + 1, price_count - 1))
+        values = cocktail_prices_at(
+            [i for _, lower, upper in bounds.values() for i in (lower, upper)], cursor=self.cursor
+        )
+
+        percentiles = {}
+        for p, (pos, lower, upper) in bounds.items():
+            if lower in values and upper in values:
+                percentiles[p] = values[lower] + (values[upper] - values[lower]) * (pos - lower)
+            else:
+                percentiles[p] = None
+        return percentiles
+
+    def _histogram(self, price_count: int, low: float, high: float, bins: int) -> List[Dict]:
+        """가격의 등간격 히스토그램 (구간별 개수는 GROUP BY로 계산)"""
+        if not price_count or bins < 1:
+            return []
+        width = (high - low) / bins or 1
+        counts = cocktail_price_histogram(low, width, bins, cursor=self.cursor)
+        return [
+            {'low': round(low + width * i, 2), 'high': round(low + width * (i + 1), 2), 'count': counts.get(i, 0)}
+            for i in range(bins)
+        ]
 
-        return stats
+    def get_cocktail_statistics(self) -> Dict:
+        """데이터베이스 통계 정보를 반환합니다."""
+        stats = self.get_catalog_statistics()
+        return {
+            key: stats[key]
+            for key in ('total_cocktails', 'unique_cocktails', 'has_ingredients',
+                        'has_garnish', 'has_glassware', 'has_preparation')
+        }
 
-    def find_cocktails_by_price_range(self, min_price: float = 0, max_price: float = 1000) -> List[Dict]:
+    def find_cocktails_by_price_range(self, min_price: float = 0, max_price: float = 1000) -> List[Cocktail]:
         """
         가격 범위로 칵테일을 찾습니다.
 
@@ -227,31 +955,18 @@ class CocktailService:
         """
 
         self.cursor.execute(query, (min_price, max_price))
-        rows = self.cursor.fetchall()
-
-        cocktails = []
-        for row in rows:
-            cocktail_info = self._format_cocktail_info(row)
-            cocktails.append(cocktail_info)
-
-        return cocktails
+        return [Cocktail.from_row(row) for row in self.cursor.fetchall()]
 
     def get_price_statistics(self) -> Dict:
         """가격 통계 정보를 반환합니다."""
-        stats = {}
+        stats = self.get_catalog_statistics()
+        avg_price, min_price, max_price = stats['average_price'], stats['min_price'], stats['max_price']
 
-        # 평균 가격
-        self.cursor.execute("SELECT AVG(price) FROM Cocktail WHERE price IS NOT NULL")
-        avg_price = self.cursor.fetchone()[0]
-        stats['average_price'] = round(avg_price, 2) if avg_price else 0
-
-        # 최소/최대 가격
-        self.cursor.execute("SELECT MIN(price), MAX(price) FROM Cocktail WHERE price IS NOT NULL")
-        min_price, max_price = self.cursor.fetchone()
-        stats['min_price'] = round(min_price, 2) if min_price else 0
-        stats['max_price'] = round(max_price, 2) if max_price else 0
-
-        return stats
+        return {
+            'average_price': round(avg_price, 2) if avg_price else 0,
+            'min_price': round(min_price, 2) if min_price else 0,
+            'max_price': round(max_price, 2) if max_price else 0,
+        }
 
     def add_cocktail(self, name: str, ingredients: str, garnish: str = None,
                     glassware: str = None, preparation: str = None,
@@ -260,7 +975,9 @@ class CocktailService:
         새로운 칵테일을 추가합니다.
         """
         try:
-            return coctail_insert(name, ingredients, garnish, glassware, preparation, price, note)
+            saved = coctail_insert(name, ingredients, garnish, glassware, preparation, price, note, self.cursor)
+            self.refresh_similarity_in_background()
+            return saved
         except sqlite3.IntegrityError:
             # 이미 존재하는 칵테일 이름
             return False
@@ -269,14 +986,31 @@ class CocktailService:
             return False
 
     def __del__(self):
-        """소멸자에서 DB 연결 닫기"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        """소멸자에서 (소멸자를 실행하는 스레드의) DB 연결 닫기"""
+        if hasattr(self, '_local'):
+            self.close()
+
+
+# recommend_many 작업 프로세스 상태: (DB 연결 없는 서비스, 재료 인덱스)
+_batch_worker = None
+
+
+def _init_batch_worker(index: IngredientIndex):
+    global _batch_worker
+    # 점수 계산과 결과 포맷팅만 하므로 DB 연결을 만들지 않음
+    _batch_worker = (CocktailService.__new__(CocktailService), index)
+
+
+def _recommend_batch(user_input: str, top_n: int, scorer: str) -> List[Dict]:
+    service, index = _batch_worker
+    return service._recommend_uncached(index, user_input, top_n, scorer)
 
 
 def ingredient_search_demo():
     """재료 기반 검색 데모 함수"""
-    service = CocktailService()
+    # 검색 데몬이 떠 있으면 데워진 인덱스를 공유하고, 없으면 프로세스 내에서 처리
+    from src.services.search_client import SearchClient
+    service = SearchClient()
 
     print("칵테일 재료 기반 검색 서비스")
     print("=" * 50)
@@ -307,11 +1041,11 @@ def ingredient_search_demo():
         #     {
         #         'name': '칵테일 이름 (str)',
         #         'ingredients': '재료 목록 (str)',
-        #         'garnish': '가니쉬 정보 (str) 또는 "N/A"',
-        #         'glassware': '글라스웨어 정보 (str) 또는 "N/A"',
-        #         'preparation': '제조 방법 (str) 또는 "N/A"',
-        #         'price': '가격 정보 (str, 예: "$12.50") 또는 "N/A"',
-        #         'note': '추가 메모 (str) 또는 "N/A"',
+        #         'garnish': '가니쉬 정보 (str) 또는 None',
+        #         'glassware': '글라스웨어 정보 (str) 또는 None',
+        #         'preparation': '제조 방법 (str) 또는 None',
+        #         'price': '가격 (float, 예: 12.5) 또는 None - 표시는 format_price()',
+        #         'note': '추가 메모 (str) 또는 None',
         #         'similarity_score': '유사도 점수 (float, 0.0~1.0)',
         #         'matching_keywords': '매칭된 키워드 리스트 (list of str)'
         #     },
@@ -331,7 +1065,7 @@ def ingredient_search_demo():
             print(f"   칵테일명: {cocktail['name']}")
             print(f"   재료: {cocktail['ingredients'][:80]}{'...' if len(cocktail['ingredients']) > 80 else ''}")
             print(f"   일치 검색어: {' '.join(cocktail['matching_keywords'])}")
-            print(f"   가격: {cocktail['price']}")
+            print(f"   가격: {format_price(cocktail['price'])}")
             if i < len(recommendations):
                 print()
 
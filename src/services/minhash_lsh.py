@@ -0,0 +1,327 @@
+"""
+MinHash LSH 근사 이웃 검색 (대용량 카탈로그용)
+
+재료 집합마다 MinHash 서명(num_perm개의 최소 해시값)을 배치 단위로 한 번에 계산하고,
+서명을 bands개 구간으로 나눈 버킷(LSH banding)에 넣어 두면
+같은 버킷에 들어온 칵테일만 후보로 보므로 카탈로그 크기에 대해 준선형으로 조회합니다.
+
+- 두 집합이 한 밴드에서 만날 확률은 J^rows, 최소 한 밴드에서 만날 확률은 1 - (1 - J^rows)^bands
+  (bands를 늘리거나 rows를 줄이면 재현율이 오르고 후보 수도 늘어남)
+- 인덱스는 DB 옆의 파일(dev.lsh.npz)에 카탈로그 (token, version)과 함께 저장하며,
+  스탬프가 다르면 다시 만듭니다.
+
+사용 예:
+    python -m src.services.minhash_lsh build --num-perm 128 --bands 64
+    python -m src.services.minhash_lsh benchmark --synthetic 100000 --k 10
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import zlib
+from functools import lru_cache
+from itertools import groupby
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.db.conn import DB_PATH
+from src.db.cocktail import catalog_version, cocktail_ingredient_select_all
+from src.utils.ingredient_canon import canonical_ingredient
+
+LSH_PATH = os.path.splitext(DB_PATH)[0] + ".lsh.npz"
+LSH_FORMAT = 2
+
+# 해시 함수 (a * x + b) mod PRIME, x는 32비트이므로 곱이 uint64를 넘지 않음
+PRIME = np.uint64((1 << 31) - 1)
+EMPTY = np.uint32((1 << 31) - 1)
+
+
+@lru_cache(maxsize=65536)
+def token_hash(token: str) -> int:
+    """프로세스와 무관하게 같은 값을 내는 32비트 재료 해시"""
+    return zlib.crc32(token.encode('utf-8'))
+
+
+class MinHashLSH:
+    """
+    MinHash 서명 + LSH 밴드 버킷
+
+        signatures : (n, num_perm) uint32
+        band_keys  : (bands, n) uint64, 밴드마다 정렬된 버킷 키
+        band_docs  : (bands, n) int32, band_keys와 같은 순서의 doc id
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 64, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm})은 bands({bands})로 나누어떨어져야 합니다.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.seed = seed
+
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, int(PRIME), num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, int(PRIME), num_perm, dtype=np.uint64)
+        # 밴드 안의 rows개 값을 버킷 키 하나로 섞는 홀수 계수 (uint64 오버플로는 의도된 동작)
+        self.mix = rng.integers(1, 1 << 62, self.rows, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+        self.names: List[str] = []
+        self.signatures = np.zeros((0, num_perm), dtype=np.uint32)
+        self.band_keys = np.zeros((bands, 0), dtype=np.uint64)
+        self.band_docs = np.zeros((bands, 0), dtype=np.int32)
+        self.stamp = None
+        self._positions = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def threshold(self) -> float:
+        """후보가 될 확률이 약 50%가 되는 Jaccard 유사도"""
+        return (1 / self.bands) ** (1 / self.rows)
+
+    def signatures_for(self, sets: Sequence[Iterable[str]], batch_size: int = 4096) -> np.ndarray:
+        """재료 키 집합들의 MinHash 서명을 배치 단위로 계산합니다. (빈 집합은 EMPTY)"""
+        signatures = np.full((len(sets), self.num_perm), EMPTY, dtype=np.uint32)
+        for start in range(0, len(sets), batch_size):
+            batch = [sorted({token_hash(token) for token in tokens}) for tokens in sets[start:start + batch_size]]
+            sizes = np.array([len(tokens) for tokens in batch], dtype=np.int64)
+            if not sizes.sum():
+                continue
+
+            values = np.fromiter((h for tokens in batch for h in tokens), dtype=np.uint64, count=int(sizes.sum()))
+            hashed = (values[:, None] * self.a[None, :] + self.b[None, :]) % PRIME
+
+            # 비어 있지 않은 집합마다 구간 최솟값
+            filled = np.flatnonzero(sizes)
+            offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))[filled]
+            signatures[start + filled] = np.minimum.reduceat(hashed, offsets, axis=0).astype(np.uint32)
+        return signatures
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """(n, bands) 버킷 키"""
+        bands = signatures.astype(np.uint64).reshape(len(signatures), self.bands, self.rows)
+        return (bands * self.mix[None, None, :]).sum(axis=2, dtype=np.uint64)
+
+    def build(self, names: Sequence[str], sets: Sequence[Iterable[str]], stamp=None, batch_size: int = 4096):
+        self.names = list(names)
+        self._positions = {name: i for i, name in enumerate(self.names)}
+        self.signatures = self.signatures_for(sets, batch_size)
+        self.stamp = stamp
+
+        # 빈 집합은 버킷에 넣지 않음
+        docs = np.flatnonzero(self.signatures[:, 0] != EMPTY).astype(np.int32)
+        keys = self._band_keys(self.signatures[docs]).T
+        order = np.argsort(keys, axis=1, kind='stable')
+        self.band_keys = np.take_along_axis(keys, order, axis=1)
+        self.band_docs = docs[order]
+        return self
+
+    def candidates(self, signature: np.ndarray) -> np.ndarray:
+        """서명과 한 밴드 이상에서 버킷이 같은 doc id (오름차순)"""
+        keys = self._band_keys(signature[None, :])[0]
+        found = []
+        for band, key in enumerate(keys):
+            row = self.band_keys[band]
+            lo = np.searchsorted(row, key, side='left')
+            hi = np.searchsorted(row, key, side='right')
+            if hi > lo:
+                found.append(self.band_docs[band, lo:hi])
+        if not found:
+            return np.zeros(0, dtype=np.int32)
+        return np.unique(np.concatenate(found))
+
+    def _rank(self, signature: np.ndarray, k: int, exclude: Optional[int] = None) -> List[Tuple[str, float]]:
+        if signature[0] == EMPTY or k <= 0:
+            return []
+        docs = self.candidates(signature)
+        if exclude is not None:
+            docs = docs[docs != exclude]
+        if not len(docs):
+            return []
+
+        # 같은 위치의 최소 해시가 일치하는 비율 = Jaccard 추정치
+        estimates = (self.signatures[docs] == signature[None, :]).mean(axis=1)
+        order = np.lexsort((docs, -estimates))[:k]
+        return [(self.names[docs[i]], float(estimates[i])) for i in order if estimates[i] > 0]
+
+    def query(self, tokens: Iterable[str], k: int = 10) -> List[Tuple[str, float]]:
+        """재료 키 목록과 비슷한 칵테일 [(이름, 추정 Jaccard), ...]"""
+        return self._rank(self.signatures_for([list(tokens)])[0], k)
+
+    def query_name(self, name: str, k: int = 10) -> List[Tuple[str, float]]:
+        """칵테일 한 개와 비슷한 칵테일 (자기 자신 제외)"""
+        doc_id = self._positions.get(name)
+        if doc_id is None:
+            return []
+        return self._rank(self.signatures[doc_id], k, exclude=doc_id)
+
+    def save(self, path: str = LSH_PATH):
+        """임시 파일에 쓴 뒤 교체합니다."""
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                format=np.array(LSH_FORMAT),
+                params=np.array([self.num_perm, self.bands, self.seed]),
+                stamp_token=np.array(self.stamp[0] if self.stamp else ""),
+                stamp_version=np.array(self.stamp[1] if self.stamp else -1),
+                names=np.array(self.names, dtype=str),
+                signatures=self.signatures,
+                band_keys=self.band_keys,
+                band_docs=self.band_docs,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = LSH_PATH) -> Optional["MinHashLSH"]:
+        """저장된 인덱스를 읽습니다. 없거나 형식이 다르면 None."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data['format']) != LSH_FORMAT:
+                    return None
+                num_perm, bands, seed = (int(v) for v in data['params'])
+                index = cls(num_perm, bands, seed)
+                index.names = data['names'].tolist()
+                index.signatures = data['signatures']
+                index.band_keys = data['band_keys']
+                index.band_docs = data['band_docs']
+                version = int(data['stamp_version'])
+                index.stamp = (str(data['stamp_token']), version) if version >= 0 else None
+        except (OSError, KeyError, ValueError):
+            return None
+        index._positions = {name: i for i, name in enumerate(index.names)}
+        return index
+
+
+def load_ingredient_sets(cursor=None) -> Tuple[List[str], List[List[str]]]:
+    """CocktailIngredient 테이블에서 (칵테일명 리스트, 기본 재료(canonical_ingredient) 리스트들)을 읽습니다."""
+    names, sets = [], []
+    for cocktail, group in groupby(cocktail_ingredient_select_all(cursor), key=lambda row: row[0]):
+        names.append(cocktail)
+        keys = (canonical_ingredient(row[5]) for row in group)
+        sets.append([key for key in keys if key])
+    return names, sets
+
+
+def refresh_lsh(path: str = LSH_PATH, num_perm: int = 128, bands: int = 64, cursor=None) -> MinHashLSH:
+    """DB로부터 인덱스를 다시 만들어 저장합니다."""
+    stamp = catalog_version(cursor)
+    names, sets = load_ingredient_sets(cursor)
+    index = MinHashLSH(num_perm, bands).build(names, sets, stamp)
+    index.save(path)
+    return index
+
+
+def load_lsh(path: str = LSH_PATH, num_perm: int = 128, bands: int = 64, cursor=None) -> MinHashLSH:
+    """
+    저장된 인덱스가 현재 카탈로그와 같고 파라미터가 같으면 그대로 사용하고,
+    아니면 다시 만들어 저장합니다.
+    """
+    index = MinHashLSH.load(path)
+    if (index is not None and index.stamp == catalog_version(cursor)
+            and (index.num_perm, index.bands) == (num_perm, bands)):
+        return index
+    return refresh_lsh(path, num_perm, bands, cursor)
+
+
+def exact_top_k(sets: List[set], query: set, k: int, exclude: Optional[int] = None) -> List[int]:
+    """정확한 Jaccard 상위 k개 doc id (벤치마크 기준값)"""
+    scores = []
+    for doc_id, other in enumerate(sets):
+        if doc_id == exclude or not other:
+            continue
+        inter = len(query & other)
+        if inter:
+            scores.append((-inter / len(query | other), doc_id))
+    scores.sort()
+    return [doc_id for _, doc_id in scores[:k]]
+
+
+def synthetic_sets(sets: List[List[str]], n: int, seed: int = 7) -> Tuple[List[str], List[List[str]]]:
+    """실제 재료 집합을 조금씩 바꿔 n개의 가상 칵테일을 만듭니다. (대용량 벤치마크용)"""
+    rng = random.Random(seed)
+    vocab = sorted({token for tokens in sets for token in tokens})
+    names, out = [], []
+    for i in range(n):
+        tokens = set(rng.choice(sets))
+        for _ in range(rng.randint(0, 2)):
+            if tokens and rng.random() < 0.5:
+                tokens.discard(rng.choice(sorted(tokens)))
+            else:
+                tokens.add(rng.choice(vocab))
+        names.append(f"synthetic-{i}")
+        out.append(sorted(tokens))
+    return names, out
+
+
+def benchmark(names: List[str], sets: List[List[str]], configs: List[Tuple[int, int]],
+              queries: int = 200, k: int = 10, seed: int = 11):
+    """(num_perm, bands) 설정별 재현율과 조회 시간을 정확한 Jaccard와 비교합니다."""
+    rng = random.Random(seed)
+    set_list = [set(tokens) for tokens in sets]
+    picks = rng.sample([i for i, tokens in enumerate(set_list) if tokens], min(queries, len(set_list)))
+
+    start = time.perf_counter()
+    truth = {i: exact_top_k(set_list, set_list[i], k, exclude=i) for i in picks}
+    exact_ms = (time.perf_counter() - start) * 1000 / len(picks)
+
+    print(f"칵테일 {len(names)}개, 질의 {len(picks)}개, k={k}")
+    print(f"정확한 Jaccard 전체 비교: {exact_ms:.2f} ms/질의")
+    print("=" * 72)
+    print(f"{'num_perm':>8} {'bands':>6} {'rows':>5} {'threshold':>9} {'build s':>8} "
+          f"{'ms/query':>9} {'candidates':>10} {'recall@k':>9}")
+    for num_perm, bands in configs:
+        start = time.perf_counter()
+        index = MinHashLSH(num_perm, bands).build(names, sets)
+        build_s = time.perf_counter() - start
+
+        hits = total = candidates = 0
+        start = time.perf_counter()
+        for i in picks:
+            found = {index._positions[name] for name, _ in index.query_name(names[i], k)}
+            hits += len(found & set(truth[i]))
+            total += len(truth[i])
+        query_ms = (time.perf_counter() - start) * 1000 / len(picks)
+        for i in picks:
+            candidates += len(index.candidates(index.signatures[i]))
+
+        print(f"{num_perm:8d} {bands:6d} {index.rows:5d} {index.threshold:9.3f} {build_s:8.2f} "
+              f"{query_ms:9.3f} {candidates / len(picks):10.1f} {hits / max(total, 1):9.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MinHash LSH 근사 이웃 인덱스")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help="DB로부터 인덱스를 만들어 저장")
+    build.add_argument('--num-perm', type=int, default=128)
+    build.add_argument('--bands', type=int, default=64)
+
+    bench = sub.add_parser('benchmark', help="정확한 Jaccard 대비 재현율/속도 비교")
+    bench.add_argument('--synthetic', type=int, default=0, help="가상 칵테일 수 (0이면 실제 카탈로그)")
+    bench.add_argument('--queries', type=int, default=200)
+    bench.add_argument('--k', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        index = refresh_lsh(num_perm=args.num_perm, bands=args.bands)
+        print(f"칵테일 {len(index)}개 색인 ({time.perf_counter() - start:.2f} s) -> {LSH_PATH}")
+        return 0
+
+    names, sets = load_ingredient_sets()
+    if args.synthetic:
+        names, sets = synthetic_sets(sets, args.synthetic)
+    benchmark(names, sets, [(64, 16), (128, 32), (128, 64), (256, 64)], args.queries, args.k)
+    return 0
+
+
+if __name__ == "__main__":
+    main()
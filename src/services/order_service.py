@@ -13,6 +13,8 @@ from typing import Optional, Dict
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from src.db.conn import db_connect
+import src.db.cocktail  # CocktailIngredient 테이블 생성/초기화
+from src.services.popularity import ensure_popularity, record_order
 
 
 class OrderService:
@@ -31,6 +33,9 @@ class OrderService:
         
         self.orders_csv_path = os.path.join(data_dir, "orders.csv")
 
+        # 인기도 테이블이 비어 있으면 새 주문을 쓰기 전에 기존 주문 기록으로 채움
+        ensure_popularity(self.orders_csv_path)
+
     def find_cocktail_ingredients(self, cocktail_name: str) -> Optional[str]:
         """칵테일 이름으로 재료를 찾습니다."""
         query = "SELECT ingredients FROM Cocktail WHERE LOWER(name) = LOWER(?)"
@@ -41,11 +46,23 @@ class OrderService:
             return row[0]
         return None
 
+    def find_cocktail_ingredient_lines(self, cocktail_name: str) -> list:
+        """칵테일 이름으로 파싱된 재료 원문 목록을 순서대로 반환합니다."""
+        query = """
+        SELECT ci.raw
+        FROM Cocktail c
+        JOIN CocktailIngredient ci ON ci.cocktail = c.name
+        WHERE LOWER(c.name) = LOWER(?)
+        ORDER BY ci.position
+        """
+        self.cursor.execute(query, (cocktail_name.strip(),))
+        return [row[0] for row in self.cursor.fetchall()]
+
     def save_order(self, cocktail_name: str, quantity: int = 1):
         """주문을 CSV에 저장합니다."""
-        ingredients = self.find_cocktail_ingredients(cocktail_name)
+        ingredient_list = self.find_cocktail_ingredient_lines(cocktail_name)
         
-        if not ingredients:
+        if not ingredient_list:
             return
         
         order_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -57,10 +74,11 @@ class OrderService:
             # 주문 정보
             writer.writerow([order_date, cocktail_name, quantity])
             
-            ingredient_list = [ing.strip() for ing in ingredients.split(',')]
             for ingredient in ingredient_list:
-                if ingredient:
-                    writer.writerow([f"-- {ingredient}"])
+                writer.writerow([f"-- {ingredient}"])
+
+        # 추천 인기도에 바로 반영
+        record_order(cocktail_name, quantity)
 
     def process_gui_order(self, cocktail_name: str, quantity: int = 1) -> bool:
         """
@@ -73,9 +91,9 @@ class OrderService:
         Returns:
             주문 처리 성공 여부
         """
-        ingredients = self.find_cocktail_ingredients(cocktail_name)
+        ingredient_list = self.find_cocktail_ingredient_lines(cocktail_name)
         
-        if not ingredients:
+        if not ingredient_list:
             return False
         
         order_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -87,11 +105,12 @@ class OrderService:
             # 주문 정보
             writer.writerow([order_date, cocktail_name, quantity])
             
-            # 재료들을 개별 행으로 저장
-            ingredient_list = [ing.strip() for ing in ingredients.split(',')]
+            # 재료들을 개별 행으로 저장 (CocktailIngredient에 파싱된 순서대로)
             for ingredient in ingredient_list:
-                if ingredient:
-                    writer.writerow([f"-- {ingredient}"])
+                writer.writerow([f"-- {ingredient}"])
+
+        # 추천 인기도에 바로 반영
+        record_order(cocktail_name, quantity)
         
         return True
 
@@ -0,0 +1,130 @@
+"""
+주문 기록 기반 칵테일 인기도 (최근 주문일수록 큰 가중치)
+
+주문이 들어올 때마다 CocktailPopularity 테이블의 감쇠 누적값을 바로 갱신하므로
+추천 시에는 저장된 값을 읽기만 합니다. (질의마다 orders.csv를 다시 집계하지 않음)
+테이블이 비어 있는 처음 한 번만 orders.csv 전체로 채웁니다.
+
+사용 예:
+    python -m src.services.popularity rebuild
+    python -m src.services.popularity top --limit 10
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Iterator, Tuple
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import src.db.cocktail  # Cocktail 테이블 생성/초기화
+from src.db.popularity import (
+    conn, popularity_state, popularity_reset, popularity_record, popularity_select_all
+)
+
+# 주문 한 건의 가중치가 절반이 되는 기간
+HALF_LIFE_DAYS = 14
+
+ORDERS_CSV_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data", "orders.csv"
+)
+
+ORDER_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def iter_csv_orders(path: str = ORDERS_CSV_PATH) -> Iterator[Tuple[float, str, int]]:
+    """orders.csv의 주문 행을 (주문 시각 epoch, 칵테일명, 수량)으로 읽습니다. 재료 행(-- ...)은 건너뜁니다."""
+    if not os.path.exists(path):
+        return
+    with open(path, newline='', encoding='utf-8') as csvfile:
+        for row in csv.reader(csvfile):
+            if len(row) < 3 or row[0].startswith('--'):
+                continue
+            try:
+                ordered_at = datetime.strptime(row[0], ORDER_DATE_FORMAT).timestamp()
+                quantity = int(row[2])
+            except ValueError:
+                continue
+            yield ordered_at, row[1], quantity
+
+
+def rebuild_popularity(path: str = ORDERS_CSV_PATH, half_life_days: float = HALF_LIFE_DAYS) -> int:
+    """인기도를 orders.csv 전체로 다시 만들고, 반영한 주문 수를 반환합니다."""
+    orders = sorted(iter_csv_orders(path))
+    landmark = orders[0][0] if orders else time.time()
+    popularity_reset(landmark, half_life_days * 86400.0)
+
+    recorded = 0
+    for ordered_at, name, quantity in orders:
+        recorded += popularity_record(name, quantity, ordered_at, commit=False)
+    conn.commit()
+    return recorded
+
+
+def ensure_popularity(path: str = ORDERS_CSV_PATH):
+    """인기도 테이블이 아직 초기화되지 않았으면 orders.csv로 채웁니다."""
+    if popularity_state() is None:
+        rebuild_popularity(path)
+
+
+def record_order(name: str, quantity: int = 1, ordered_at: float = None) -> bool:
+    """새 주문 한 건을 인기도에 반영합니다. 카탈로그에 없는 칵테일이면 False"""
+    ensure_popularity()
+    if ordered_at is None:
+        ordered_at = time.time()
+    return popularity_record(name, quantity, ordered_at) > 0
+
+
+def popularity_version(cursor=None) -> int:
+    """
+    주문이 반영될 때마다 바뀌는 인기도 버전
+    cursor를 넘기면 해당 커서로 읽습니다. (아직 초기화 전이면 모듈 연결로 먼저 채움)
+    """
+    state = popularity_state(cursor)
+    if state is None:
+        ensure_popularity()
+        state = popularity_state(cursor)
+    return state[2]
+
+
+def popularity_snapshot(cursor=None) -> Tuple[int, Dict[str, float]]:
+    """
+    (버전, {칵테일명: 인기도}) 를 반환합니다.
+    인기도는 가장 인기 있는 칵테일을 1로 둔 비율(0~1)이며, 주문이 없는 칵테일은 빠져 있습니다.
+    """
+    version = popularity_version(cursor)
+    rows = popularity_select_all(cursor)
+    top = rows[0][1] if rows and rows[0][1] > 0 else 1.0
+    return version, {name: score / top for name, score, _, _ in rows}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="주문 기록 기반 칵테일 인기도")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rebuild = sub.add_parser('rebuild', help="orders.csv로 인기도를 다시 계산")
+    rebuild.add_argument('--csv', default=ORDERS_CSV_PATH)
+    rebuild.add_argument('--half-life', type=float, default=HALF_LIFE_DAYS, help="반감기 (일)")
+
+    top = sub.add_parser('top', help="인기 칵테일 출력")
+    top.add_argument('--limit', type=int, default=10)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'rebuild':
+        count = rebuild_popularity(args.csv, args.half_life)
+        print(f"주문 {count}건 반영")
+    else:
+        _, scores = popularity_snapshot()
+        for rank, (name, score) in enumerate(list(scores.items())[:args.limit], 1):
+            print(f"{rank:>2}. {name} ({score:.3f})")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
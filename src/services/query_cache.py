@@ -0,0 +1,71 @@
+"""
+검색/추천 결과 LRU 캐시
+같은 질의가 반복될 때 점수 계산을 다시 하지 않도록 최근 결과를 보관합니다.
+카탈로그가 바뀌면 호출자가 clear()로 전체를 비웁니다.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable
+
+_MISSING = object()
+
+
+class QueryCache:
+    """
+    크기가 제한된 LRU 캐시 (hit / miss / eviction 집계 포함)
+
+    maxsize가 0이면 아무것도 저장하지 않습니다.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """저장된 결과를 모두 버립니다. (카탈로그 변경 시)"""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
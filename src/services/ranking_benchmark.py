@@ -0,0 +1,125 @@
+"""
+추천 점수 방식 오프라인 비교 (legacy vs bm25)
+
+카탈로그의 칵테일마다 재료 일부를 뽑아 질의를 만들고, 해당 칵테일을 정답으로 하여
+각 scorer의 지연 시간과 순위 품질(MRR@k, Hit@k), 두 scorer 결과의 겹침 정도를 출력합니다.
+
+사용 예:
+    python -m src.services.ranking_benchmark --queries 200 --k 10
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Tuple
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.services.cocktail_service import CocktailService
+
+
+def build_queries(service: CocktailService, n: int, seed: int = 7,
+                  ingredients_per_query: int = 2) -> List[Tuple[str, str]]:
+    """(질의, 정답 칵테일명) 리스트를 만듭니다."""
+    rng = random.Random(seed)
+    names = [item.name for item in service.get_all_cocktails()]
+    rng.shuffle(names)
+
+    queries = []
+    for name in names:
+        ingredients = [item['ingredient'] for item in service.get_cocktail_ingredients(name)]
+        if len(ingredients) < ingredients_per_query:
+            continue
+        picked = rng.sample(ingredients, ingredients_per_query)
+        queries.append((' '.join(picked).lower(), name))
+        if len(queries) >= n:
+            break
+    return queries
+
+
+def evaluate(service: CocktailService, queries: List[Tuple[str, str]], scorer: str, k: int) -> Dict:
+    """scorer 하나의 지연 시간과 순위 품질을 측정합니다."""
+    latencies = []
+    reciprocal_ranks = []
+    hits = 0
+    results = []
+
+    for query, target in queries:
+        start = time.perf_counter()
+        ranked = service.recommend_by_taste_ingredients(query, top_n=k, scorer=scorer)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        names = [item['name'] for item in ranked]
+        results.append(names)
+        if target in names:
+            hits += 1
+            reciprocal_ranks.append(1 / (names.index(target) + 1))
+        else:
+            reciprocal_ranks.append(0.0)
+
+    latencies.sort()
+    return {
+        'mean_ms': sum(latencies) / len(latencies) if latencies else 0.0,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0,
+        'mrr': sum(reciprocal_ranks) / len(reciprocal_ranks) if reciprocal_ranks else 0.0,
+        'hit_rate': hits / len(queries) if queries else 0.0,
+        'latencies': latencies,
+        'results': results,
+    }
+
+
+def overlap_at_k(a: List[List[str]], b: List[List[str]]) -> float:
+    """두 scorer의 질의별 top-k 결과 겹침 비율 평균"""
+    ratios = [
+        len(set(x) & set(y)) / max(len(x), len(y))
+        for x, y in zip(a, b) if x or y
+    ]
+    return sum(ratios) / len(ratios) if ratios else 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="legacy / bm25 추천 점수 방식 비교")
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--workers', type=int, default=None, help="recommend_many 작업 프로세스 수 (기본 CPU 수)")
+    args = parser.parse_args(argv)
+
+    # 결과 캐시를 끄고 매 질의의 점수 계산 시간을 측정
+    service = CocktailService(cache_size=0)
+    queries = build_queries(service, args.queries, args.seed)
+
+    # 인덱스 생성 비용은 제외하고 측정
+    service.recommend_by_taste_ingredients("gin", top_n=1, scorer='bm25')
+
+    print(f"질의 {len(queries)}개, k={args.k}")
+    print("=" * 60)
+    print(f"{'scorer':<8} {'mean ms':>9} {'p95 ms':>9} {'MRR@k':>8} {'Hit@k':>8}")
+    reports = {}
+    for scorer in CocktailService.SCORERS:
+        report = evaluate(service, queries, scorer, args.k)
+        reports[scorer] = report
+        print(f"{scorer:<8} {report['mean_ms']:9.3f} {report['p95_ms']:9.3f} "
+              f"{report['mrr']:8.3f} {report['hit_rate']:8.3f}")
+
+    print("-" * 60)
+    print(f"top-{args.k} 겹침 (bm25 vs legacy): "
+          f"{overlap_at_k(reports['bm25']['results'], reports['legacy']['results']):.3f}")
+
+    # 같은 질의를 한 건씩 호출할 때와 recommend_many로 한 번에 처리할 때의 처리량
+    print("-" * 60)
+    texts = [query for query, _ in queries]
+    for scorer in CocktailService.SCORERS:
+        loop_qps = len(texts) / (sum(reports[scorer]['latencies']) / 1000) if texts else 0.0
+        service.recommend_many(texts, top_n=args.k, scorer=scorer, workers=args.workers)
+        stats = service.batch_stats
+        print(f"{scorer:<8} 반복 호출 {loop_qps:9.0f} q/s | recommend_many "
+              f"{stats['queries_per_sec']:9.0f} q/s (workers {stats['workers']})")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
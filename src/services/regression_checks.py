@@ -0,0 +1,336 @@
+"""
+회귀 점검 모음
+
+리뷰에서 나왔던 문제들이 다시 생기지 않았는지 빠르게 확인합니다.
+DAO 점검은 메모리 DB를 만들어 cursor로 넘기므로 dev.db 내용에 영향을 받지 않습니다.
+서비스 점검은 dev.db 카탈로그를 읽고, 쓰기가 필요한 점검은 dev.db 복사본을 사용합니다.
+하나라도 실패하면 종료 코드 1을 반환합니다.
+
+사용 예:
+    python -m src.services.regression_checks
+"""
+
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+from difflib import SequenceMatcher
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.db import conn as db_conn
+from src.db import query_trace
+from src.db.cocktail import (
+    PRICE_SORT, cocktail_page_key, cocktail_select_page,
+    cocktail_search, cocktail_search_is_current, cocktail_search_rebuild
+)
+from src.services.cocktail_service import CocktailService
+
+
+def check_query_trace() -> list:
+    """execute(...).fetchone() 같은 단발 조회도 추적 집계에 들어가는지"""
+    return query_trace.self_check()
+
+
+def check_price_paging_with_nulls() -> list:
+    """가격이 없는 행이 섞여 있어도 가격순 페이지를 끝까지 빠짐없이 넘길 수 있는지"""
+    conn = sqlite3.connect(':memory:')
+    cursor = conn.cursor()
+    # 가져오기로 채운 DB처럼 price가 비어 있을 수 있는 스키마
+    cursor.execute("""
+    CREATE TABLE Cocktail (
+        name TEXT PRIMARY KEY, ingredients TEXT, garnish TEXT, glassware TEXT,
+        preparation TEXT, price REAL, note TEXT
+    )""")
+    cursor.execute(f"CREATE INDEX idx_cocktail_price_key ON Cocktail ({PRICE_SORT}, name)")
+    rows = [(f"Cocktail {i:03d}", "1 oz Gin", None, None, None,
+             None if i % 5 == 0 else float(i % 7 + 8), None) for i in range(60)]
+    cursor.executemany("INSERT INTO Cocktail VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    problems = []
+    for order_by in ('price', 'name'):
+        expected = [row[0] for row in cursor.execute(
+            "SELECT name FROM Cocktail ORDER BY price IS NULL, price, name"
+            if order_by == 'price' else "SELECT name FROM Cocktail ORDER BY name")]
+        seen = []
+        key = None
+        while len(seen) <= len(expected):
+            page = cocktail_select_page(key, 7, order_by, cursor=cursor)
+            if not page:
+                break
+            seen.extend(row[0] for row in page)
+            key = cocktail_page_key(page[-1], order_by)
+        if seen != expected:
+            problems.append(f"order_by={order_by}: {len(seen)}/{len(expected)}행만 순서대로 조회됨")
+    conn.close()
+    return problems
+
+
+def check_similar_to_ingredients() -> list:
+    """수량이 붙은 재료 원문으로 검색해도 재료가 같은 칵테일을 찾는지"""
+    service = CocktailService(cache_size=0)
+    problems = []
+
+    found = [item['name'] for item in service.similar_to_ingredients(
+        ['2 oz Tequila', '1 oz Lime Juice', '.5 oz Cointreau'], 5)]
+    if not any('Margarita' in name for name in found):
+        problems.append(f"tequila / lime juice / cointreau -> {found}")
+
+    # 카탈로그 칵테일의 재료 원문을 그대로 넣으면 자기 자신이 나와야 함
+    for item in service.get_all_cocktails()[:20]:
+        raws = [part.strip() for part in item.ingredients.split(',')]
+        found = [result['name'] for result in service.similar_to_ingredients(raws, 10)]
+        if item.name not in found:
+            problems.append(f"{item.name}: 자기 재료로 검색했는데 결과에 없음 {found[:3]}")
+    return problems
+
+
+def check_autocomplete_ranking() -> list:
+    """
+    자동완성이 일찍 멈춰도 순위가 (오타 수, 층, 사전 순) 전체 정렬과 같은지
+    카탈로그 이름 앞부분에 오타를 하나 넣어 입력하고, 행 상한 없이 전부 찾아 정렬한 결과와 비교합니다.
+    """
+    service = CocktailService(cache_size=0)
+    index = service._get_catalog_index().autocomplete
+    problems = []
+    for item in service.get_all_cocktails()[:60]:
+        term = index.normalize(item.name)[:9]
+        for query in (index.normalize(term), index.normalize(term[:2] + term[3:])):
+            typos = index.allowed_typos(len(query))
+            ranked = []
+            for layer, (terms, displays, kinds) in enumerate(index.layers):
+                for distance, lo, hi in index._matching_ranges(terms, query, typos, [float('inf')]):
+                    ranked.extend((distance, layer, entry_id) for entry_id in range(lo, hi))
+            expected, seen = [], set()
+            for distance, layer, entry_id in sorted(ranked):
+                _, displays, kinds = index.layers[layer]
+                key = (displays[entry_id], kinds[entry_id])
+                if key not in seen and len(expected) < 8:
+                    seen.add(key)
+                    expected.append((key[0], key[1], distance))
+            found = index.search(query, 8)
+            if found != expected:
+                problems.append(f"{query!r}: {found[:3]} != {expected[:3]}")
+    return problems
+
+
+def check_catalog_statistics() -> list:
+    """
+    SQL로 계산한 가격 백분위수/히스토그램이 가격 목록으로 계산한 값과 같고,
+    읽기 트랜잭션을 닫으며, 캐시가 호출자 수정에 안전한지
+    """
+    service = CocktailService(cache_size=0)
+    prices = sorted(row[0] for row in service.cursor.execute(
+        "SELECT price FROM Cocktail WHERE price IS NOT NULL"))
+    stats = service.get_catalog_statistics(histogram_bins=7)
+    problems = []
+
+    for p, value in stats['percentiles'].items():
+        pos = (len(prices) - 1) * p / 100
+        lower, upper = int(pos), min(int(pos) + 1, len(prices) - 1)
+        expected = prices[lower] + (prices[upper] - prices[lower]) * (pos - lower)
+        if abs(value - expected) > 1e-9:
+            problems.append(f"{p} 백분위수 {value} != {expected}")
+
+    width = (prices[-1] - prices[0]) / 7 or 1
+    expected = [0] * 7
+    for price in prices:
+        expected[min(int((price - prices[0]) / width), 6)] += 1
+    if [bucket['count'] for bucket in stats['histogram']] != expected:
+        problems.append(f"히스토그램 {[b['count'] for b in stats['histogram']]} != {expected}")
+
+    if service.conn.in_transaction:
+        problems.append("통계 조회 뒤 읽기 트랜잭션이 열려 있음")
+    # 집계 뒤 행이 줄어 백분위수 위치의 값을 못 읽으면 예외 대신 None
+    if service._percentiles(len(prices) * 10, (90,)) != {90: None}:
+        problems.append("백분위수 위치의 값이 모자랄 때 None이 아님")
+
+    stats['percentiles'].clear()
+    stats['histogram'][0]['count'] = -1
+    again = service.get_catalog_statistics(histogram_bins=7)
+    if not again['percentiles'] or again['histogram'][0]['count'] == -1:
+        problems.append("반환값을 고치면 캐시된 통계도 바뀜")
+    return problems
+
+
+def check_legacy_recommend_matches_full_scan() -> list:
+    """
+    legacy 추천(상위 k개 힙 + 점수 상한)이 전체 칵테일을 다 채점해 정렬하던 원래 방식과 같은 결과인지
+    키워드가 겹치지 않는 칵테일도 문자열 유사도만으로 순위에 들 수 있어야 합니다.
+    """
+    service = CocktailService(cache_size=0)
+    index = service._get_ingredient_index()
+    rng = random.Random(7)
+    words = sorted({keyword for doc in index.docs for keyword in doc.keywords})
+    queries = [' '.join(rng.sample(words, rng.randint(1, 4))) for _ in range(300)]
+    queries += ['xyz', 'gin tonic lime lemon pitch mezcal', 'ounce']
+
+    problems = []
+    for query in queries:
+        cleaned = service._clean_ingredients(query)
+        keywords = set(cleaned.split())
+        scored = []
+        for row, doc_cleaned, doc_keywords in index.docs:
+            score = (len(keywords & doc_keywords) / max(len(keywords), 1) * 0.7
+                     + SequenceMatcher(None, cleaned, doc_cleaned).ratio() * 0.3)
+            if score > 0.1:
+                scored.append((round(score, 3), row[0]))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        expected = scored[:5]
+
+        found = [(item['similarity_score'], item['name'])
+                 for item in service.recommend_by_taste_ingredients(query, top_n=5, scorer='legacy')]
+        if found != expected:
+            problems.append(f"{query!r}: {found} != {expected}")
+    return problems[:10]
+
+
+def check_bm25_top_k_ties() -> list:
+    """BM25 상위 k개가 k와 관계없이 전체 정렬(점수 내림차순, 같은 점수는 doc id 오름차순)의 앞부분인지"""
+    index = CocktailService(cache_size=0)._get_ingredient_index()
+    bm25 = index.bm25
+    words = sorted({keyword for doc in index.docs for keyword in doc.keywords})
+    problems = []
+    for query in ['sugar', 'gin', 'lime juice', 'bitters', 'egg white'] + words[:40]:
+        terms = query.split()
+        scores = bm25.score(terms)
+        ids = np.flatnonzero(scores)
+        full = [(int(ids[i]), float(scores[ids[i]])) for i in np.lexsort((ids, -scores[ids]))]
+        for k in (1, 3, 5, 10, 20, 50):
+            if bm25.top_k(terms, k) != full[:k]:
+                problems.append(f"{query!r} k={k}: {bm25.top_k(terms, k)[:3]} != {full[:3]}")
+    return problems[:10]
+
+
+def check_cache_after_concurrent_rebuild() -> list:
+    """
+    옛 카탈로그 인덱스로 계산하던 결과가, 다른 스레드가 인덱스를 다시 만들고 캐시를 비운 뒤에
+    저장되어도 새 카탈로그 질의에 다시 쓰이지 않는지
+    dev.db 복사본에 칵테일을 하나 넣어 확인하므로 dev.db는 바뀌지 않습니다.
+    """
+    workdir = tempfile.mkdtemp()
+    saved_path = db_conn.DB_PATH
+    try:
+        db_conn.DB_PATH = os.path.join(workdir, 'dev.db')
+        shutil.copyfile(saved_path, db_conn.DB_PATH)
+        service = CocktailService()
+        service.recommend_by_taste_ingredients("gin", 3)
+
+        # 작업 스레드는 옛 인덱스로 계산을 시작한 채 멈춰 있음
+        entered, resume = threading.Event(), threading.Event()
+        compute = service._recommend_bm25
+
+        def held(*args):
+            if threading.current_thread().name == 'held-reader':
+                entered.set()
+                resume.wait(10)
+            return compute(*args)
+
+        service._recommend_bm25 = held
+        reader = threading.Thread(name='held-reader',
+                                  target=lambda: service.recommend_by_taste_ingredients("zzqq gin", 3))
+        reader.start()
+        entered.wait(10)
+
+        writer = sqlite3.connect(db_conn.DB_PATH)
+        writer.execute("INSERT INTO Cocktail (name, ingredients, price) VALUES (?, ?, ?)",
+                       ("Zzqq Special", "2 oz Zzqq, 1 oz Gin", 12.0))
+        writer.commit()
+        writer.close()
+        # 다른 질의가 새 카탈로그로 인덱스를 다시 만든 뒤 옛 계산이 끝남
+        service.recommend_by_taste_ingredients("gin", 3)
+        resume.set()
+        reader.join(10)
+
+        found = [item['name'] for item in service.recommend_by_taste_ingredients("zzqq gin", 3)]
+        service.close()
+        if not found or found[0] != "Zzqq Special":
+            return [f"새 칵테일을 넣은 뒤에도 옛 결과가 나옴: {found}"]
+        return []
+    finally:
+        db_conn.DB_PATH = saved_path
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def check_search_index_after_vacuum() -> list:
+    """
+    FTS 색인이 쓰기 트리거로 체크섬을 맞게 유지하고, VACUUM으로 rowid가 바뀌면 이를 알아채
+    다시 만든 뒤 올바른 행을 돌려주는지 (dev.db 복사본 사용)
+    """
+    workdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workdir, 'dev.db')
+        shutil.copyfile(db_conn.DB_PATH, path)
+        conn = sqlite3.connect(path)
+        cursor = conn.cursor()
+        problems = []
+
+        # 쓰기 트리거가 체크섬을 따라가는지 (추가 / 덮어쓰기 / 이름 변경 / 삭제)
+        names = [row[0] for row in cursor.execute("SELECT name FROM Cocktail ORDER BY rowid LIMIT 40")]
+        cursor.execute("INSERT INTO Cocktail (name, ingredients, price) VALUES ('Zzqq Check', '1 oz Gin', 9)")
+        cursor.execute("INSERT OR REPLACE INTO Cocktail (name, ingredients, price) VALUES (?, '1 oz Rum', 9)",
+                       (names[1],))
+        cursor.execute("UPDATE Cocktail SET name = 'Zzqq Renamed' WHERE name = 'Zzqq Check'")
+        cursor.executemany("DELETE FROM Cocktail WHERE name = ?", [(name,) for name in names[2:40:2]])
+        conn.commit()
+        if not cocktail_search_is_current(cursor):
+            problems.append("쓰기 뒤 체크섬이 맞지 않음")
+
+        # VACUUM이 rowid를 다시 매기는 경우를 흉내 냄 (트리거 없이 rowid만 바뀜)
+        # 이 SQLite 버전의 VACUUM은 rowid를 유지할 수 있어 직접 바꿈
+        for (trigger,) in cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'Cocktail'").fetchall():
+            cursor.execute(f"DROP TRIGGER {trigger}")
+        low, high = cursor.execute("SELECT MIN(rowid), MAX(rowid) FROM Cocktail").fetchone()
+        cursor.execute("UPDATE Cocktail SET rowid = -rowid")
+        cursor.execute("UPDATE Cocktail SET rowid = ? + rowid", (low + high,))
+        conn.commit()
+        if cocktail_search_is_current(cursor):
+            problems.append("rowid가 바뀌었는데 체크섬이 같음")
+        else:
+            # 시작할 때(cocktail_search_create)와 같은 처리
+            cocktail_search_rebuild(cursor)
+
+        for name in names[21:40:2]:
+            rows = cocktail_search(f'name : "{name}"', 5, cursor=cursor)
+            if not rows or name not in [row[0] for row in rows]:
+                problems.append(f"{name!r} 검색 결과: {[row[0] for row in rows][:3]}")
+        conn.close()
+        return problems[:10]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+CHECKS = (
+    check_query_trace,
+    check_price_paging_with_nulls,
+    check_similar_to_ingredients,
+    check_autocomplete_ranking,
+    check_catalog_statistics,
+    check_legacy_recommend_matches_full_scan,
+    check_bm25_top_k_ties,
+    check_cache_after_concurrent_rebuild,
+    check_search_index_after_vacuum,
+)
+
+
+def main() -> int:
+    failed = 0
+    for check in CHECKS:
+        problems = check()
+        print(f"{'FAIL' if problems else 'ok  '} {check.__name__}")
+        for line in problems:
+            print(f"     {line}")
+        failed += bool(problems)
+    print(f"점검 {len(CHECKS)}개 중 실패 {failed}개")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
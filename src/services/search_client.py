@@ -0,0 +1,100 @@
+"""
+칵테일 검색 데몬 클라이언트
+
+SearchClient는 CocktailService와 같은 이름의 조회 메서드를 제공하므로 호출하는 쪽은
+데몬을 쓰는지 몰라도 됩니다. 데몬에 연결할 수 없으면 같은 프로세스 안의 CocktailService로
+자동 전환합니다. (fallback=False 이면 연결 오류를 그대로 올림)
+"""
+
+import os
+import socket
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.services.search_daemon import (
+    SOCKET_PATH, SERVED_METHODS, encode_message, decode_message
+)
+from src.services.cocktail_record import Cocktail
+
+# Cocktail 레코드를 반환하는 메서드 - JSON에서는 배열이므로 받은 뒤 Cocktail로 되돌림
+RECORD_METHODS = ('find_cocktail_by_name',)
+RECORD_LIST_METHODS = ('get_all_cocktails_snapshot', 'find_cocktails_by_price_range')
+
+
+def restore_records(method: str, result):
+    """데몬 응답에서 Cocktail 레코드(필드 순서 배열)를 다시 Cocktail로 만듭니다."""
+    if method in RECORD_METHODS:
+        return Cocktail(*result) if result else None
+    if method in RECORD_LIST_METHODS:
+        return [Cocktail(*item) for item in result]
+    if method == 'get_cocktails_page':
+        result['items'] = [Cocktail(*item) for item in result['items']]
+    return result
+
+
+class SearchClient:
+    def __init__(self, socket_path: str = SOCKET_PATH, timeout: float = 5.0, fallback: bool = True):
+        """
+        Args:
+            socket_path: 검색 데몬 Unix 소켓 경로
+            timeout: 요청 하나의 최대 대기 시간 (초)
+            fallback: 데몬에 연결할 수 없을 때 프로세스 내 CocktailService 사용 여부
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.fallback = fallback
+        # 데몬 연결에 실패한 뒤 사용하는 프로세스 내 서비스
+        self._local = None
+
+    @property
+    def remote(self) -> bool:
+        """현재 데몬을 통해 조회하고 있는지 여부"""
+        return self._local is None
+
+    def call(self, method: str, *args, **kwargs):
+        """메서드 하나를 호출합니다. 데몬이 없으면 프로세스 내 서비스로 처리합니다."""
+        if self._local is not None:
+            return self._call_local(method, args, kwargs)
+        try:
+            response = self._request({'method': method, 'args': list(args), 'kwargs': kwargs})
+        except OSError as e:
+            if not self.fallback:
+                raise
+            print(f"검색 데몬 연결 실패, 프로세스 내 검색으로 전환합니다: {e}")
+            return self._call_local(method, args, kwargs)
+
+        if response.get('ok'):
+            return restore_records(method, response['result'])
+        if response.get('type') == 'ValueError':
+            raise ValueError(response.get('error'))
+        raise RuntimeError(f"검색 데몬 오류: {response.get('error')}")
+
+    def _request(self, request):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            sock.sendall(encode_message(request))
+            sock.shutdown(socket.SHUT_WR)
+            with sock.makefile('rb') as reader:
+                line = reader.readline()
+        if not line:
+            raise ConnectionError("검색 데몬이 응답 없이 연결을 닫았습니다")
+        return decode_message(line)
+
+    def _call_local(self, method, args, kwargs):
+        if method not in SERVED_METHODS:
+            raise ValueError(f"지원하지 않는 메서드: {method}")
+        if self._local is None:
+            from src.services.cocktail_service import CocktailService
+            self._local = CocktailService()
+            if self._local.similarity_is_stale():
+                self._local.refresh_similarity_in_background()
+        return getattr(self._local, method)(*args, **kwargs)
+
+    def __getattr__(self, name):
+        # recommend_by_taste_ingredients 등 CocktailService 조회 메서드를 그대로 노출
+        if name in SERVED_METHODS:
+            return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+        raise AttributeError(name)
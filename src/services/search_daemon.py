@@ -0,0 +1,197 @@
+"""
+칵테일 검색 데몬 (Unix 소켓)
+
+CocktailService 하나를 계속 띄워 두어 카탈로그/검색 인덱스/결과 캐시를 데워진 상태로 유지하고,
+CLI 데모와 GUI 같은 여러 프로세스가 같은 서비스를 공유하도록 합니다.
+클라이언트는 src.services.search_client.SearchClient를 사용합니다.
+
+프로토콜 (연결 하나에 요청 하나, UTF-8 JSON 한 줄씩):
+    요청: {"method": "search_cocktails_fuzzy", "args": ["margarita"], "kwargs": {"threshold": 0.6}}
+    응답: {"ok": true, "result": ...}
+          {"ok": false, "error": "메시지", "type": "ValueError"}
+
+사용 예:
+    python -m src.services.search_daemon serve
+    python -m src.services.search_daemon ping
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.db.conn import DB_PATH
+
+SOCKET_PATH = os.environ.get("KTAIL_SEARCH_SOCKET") or os.path.splitext(DB_PATH)[0] + ".search.sock"
+
+# 데몬이 처리하는 CocktailService 메서드 (읽기 전용 조회만 허용)
+SERVED_METHODS = (
+    'recommend_by_taste_ingredients',
+    'recommend_by_flavor',
+    'search_cocktails_fuzzy',
+    'autocomplete',
+    'search_cocktails_text',
+    'find_cocktail_by_name',
+    'find_cocktails_by_price_range',
+    'get_all_cocktails_snapshot',
+    'get_cocktails_page',
+    'count_cocktails',
+    'similar_cocktails',
+    'query_cache_stats',
+)
+
+# 요청 한 줄의 최대 크기 (bytes)
+MAX_REQUEST_BYTES = 1024 * 1024
+
+
+def encode_message(message) -> bytes:
+    """JSON 한 줄로 인코딩합니다. (NumPy 스칼라는 파이썬 값으로 변환)"""
+    return json.dumps(
+        message, ensure_ascii=False,
+        default=lambda o: o.item() if hasattr(o, 'item') else str(o)
+    ).encode('utf-8') + b'\n'
+
+
+def decode_message(line: bytes):
+    return json.loads(line.decode('utf-8'))
+
+
+class SearchRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline(MAX_REQUEST_BYTES)
+        if not line:
+            return
+        try:
+            response = {'ok': True, 'result': self.server.dispatch(decode_message(line))}
+        except Exception as e:
+            response = {'ok': False, 'error': str(e), 'type': type(e).__name__}
+        self.wfile.write(encode_message(response))
+
+
+class SearchServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    연결마다 스레드 하나로 요청을 처리하는 Unix 소켓 서버
+
+    CocktailService는 스레드별 DB 연결을 쓰고 인덱스를 읽기 전용으로 공유하므로
+    느린 요청 하나가 다른 요청을 막지 않습니다.
+    """
+
+    daemon_threads = True
+    # 동시에 연결하는 클라이언트가 많아도 연결이 거절(EAGAIN)되지 않도록 대기열을 늘림
+    request_queue_size = 128
+
+    def __init__(self, socket_path: str = SOCKET_PATH, service=None):
+        if service is None:
+            from src.services.cocktail_service import CocktailService
+            service = CocktailService()
+        self.service = service
+        self.started_at = time.time()
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+        _remove_stale_socket(socket_path)
+        super().__init__(socket_path, SearchRequestHandler)
+
+    def warm_up(self):
+        """카탈로그와 검색 인덱스를 미리 만들어 첫 요청도 빠르게 처리합니다."""
+        index = self.service._get_catalog_index()
+        index.ingredients.bm25
+        index.names
+        # similar_cocktails는 읽기만 하므로 테이블이 오래되었으면 요청과 별도로 다시 계산
+        if self.service.similarity_is_stale():
+            self.service.refresh_similarity_in_background()
+
+    def dispatch(self, request):
+        if not isinstance(request, dict):
+            raise ValueError("요청은 JSON 객체여야 합니다")
+        method = request.get('method')
+        args = request.get('args') or []
+        kwargs = request.get('kwargs') or {}
+        with self._requests_lock:
+            self.requests += 1
+
+        if method == 'ping':
+            return {
+                'pid': os.getpid(),
+                'uptime': round(time.time() - self.started_at, 3),
+                'requests': self.requests,
+            }
+        if method not in SERVED_METHODS:
+            raise ValueError(f"지원하지 않는 메서드: {method}")
+        return getattr(self.service, method)(*args, **kwargs)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+def _remove_stale_socket(socket_path: str):
+    """응답하지 않는 이전 데몬의 소켓 파일을 지웁니다. 살아 있는 데몬이 있으면 오류"""
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.unlink(socket_path)
+    else:
+        raise RuntimeError(f"이미 실행 중인 검색 데몬이 있습니다: {socket_path}")
+    finally:
+        probe.close()
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(socket_path: str = SOCKET_PATH):
+    server = SearchServer(socket_path)
+
+    start = time.perf_counter()
+    server.warm_up()
+    print(f"검색 데몬 시작: {socket_path} (준비 {(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    # SIGTERM도 Ctrl+C와 같이 정상 종료 (소켓 파일 정리)
+    signal.signal(signal.SIGTERM, _interrupt)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        server.server_close()
+        print("검색 데몬 종료")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="칵테일 검색 데몬 (Unix 소켓)")
+    parser.add_argument('command', choices=('serve', 'ping'))
+    parser.add_argument('--socket', default=SOCKET_PATH, help="Unix 소켓 경로")
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        serve(args.socket)
+        return 0
+
+    from src.services.search_client import SearchClient
+    client = SearchClient(args.socket, fallback=False)
+    try:
+        print(client.call('ping'))
+    except OSError as e:
+        print(f"검색 데몬에 연결할 수 없습니다: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
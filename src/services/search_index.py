@@ -0,0 +1,672 @@
+"""
+칵테일 검색용 인메모리 인덱스
+카탈로그를 한 번 읽어 만든 뒤, 카탈로그 버전이 바뀔 때만 다시 만듭니다.
+"""
+
+import heapq
+import math
+import os
+import re
+import sys
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterator, List, NamedTuple, Set, Tuple
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.utils.ingredient_parser import clean_ingredient_text, ingredient_key, parse_ingredients
+from src.utils.ingredient_canon import canonical_ingredient
+from src.utils.flavor_profile import FLAVOR_DIMS, amount_ml, ingredient_profile
+
+
+class IndexedCocktail(NamedTuple):
+    row: tuple                 # Cocktail 테이블 원본 행
+    cleaned: str               # 정리된 재료 문자열 (clean_ingredient_text)
+    keywords: frozenset        # cleaned의 단어 집합
+
+
+class CatalogIndex:
+    """
+    카탈로그 행 목록과 그로부터 만드는 인덱스들의 묶음
+    각 인덱스는 처음 사용할 때 한 번 만들고, 카탈로그가 바뀌면 묶음 전체를 새로 만듭니다.
+
+    만든 뒤에는 읽기만 하므로 여러 스레드가 공유해도 됩니다.
+    처음 만드는 순간만 잠금으로 보호하여 같은 인덱스를 두 번 만들지 않습니다.
+    """
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.by_name = {row[0]: row for row in self.rows if row[0]}
+        self._lock = threading.RLock()
+        self._ingredients = None
+        self._names = None
+        self._bitsets = None
+        self._flavors = None
+        self._autocomplete = None
+
+    def _lazy(self, attr: str, build):
+        value = getattr(self, attr)
+        if value is None:
+            with self._lock:
+                value = getattr(self, attr)
+                if value is None:
+                    value = build()
+                    setattr(self, attr, value)
+        return value
+
+    @property
+    def ingredients(self) -> "IngredientIndex":
+        return self._lazy('_ingredients', lambda: IngredientIndex(self.rows))
+
+    @property
+    def names(self) -> "NameTrigramIndex":
+        return self._lazy('_names', lambda: NameTrigramIndex(self.rows))
+
+    @property
+    def bitsets(self) -> "IngredientBitsets":
+        """칵테일별 기본 재료(canonical_ingredient) 비트셋 - 상표만 다른 재료는 같은 비트"""
+        return self._lazy('_bitsets', lambda: IngredientBitsets(
+            (row[0], canonical_ingredient(parsed.ingredient))
+            for row in self.rows if row[0] and row[1]
+            for parsed in parse_ingredients(row[1])
+        ))
+
+    @property
+    def flavors(self) -> "FlavorIndex":
+        return self._lazy('_flavors', lambda: FlavorIndex(self.rows))
+
+    @property
+    def autocomplete(self) -> "AutocompleteIndex":
+        return self._lazy('_autocomplete', self._build_autocomplete)
+
+    def _build_autocomplete(self) -> "AutocompleteIndex":
+        # 재료 키별로 처음 나온 원문 표기를 보여줌
+        ingredients: Dict[str, str] = {}
+        for row in self.rows:
+            if row[0] and row[1]:
+                for parsed in parse_ingredients(row[1]):
+                    ingredients.setdefault(ingredient_key(parsed.ingredient), parsed.ingredient.strip())
+        return AutocompleteIndex(self.by_name, ingredients.values())
+
+
+class IngredientIndex:
+    """
+    정리된 재료 키워드 -> 칵테일 번호(doc id) 역색인
+
+    doc id는 카탈로그 행 순서대로 부여되므로, doc id 순으로 순회하면
+    기존 전체 조회(cocktail_select) 순서와 같습니다.
+    """
+
+    def __init__(self, rows):
+        self.docs: List[IndexedCocktail] = []
+        self.postings: Dict[str, List[int]] = {}
+
+        for row in rows:
+            if not row[0] or not row[1]:  # name 또는 ingredients가 없으면 건너뛰기
+                continue
+            cleaned = clean_ingredient_text(row[1])
+            keywords = frozenset(cleaned.split())
+            doc_id = len(self.docs)
+            self.docs.append(IndexedCocktail(row, cleaned, keywords))
+            for keyword in keywords:
+                self.postings.setdefault(keyword, []).append(doc_id)
+
+        self._bm25 = None
+
+    def __len__(self):
+        return len(self.docs)
+
+    @property
+    def bm25(self) -> "BM25Index":
+        """
+        BM25 가중치 행렬 (처음 사용할 때 한 번 만듦)
+        작업 프로세스로 넘길 수 있도록 잠금을 두지 않습니다. 여러 스레드가 동시에 처음 부르면
+        중복 계산될 수는 있지만 완성된 행렬을 한 번에 대입하므로 반쯤 만든 값이 보이지 않습니다.
+        """
+        if self._bm25 is None:
+            self._bm25 = BM25Index(self.docs)
+        return self._bm25
+
+    def candidates(self, keywords) -> List[int]:
+        """키워드 중 하나라도 포함하는 칵테일의 doc id를 오름차순으로 반환합니다."""
+        ids: Set[int] = set()
+        for keyword in keywords:
+            ids.update(self.postings.get(keyword, ()))
+        return sorted(ids)
+
+
+class BM25Index:
+    """
+    정리된 재료 문자열에 대한 BM25 가중치 희소 행렬
+
+    용어(term) 기준 CSR 형태로 저장합니다.
+        indptr[t]:indptr[t+1] 구간의 doc_ids / weights 가 용어 t의 posting
+    질의 점수는 질의 용어 행들의 희소 합(= 질의 벡터와의 내적)으로 계산합니다.
+    """
+
+    def __init__(self, docs: List[IndexedCocktail], k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.n_docs = len(docs)
+        self.vocab: Dict[str, int] = {}
+
+        term_ids, doc_ids, tfs = [], [], []
+        doc_lens = np.zeros(self.n_docs, dtype=np.float32)
+        for doc_id, doc in enumerate(docs):
+            counts = Counter(doc.cleaned.split())
+            doc_lens[doc_id] = sum(counts.values())
+            for term, tf in counts.items():
+                term_ids.append(self.vocab.setdefault(term, len(self.vocab)))
+                doc_ids.append(doc_id)
+                tfs.append(tf)
+
+        term_ids = np.asarray(term_ids, dtype=np.int32)
+        doc_ids = np.asarray(doc_ids, dtype=np.int32)
+        tfs = np.asarray(tfs, dtype=np.float32)
+
+        # 용어별 문서 빈도와 IDF
+        df = np.bincount(term_ids, minlength=len(self.vocab)).astype(np.float32)
+        self.idf = np.log1p((self.n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+        # 어떤 문서에도 없는 용어의 IDF (정규화 분모에 사용)
+        self.unknown_idf = float(math.log1p((self.n_docs + 0.5) / 0.5))
+
+        avgdl = float(doc_lens.mean()) if self.n_docs else 0.0
+        norm = self.k1 * (1 - self.b + self.b * doc_lens[doc_ids] / (avgdl or 1.0))
+        weights = self.idf[term_ids] * tfs * (self.k1 + 1) / (tfs + norm)
+
+        # 용어 순으로 정렬하여 CSR 구성 (같은 용어 안에서는 doc id 순 유지)
+        order = np.argsort(term_ids, kind='stable')
+        self.doc_ids = doc_ids[order]
+        self.weights = weights[order].astype(np.float32)
+        self.indptr = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=len(self.vocab)), out=self.indptr[1:])
+
+    def score(self, terms) -> np.ndarray:
+        """질의 용어들에 대한 전체 문서 점수 벡터를 반환합니다."""
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        for term in set(terms):
+            t = self.vocab.get(term)
+            if t is None:
+                continue
+            start, end = self.indptr[t], self.indptr[t + 1]
+            # 한 용어의 posting 안에서 doc id는 중복되지 않음
+            scores[self.doc_ids[start:end]] += self.weights[start:end]
+        return scores
+
+    def max_score(self, terms) -> float:
+        """질의 용어들로 얻을 수 있는 점수 상한 (0~1 정규화용)"""
+        bound = 0.0
+        for term in set(terms):
+            t = self.vocab.get(term)
+            idf = float(self.idf[t]) if t is not None else self.unknown_idf
+            bound += idf * (self.k1 + 1)
+        return bound
+
+    def top_k(self, terms, k: int) -> List[Tuple[int, float]]:
+        """점수 상위 k개 (doc id, 점수)를 점수 내림차순으로 반환합니다. (점수 0 제외)"""
+        scores = self.score(terms)
+        candidates = np.flatnonzero(scores)
+        if k <= 0 or not len(candidates):
+            return []
+        if len(candidates) > k:
+            # argpartition은 k번째와 같은 점수 중 아무거나 고르므로, k번째 점수 이상은 모두 남긴 뒤 정렬
+            kth = -np.partition(-scores[candidates], k - 1)[k - 1]
+            candidates = candidates[scores[candidates] >= kth]
+        # 점수 내림차순, 같은 점수는 doc id(카탈로그 순서) 오름차순
+        order = np.lexsort((candidates, -scores[candidates]))[:k]
+        return [(int(candidates[i]), float(scores[candidates[i]])) for i in order]
+
+
+class NameTrigramIndex:
+    """
+    소문자 칵테일 이름의 문자 trigram 인덱스 (퍼지 이름 검색용)
+
+    SequenceMatcher.ratio() = 2M / (la + lb) 가 threshold 이상이 될 수 없는 이름을
+    아래 상한들로 먼저 걸러냅니다. 모두 실제 ratio의 상한이므로 결과는 전체 비교와 같습니다.
+    - 길이 상한: M <= min(la, lb)
+    - trigram 상한(q-gram lemma): 삽입/삭제 d번이면 공통 trigram >= max(la, lb) + 2 - 3d,
+      d <= (1 - threshold)(la + lb)
+    - 문자 빈도 상한(quick_ratio): M <= 문자별 min(개수) 합
+    """
+
+    PAD = '\x01\x01'
+
+    def __init__(self, rows):
+        self.rows = []
+        self.names = []
+        for row in rows:
+            if not row[0]:  # name이 없으면 건너뛰기
+                continue
+            self.rows.append(row)
+            self.names.append(row[0].lower())
+
+        self.lengths = np.array([len(name) for name in self.names], dtype=np.int32)
+
+        # trigram -> (doc ids, 문서 내 개수)
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        for doc_id, name in enumerate(self.names):
+            for gram, count in Counter(self._trigrams(name)).items():
+                ids, counts = postings.setdefault(gram, ([], []))
+                ids.append(doc_id)
+                counts.append(count)
+        self.postings = {
+            gram: (np.array(ids, dtype=np.int32), np.array(counts, dtype=np.int32))
+            for gram, (ids, counts) in postings.items()
+        }
+
+        # 문서 x 문자 개수 행렬
+        self.char_ids: Dict[str, int] = {}
+        for name in self.names:
+            for ch in name:
+                self.char_ids.setdefault(ch, len(self.char_ids))
+        self.char_counts = np.zeros((len(self.names), len(self.char_ids)), dtype=np.int32)
+        for doc_id, name in enumerate(self.names):
+            for ch, count in Counter(name).items():
+                self.char_counts[doc_id, self.char_ids[ch]] = count
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def _trigrams(cls, text: str) -> List[str]:
+        padded = f"{cls.PAD}{text}{cls.PAD}"
+        return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+    def candidates(self, query: str, threshold: float) -> np.ndarray:
+        """ratio >= threshold 가능성이 남은 doc id를 오름차순으로 반환합니다."""
+        n = len(self.names)
+        if threshold <= 0 or not n:
+            return np.arange(n)
+
+        eps = 1e-9
+        la = len(query)
+        total = la + self.lengths
+
+        # 길이 상한
+        alive = 2 * np.minimum(la, self.lengths) >= threshold * total - eps
+
+        # trigram 상한
+        shared = np.zeros(n, dtype=np.int32)
+        for gram, count in Counter(self._trigrams(query)).items():
+            posting = self.postings.get(gram)
+            if posting is not None:
+                ids, counts = posting
+                shared[ids] += np.minimum(counts, count)
+        max_edits = np.floor((1 - threshold) * total + eps)
+        alive &= shared >= np.maximum(la, self.lengths) + 2 - 3 * max_edits
+
+        # 문자 빈도 상한
+        ids = np.flatnonzero(alive)
+        if len(ids):
+            query_counts = np.zeros(len(self.char_ids), dtype=np.int32)
+            for ch, count in Counter(query).items():
+                if ch in self.char_ids:
+                    query_counts[self.char_ids[ch]] = count
+            upper = np.minimum(self.char_counts[ids], query_counts).sum(axis=1)
+            ids = ids[2 * upper >= threshold * total[ids] - eps]
+        return ids
+
+
+class IngredientBitsets:
+    """
+    칵테일별 재료 집합을 재료 어휘(vocab) 위의 비트셋으로 표현합니다.
+
+        bits[i]   : 칵테일 i의 재료 비트 (uint64 단어 배열, 재료 번호 j -> 단어 j // 64 의 비트 j % 64)
+        counts[i] : 칵테일 i의 재료 수
+    """
+
+    def __init__(self, pairs):
+        """
+        pairs: (칵테일명, 재료 키) 반복자. 칵테일 순서는 처음 등장한 순서를 따릅니다.
+        재료 키가 None(재료가 아닌 항목)이면 칵테일만 등록하고 비트는 세우지 않습니다.
+        """
+        self.names: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.vocab: Dict[str, int] = {}
+
+        members = []
+        for name, ingredient in pairs:
+            doc_id = self.positions.get(name)
+            if doc_id is None:
+                doc_id = self.positions[name] = len(self.names)
+                self.names.append(name)
+                members.append(set())
+            if ingredient is None:
+                continue
+            members[doc_id].add(self.vocab.setdefault(ingredient, len(self.vocab)))
+
+        self.words = max(1, (len(self.vocab) + 63) // 64)
+        self.bits = np.zeros((len(self.names), self.words), dtype=np.uint64)
+        for doc_id, bit_ids in enumerate(members):
+            for bit in bit_ids:
+                self.bits[doc_id, bit >> 6] |= np.uint64(1 << (bit & 63))
+        self.counts = np.bitwise_count(self.bits).sum(axis=1, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.names)
+
+    def mask(self, ingredients) -> np.ndarray:
+        """재료 키 목록을 비트셋 한 개로 만듭니다. (어휘에 없는 재료는 무시)"""
+        mask = np.zeros(self.words, dtype=np.uint64)
+        for ingredient in ingredients:
+            bit = self.vocab.get(ingredient)
+            if bit is not None:
+                mask[bit >> 6] |= np.uint64(1 << (bit & 63))
+        return mask
+
+
+class KDTree:
+    """
+    저차원 벡터 최근접 이웃 검색용 k-d 트리
+    범위가 가장 넓은 축의 중앙값으로 나누며, 잎(leaf)은 leaf_size개 이하의 점을 가집니다.
+    노드 방문은 파이썬 비용이 크고 잎 안의 거리 계산은 NumPy로 한 번에 하므로 잎을 크게 둡니다.
+    결과는 (거리, 점 번호) 오름차순으로 전체 비교와 같습니다.
+    """
+
+    def __init__(self, points: np.ndarray, leaf_size: int = 128):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.leaf_size = leaf_size
+        self.order = np.arange(len(self.points))
+        # 노드: (start, end, axis, split, left, right) - 잎은 axis = -1
+        self.nodes: List[Tuple[int, int, int, float, int, int]] = []
+        if len(self.points):
+            self._build(0, len(self.points))
+
+    def _build(self, start: int, end: int) -> int:
+        node_id = len(self.nodes)
+        self.nodes.append((start, end, -1, 0.0, -1, -1))
+        if end - start <= self.leaf_size:
+            return node_id
+
+        ids = self.order[start:end]
+        block = self.points[ids]
+        axis = int(np.argmax(block.max(axis=0) - block.min(axis=0)))
+        mid = (end - start) // 2
+        part = np.argpartition(block[:, axis], mid)
+        self.order[start:end] = ids[part]
+        split = float(self.points[self.order[start + mid], axis])
+
+        left = self._build(start, start + mid)
+        right = self._build(start + mid, end)
+        self.nodes[node_id] = (start, end, axis, split, left, right)
+        return node_id
+
+    def query(self, point, k: int = 1) -> List[Tuple[float, int]]:
+        """
+        가까운 k개 [(유클리드 거리, 점 번호), ...]
+
+        노드까지의 거리 하한이 작은 노드부터 보는 best-first 탐색이며,
+        하한은 분할면까지의 축별 거리를 누적해 구합니다. (incremental distance)
+        """
+        if not self.nodes or k <= 0:
+            return []
+        point = np.asarray(point, dtype=np.float64)
+
+        # (-거리^2, -점 번호) 최대 힙 - best[0]이 현재 k번째
+        best: List[Tuple[float, int]] = []
+        # (거리^2 하한, 노드 번호, 축별 분할면 거리)
+        queue = [(0.0, 0, np.zeros(len(point)))]
+        while queue:
+            bound, node_id, offsets = heapq.heappop(queue)
+            # 같은 거리의 더 작은 번호가 남아 있을 수 있으므로 하한이 k번째보다 클 때만 종료
+            if len(best) >= k and bound > -best[0][0]:
+                break
+
+            start, end, axis, split, left, right = self.nodes[node_id]
+            if axis < 0:
+                ids = self.order[start:end]
+                dists = ((self.points[ids] - point) ** 2).sum(axis=1)
+                if len(best) >= k:
+                    keep = dists <= -best[0][0]
+                    ids, dists = ids[keep], dists[keep]
+                for dist, i in zip(dists.tolist(), ids.tolist()):
+                    entry = (-dist, -i)
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif entry > best[0]:
+                        heapq.heapreplace(best, entry)
+                continue
+
+            diff = point[axis] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            heapq.heappush(queue, (bound, near, offsets))
+            far_offsets = offsets.copy()
+            far_offsets[axis] = diff
+            heapq.heappush(queue, (bound - offsets[axis] ** 2 + diff * diff, far, far_offsets))
+
+        return [(math.sqrt(-d), -i) for d, i in sorted(best, reverse=True)]
+
+
+class FlavorIndex:
+    """
+    칵테일 맛 벡터 + k-d 트리
+
+    칵테일 벡터 = 재료 맛 벡터를 분량(ml)으로 가중 평균한 뒤 길이 1로 정규화
+    (단위 벡터 사이 유클리드 거리 d에 대해 코사인 유사도 = 1 - d^2 / 2)
+    맛 규칙에 걸리는 재료가 하나도 없는 칵테일은 제외합니다.
+    """
+
+    def __init__(self, rows):
+        doc_rows, doc_ids, vocab_ids, weights = [], [], [], []
+        vocab: Dict[str, int] = {}
+        for row in rows:
+            if not row[0] or not row[1]:
+                continue
+            doc_id = len(doc_rows)
+            doc_rows.append(row)
+            for parsed in parse_ingredients(row[1]):
+                key = canonical_ingredient(parsed.ingredient)
+                if key is None:
+                    continue
+                doc_ids.append(doc_id)
+                vocab_ids.append(vocab.setdefault(key, len(vocab)))
+                weights.append(amount_ml(parsed.amount, parsed.unit))
+
+        profiles = np.array([ingredient_profile(key) for key in vocab], dtype=np.float64).reshape(-1, len(FLAVOR_DIMS))
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        vocab_ids = np.asarray(vocab_ids, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+
+        # 칵테일별 가중 합 / 가중치 합
+        vectors = np.zeros((len(doc_rows), len(FLAVOR_DIMS)))
+        np.add.at(vectors, doc_ids, weights[:, None] * profiles[vocab_ids])
+        totals = np.bincount(doc_ids, weights=weights, minlength=len(doc_rows))
+        self.profiles = vectors / np.maximum(totals, 1e-9)[:, None]
+
+        norms = np.linalg.norm(self.profiles, axis=1)
+        keep = np.flatnonzero(norms > 0)
+        self.rows = [doc_rows[i] for i in keep]
+        self.profiles = self.profiles[keep]
+        self.tree = KDTree(self.profiles / norms[keep, None])
+
+    def __len__(self):
+        return len(self.rows)
+
+    def nearest(self, vector: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """맛 벡터와 방향이 가까운 칵테일 [(번호, 코사인 유사도), ...]"""
+        norm = np.linalg.norm(vector)
+        if not norm:
+            return []
+        return [(i, 1 - d * d / 2) for d, i in self.tree.query(vector / norm, k)]
+
+
+class AutocompleteIndex:
+    """
+    칵테일 이름/재료 자동완성용 접두사 trie (오타 허용)
+
+    정규화한 항목을 정렬된 배열에 두면 같은 접두사를 가진 항목이 연속 구간이 되므로,
+    trie 노드를 (구간 시작, 구간 끝, 깊이)로 표현합니다. (노드 객체가 없어 이름이 많아도 메모리가 작음)
+    검색은 trie를 따라 내려가며 Levenshtein 거리 표를 한 행씩 계산하고,
+    행의 최솟값이 허용 오타 수를 넘는 가지는 내려가지 않습니다. (Levenshtein automaton과 같은 가지치기)
+    첫 글자는 오타로 보지 않아 루트에서 한 가지만 내려갑니다.
+    trie는 사전 순으로 내려가므로 결과가 limit개 차면 바로 멈추고,
+    결과가 적어 끝까지 내려가야 하는 입력은 MAX_ROWS에서 끊습니다.
+
+    항목은 두 층으로 나눕니다.
+    - 0층: 칵테일 전체 이름과 재료
+    - 1층: 이름 중간 단어부터 시작하는 부분 ("smash" -> Honey Basil Smash)
+    같은 오타 수면 0층 결과가 먼저 나옵니다.
+    """
+
+    NAME = 'name'
+    INGREDIENT = 'ingredient'
+    # 오타를 허용하지 않는 앞부분 글자 수
+    EXACT_PREFIX = 1
+    # 접두사 p로 시작하는 모든 문자열 < p + END
+    END = '\U0010ffff'
+    # 키 입력 한 번에 계산할 거리 표 행 수 상한 (오타 단계 전체 합)
+    # 넘으면 그때까지 찾은 항목만 반환하므로 결과가 드문 긴 오타 입력도 몇 ms 안에 끝남
+    MAX_ROWS = 1000
+
+    def __init__(self, names, ingredients):
+        heads, tails = set(), set()
+        for name in names:
+            words = self.normalize(name).split()
+            if words:
+                heads.add((' '.join(words), name, self.NAME))
+            for start in range(1, len(words)):
+                tails.add((' '.join(words[start:]), name, self.NAME))
+        for ingredient in ingredients:
+            term = self.normalize(ingredient)
+            if term:
+                heads.add((term, ingredient, self.INGREDIENT))
+
+        # 층별 (정렬된 항목, 표시 이름, 종류)
+        self.layers = []
+        for entries in (heads, tails):
+            entries = sorted(entries)
+            self.layers.append((
+                [term for term, _, _ in entries],
+                [display for _, display, _ in entries],
+                [kind for _, _, kind in entries],
+            ))
+
+    def __len__(self):
+        return sum(len(terms) for terms, _, _ in self.layers)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """소문자, 악센트 제거, 아포스트로피 삭제, 나머지 구두점은 공백 하나로"""
+        text = unicodedata.normalize('NFKD', text.lower())
+        text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+        text = re.sub(r"['\u2019]", '', text)
+        return ' '.join(re.sub(r'[\W_]+', ' ', text).split())
+
+    @staticmethod
+    def allowed_typos(length: int) -> int:
+        """짧은 입력에서 오타를 허용하면 너무 많은 항목이 걸리므로 길이에 따라 줄임 (2자 이하 0, 5자 이하 1)"""
+        if length <= 2:
+            return 0
+        if length <= 5:
+            return 1
+        return 2
+
+    def search(self, query: str, limit: int = 8, max_typos: int = 2) -> List[Tuple[str, str, int]]:
+        """
+        정규화한 query와의 편집 거리가 max_typos 이하인 접두사를 가진 항목 [(표시 이름, 종류, 오타 수), ...]
+        오타 수 -> 층 -> 사전 순이며, 같은 (표시 이름, 종류)는 한 번만 반환합니다.
+        """
+        query = self.normalize(query)
+        if not query or limit <= 0:
+            return []
+        max_typos = min(max_typos, self.allowed_typos(len(query)))
+
+        # 오타 0개부터 늘려 가며 찾음. 오타 t개 이하로 limit개가 채워지면
+        # 오타가 더 많은 항목은 순위상 뒤이므로 결과가 같고, 대부분의 입력이 가장 싼 단계에서 끝남.
+        # 각 단계에서는 오타가 정확히 t개인 항목만 층 -> 사전 순으로 덧붙이고 limit개가 되는 즉시 멈춤
+        results = []
+        seen = set()
+        budget = [self.MAX_ROWS]
+        for typos in range(max_typos + 1):
+            if self._extend(query, limit, typos, results, seen, budget) or budget[0] <= 0:
+                break
+        return results
+
+    def _extend(self, query: str, limit: int, typos: int, results: list, seen: set, budget: List[int]) -> bool:
+        """오타가 정확히 typos개인 항목을 results에 덧붙이고, limit개가 채워졌으면 True"""
+        for terms, displays, kinds in self.layers:
+            for distance, lo, hi in self._matching_ranges(terms, query, typos, budget):
+                # 오타가 더 적은 항목은 앞 단계에서 이미 모두 찾았음
+                if distance < typos:
+                    continue
+                for entry_id in range(lo, hi):
+                    key = (displays[entry_id], kinds[entry_id])
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    results.append((key[0], key[1], typos))
+                    if len(results) >= limit:
+                        return True
+        return False
+
+    def _matching_ranges(self, terms: List[str], query: str, max_typos: int,
+                         budget: List[int]) -> Iterator[Tuple[int, int, int]]:
+        """
+        접두사가 query와 max_typos 이내인 trie 노드 (오타 수, 구간 시작, 구간 끝)를 구간 시작 순으로 내놓습니다.
+        trie를 사전 순으로 내려가므로 같은 오타 수의 항목은 사전 순으로 나오고, 필요한 만큼만 읽고 멈출 수 있습니다.
+        budget[0]은 남은 계산 행 수로, 0이 되면 더 내려가지 않습니다.
+        """
+        m = len(query)
+        if max_typos == 0:
+            # 오타가 없으면 query로 시작하는 구간 하나
+            lo = bisect_left(terms, query)
+            hi = bisect_left(terms, query + self.END, lo)
+            if lo < hi:
+                yield 0, lo, hi
+            return
+
+        # max_typos를 넘는 거리는 모두 같은 값으로 취급
+        cap = max_typos + 1
+        # (구간 시작, 구간 끝, 깊이, 거리 표의 현재 행)
+        stack = [(0, len(terms), 0, [min(col, cap) for col in range(m + 1)])]
+        while stack and budget[0] > 0:
+            lo, hi, depth, row = stack.pop()
+            distance = row[m]
+            if distance <= max_typos:
+                yield distance, lo, hi
+                # 아래 노드의 거리는 행의 최솟값보다 작아질 수 없음
+                if min(row) >= distance:
+                    continue
+
+            # 길이가 depth인 항목(이 노드에서 끝나는 항목)은 구간 앞쪽에 모여 있음
+            i = lo
+            while i < hi and len(terms[i]) == depth:
+                i += 1
+
+            if depth < self.EXACT_PREFIX:
+                # 오타를 허용하지 않는 위치는 같은 글자의 가지 하나만 봄
+                prefix = terms[i][:depth] + query[depth] if i < hi else ''
+                i = bisect_left(terms, prefix, i, hi)
+                hi = bisect_left(terms, prefix + self.END, i, hi)
+
+            # 깊이 d의 칸 (d, col)은 |d - col| 이상이므로 대각선 띠 안의 칸만 계산하고 나머지는 cap
+            first = max(1, depth + 1 - max_typos)
+            last = min(m, depth + 1 + max_typos)
+            children = []
+            while i < hi:
+                budget[0] -= 1
+                ch = terms[i][depth]
+                j = bisect_left(terms, terms[i][:depth + 1] + self.END, i, hi)
+                next_row = [cap] * (m + 1)
+                left = next_row[0] = row_min = min(row[0] + 1, cap)
+                for col in range(first, last + 1):
+                    value = row[col - 1] + (query[col - 1] != ch)
+                    if left + 1 < value:
+                        value = left + 1
+                    if row[col] + 1 < value:
+                        value = row[col] + 1
+                    if value > cap:
+                        value = cap
+                    next_row[col] = left = value
+                    if value < row_min:
+                        row_min = value
+                if row_min <= max_typos:
+                    children.append((i, j, depth + 1, next_row))
+                i = j
+            # 스택이므로 뒤 글자부터 넣어야 앞 글자 가지를 먼저 꺼냄
+            stack.extend(reversed(children))
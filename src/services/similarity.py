@@ -0,0 +1,111 @@
+"""
+칵테일 간 재료 유사도 ("비슷한 칵테일") 사전 계산 작업
+
+각 칵테일의 재료를 비트셋으로 만들고, 모든 칵테일 쌍의 Jaccard 유사도
+|A ∩ B| / |A ∪ B| 를 NumPy 비트 연산으로 한 번에 계산하여
+칵테일별 상위 N개를 CocktailSimilarity 테이블에 저장합니다.
+조회는 CocktailService.similar_cocktails()가 인덱스 한 번 읽기로 처리하며 다시 계산하지 않습니다.
+카탈로그를 바꾸는 경로(catalog_import, data_to_db, CocktailService.add_cocktail)가 이 작업을 호출합니다.
+
+사용 예:
+    python -m src.services.similarity --top 20
+    python -m src.services.similarity --if-stale   # 카탈로그가 바뀌었을 때만 (주기 작업용)
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.db.cocktail import (
+    catalog_version, cocktail_similarity_stamp, cocktail_ingredient_select_all, cocktail_similarity_replace
+)
+from src.services.search_index import IngredientBitsets
+from src.utils.ingredient_canon import canonical_ingredient
+
+# 칵테일별로 저장하는 이웃 수
+DEFAULT_TOP_N = 20
+
+# 블록 단위 비트 연산에 쓰는 최대 임시 메모리 (bytes)
+BLOCK_BYTES = 64 * 1024 * 1024
+
+
+def load_ingredient_bitsets(cursor=None) -> IngredientBitsets:
+    """CocktailIngredient 테이블에서 칵테일별 기본 재료(canonical_ingredient) 비트셋을 만듭니다. (칵테일명 순)"""
+    return IngredientBitsets(
+        (cocktail, canonical_ingredient(ingredient))
+        for cocktail, _, _, _, _, ingredient in cocktail_ingredient_select_all(cursor)
+    )
+
+
+def jaccard_top_n(bitsets: IngredientBitsets, top_n: int = DEFAULT_TOP_N) -> List[Tuple[str, int, str, float]]:
+    """
+    모든 칵테일 쌍의 Jaccard 유사도를 계산하여 칵테일별 상위 top_n개를 반환합니다.
+    자기 자신과 유사도 0인 칵테일은 제외하며, 같은 점수는 칵테일명 순입니다.
+
+    Returns:
+        [(칵테일명, 순위(1부터), 비슷한 칵테일명, 유사도), ...]
+    """
+    n = len(bitsets)
+    if not n or top_n <= 0:
+        return []
+
+    bits, counts = bitsets.bits, bitsets.counts
+    block = max(1, BLOCK_BYTES // (n * bitsets.words * 8))
+
+    rows = []
+    for start in range(0, n, block):
+        end = min(start + block, n)
+        # (블록 칵테일 수, 전체 칵테일 수) 교집합 크기
+        inter = np.bitwise_count(bits[start:end, None, :] & bits[None, :, :]).sum(axis=2, dtype=np.int32)
+        union = counts[start:end, None] + counts[None, :] - inter
+        sim = np.divide(inter, union, out=np.zeros(inter.shape, dtype=np.float64), where=union > 0)
+        sim[np.arange(end - start), np.arange(start, end)] = 0.0
+
+        # 점수 내림차순, 같은 점수는 칵테일 순서 (stable)
+        order = np.argsort(-sim, axis=1, kind='stable')[:, :top_n]
+        for offset, neighbors in enumerate(order):
+            name = bitsets.names[start + offset]
+            rank = 0
+            for j in neighbors:
+                score = float(sim[offset, j])
+                if score <= 0:
+                    break
+                rank += 1
+                rows.append((name, rank, bitsets.names[j], round(score, 4)))
+    return rows
+
+
+def refresh_similarity(top_n: int = DEFAULT_TOP_N, cursor=None) -> int:
+    """유사도 테이블을 다시 계산하여 저장하고, 저장한 행 수를 반환합니다."""
+    # 데이터보다 스탬프를 먼저 읽어, 도중에 카탈로그가 바뀌면 다음 조회 때 다시 계산되도록 함
+    stamp = catalog_version(cursor)
+    rows = jaccard_top_n(load_ingredient_bitsets(cursor), top_n)
+    cocktail_similarity_replace(rows, stamp, cursor)
+    return len(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="칵테일 간 재료 Jaccard 유사도 사전 계산")
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP_N, help="칵테일별 저장할 이웃 수")
+    parser.add_argument('--if-stale', action='store_true', help="유사도 테이블이 카탈로그보다 오래된 경우에만 계산")
+    args = parser.parse_args(argv)
+
+    if args.if_stale and cocktail_similarity_stamp() == catalog_version():
+        print("유사도 테이블이 최신입니다.")
+        return 0
+
+    start = time.perf_counter()
+    count = refresh_similarity(args.top)
+    print(f"유사도 {count}행 저장 ({(time.perf_counter() - start) * 1000:.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+CocktailService 동시 호출 점검 (스레드 스트레스)
+
+서비스 하나를 여러 스레드가 함께 호출하면서 재료 추천 / 이름 퍼지 검색 / 이름 조회 /
+페이지 조회 / 유사 칵테일 질의를 섞어 보내고, 한 스레드에서 미리 계산한 기대 결과와 비교합니다.
+인덱스가 아직 없는 상태에서 시작하므로 첫 질의들은 인덱스 생성과도 겹칩니다.
+
+실행 중간에 쓰기 스레드가 칵테일(PROBE_NAME)을 하나 넣습니다. 쓰기 이후에 시작한 호출은
+새 카탈로그 기준 결과와 같아야 하며, 옛 카탈로그로 계산된 결과(캐시나 옛 인덱스)가 나오면 불일치입니다.
+(쓰기 전에 시작해 쓰기와 겹친 호출은 옛 결과와 새 결과 모두 허용)
+dev.db 복사본에서 실행하므로 dev.db는 바뀌지 않습니다.
+
+결과 캐시 없이(모든 호출이 실제 인덱스 / DB 경로를 거침) 한 번, 캐시를 켜고 한 번 실행합니다.
+예외나 결과 불일치가 하나라도 있으면 종료 코드 1을 반환합니다.
+
+사용 예:
+    python -m src.services.thread_stress --threads 16 --rounds 50
+    python -m src.services.thread_stress --cache-size 256
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.db import conn as db_conn
+from src.services.cocktail_service import CocktailService
+
+
+def build_calls(service: CocktailService, n: int, seed: int = 7) -> List[Tuple[str, Callable]]:
+    """(설명, service를 받아 결과를 돌려주는 함수) 질의 목록을 만듭니다."""
+    rng = random.Random(seed)
+    names = [item.name for item in service.get_all_cocktails()]
+    words = sorted({
+        item['ingredient'].lower()
+        for name in rng.sample(names, min(len(names), 50))
+        for item in service.get_cocktail_ingredients(name)
+    })
+    if not names or not words:
+        return []
+
+    calls = []
+    for _ in range(n):
+        kind = rng.choice(('recommend', 'fuzzy', 'name', 'page', 'similar'))
+        name = rng.choice(names)
+        if kind == 'recommend':
+            query = ' '.join(rng.sample(words, min(len(words), 2)))
+            calls.append((f"recommend {query!r}",
+                          lambda s, q=query: s.recommend_by_taste_ingredients(q, top_n=5)))
+        elif kind == 'fuzzy':
+            # 한 글자를 빼서 오타가 있는 이름으로 검색
+            cut = rng.randrange(len(name))
+            typo = name[:cut] + name[cut + 1:]
+            calls.append((f"fuzzy {typo!r}", lambda s, q=typo: s.search_cocktails_fuzzy(q)))
+        elif kind == 'name':
+            calls.append((f"name {name!r}", lambda s, q=name.lower(): s.find_cocktail_by_name(q)))
+        elif kind == 'page':
+            calls.append((f"page after {name!r}", lambda s, q=name: s.get_cocktails_page(q, 10)))
+        else:
+            calls.append((f"similar {name!r}", lambda s, q=name: s.similar_cocktails(q, 5)))
+    return calls
+
+
+# 실행 중간에 쓰기 스레드가 넣는 칵테일과, 넣은 뒤 결과에 반드시 나와야 하는 질의
+PROBE_NAME = "Zzqq Stress Special"
+PROBE_INGREDIENTS = "2 oz Zzqq, 1 oz Gin, .5 oz Lime Juice"
+PROBE_CALLS = [
+    ("probe recommend 'zzqq gin'", lambda s: s.recommend_by_taste_ingredients("zzqq gin", top_n=5)),
+    ("probe legacy 'zzqq gin'", lambda s: s.recommend_by_taste_ingredients("zzqq gin", top_n=5, scorer='legacy')),
+    ("probe fuzzy 'zzqq stress'", lambda s: s.search_cocktails_fuzzy("zzqq stress specal")),
+    ("probe autocomplete 'zzqq'", lambda s: s.autocomplete("zzqq")),
+]
+
+
+def run(threads: int = 16, rounds: int = 50, seed: int = 7, cache_size: int = 0) -> int:
+    """dev.db 복사본에서 점검하므로 쓰기 스레드가 넣는 칵테일은 dev.db에 남지 않습니다."""
+    workdir = tempfile.mkdtemp()
+    saved_path = db_conn.DB_PATH
+    try:
+        db_conn.DB_PATH = os.path.join(workdir, 'dev.db')
+        shutil.copyfile(saved_path, db_conn.DB_PATH)
+        return _run(threads, rounds, seed, cache_size)
+    finally:
+        db_conn.DB_PATH = saved_path
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _run(threads: int, rounds: int, seed: int, cache_size: int) -> int:
+    # 기대 결과는 별도 서비스에서 한 스레드로 계산 (점검 대상 서비스는 인덱스 없이 시작)
+    reference = CocktailService(cache_size=0)
+    calls = build_calls(reference, threads * 8, seed) + PROBE_CALLS
+    before = [call(reference) for _, call in calls]
+
+    service = CocktailService(cache_size=cache_size)
+    errors = []
+    # (스레드, 설명, 질의 번호, 쓰기 이후에 시작했는지, 결과)
+    observed = []
+    lock = threading.Lock()
+    # 모든 스레드(읽기 + 쓰기 1개)가 같은 순간에 시작하도록 맞춤
+    barrier = threading.Barrier(threads + 1)
+    halfway = threading.Event()
+    written = threading.Event()
+
+    def worker(worker_id: int) -> int:
+        rng = random.Random(seed + worker_id)
+        order = list(range(len(calls)))
+        barrier.wait()
+        done = 0
+        for round_no in range(rounds):
+            if round_no == rounds // 2:
+                halfway.set()
+            rng.shuffle(order)
+            for i in order[:len(order) // 4]:
+                label, call = calls[i]
+                after = written.is_set()
+                try:
+                    result = call(service)
+                except Exception as e:
+                    with lock:
+                        errors.append(f"[{worker_id}] {label}: {type(e).__name__}: {e}")
+                    continue
+                if result != before[i] or after:
+                    with lock:
+                        observed.append((worker_id, label, i, after, result))
+                done += 1
+        return done
+
+    def writer():
+        # 읽기 스레드들이 캐시와 인덱스를 채운 뒤, 실행 중간에 카탈로그를 바꿈
+        barrier.wait()
+        halfway.wait()
+        conn = sqlite3.connect(db_conn.DB_PATH, timeout=30)
+        conn.execute("INSERT INTO Cocktail (name, ingredients, price) VALUES (?, ?, ?)",
+                     (PROBE_NAME, PROBE_INGREDIENTS, 12.0))
+        conn.commit()
+        conn.close()
+        written.set()
+
+    start = time.perf_counter()
+    writer_thread = threading.Thread(target=writer)
+    writer_thread.start()
+    with ThreadPoolExecutor(threads) as pool:
+        completed = sum(pool.map(worker, range(threads)))
+    writer_thread.join()
+    elapsed = time.perf_counter() - start
+
+    # 쓰기 이후 카탈로그 기준 기대 결과
+    after_expected = [call(reference) for _, call in calls]
+    mismatches = []
+    for worker_id, label, i, after, result in observed:
+        # 쓰기 전에 시작한 호출은 옛 결과와 새 결과 모두 허용, 쓰기 이후에 시작했으면 새 결과만
+        if result != after_expected[i] and (after or result != before[i]):
+            mismatches.append(f"[{worker_id}] {label}{' (쓰기 이후)' if after else ''}")
+    for (label, _), result in zip(PROBE_CALLS, after_expected[len(calls) - len(PROBE_CALLS):]):
+        if not any(PROBE_NAME in (item.get('name'), item.get('text')) for item in result):
+            errors.append(f"{label}: 쓰기 이후 기대 결과에 {PROBE_NAME!r}가 없음 - 점검 질의를 확인하세요")
+
+    print(f"스레드 {threads}개 + 쓰기 1개, 질의 종류 {len(calls)}개, 완료 {completed}건, "
+          f"{elapsed:.2f}초 ({completed / elapsed if elapsed > 0 else 0:.0f} q/s)")
+    print(f"결과 캐시: {service.query_cache_stats()}")
+    print(f"쓰기 이후 시작한 호출 {sum(after for _, _, _, after, _ in observed)}건")
+    print(f"예외 {len(errors)}건, 결과 불일치 {len(mismatches)}건")
+    for line in (errors + mismatches)[:10]:
+        print(f"  {line}")
+    return 1 if errors or mismatches else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CocktailService 동시 호출 점검")
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--rounds', type=int, default=50, help="스레드마다 반복할 횟수")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--cache-size', type=int, nargs='+', default=[0, 256],
+                        help="점검 대상 서비스의 결과 캐시 크기 (0이면 캐시 없음, 여러 개면 차례로 실행)")
+    args = parser.parse_args(argv)
+    failed = 0
+    for cache_size in args.cache_size:
+        print(f"== 결과 캐시 크기 {cache_size}")
+        failed |= run(args.threads, args.rounds, args.seed, cache_size)
+    return failed
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Aho–Corasick 다중 패턴 문자열 검색
+
+여러 키워드를 하나의 오토마톤으로 만들어, 문자열을 한 번 훑는 동안
+포함된 키워드를 모두 찾습니다. (키워드 수와 관계없이 문자열 길이에 비례)
+"""
+
+from collections import deque
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple
+
+
+class AhoCorasick:
+    """
+    (키워드, 값) 목록으로 만든 Aho–Corasick 오토마톤
+
+        goto[s]    : 상태 s에서 문자별 다음 상태
+        fail[s]    : 상태 s에서 더 진행할 수 없을 때 돌아갈 상태 (가장 긴 접미사 상태)
+        outputs[s] : 상태 s에서 끝나는 키워드의 값 (fail 경로의 값 포함)
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Hashable]]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[Tuple] = [()]
+
+        for keyword, value in patterns:
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                next_state = self.goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][ch] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append(())
+                state = next_state
+            self.outputs[state] += (value,)
+
+        # 얕은 상태부터 fail 링크를 정하고, fail 상태의 출력을 물려받음
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.outputs[next_state] += self.outputs[self.fail[next_state]]
+
+    def __len__(self):
+        return len(self.goto)
+
+    def search(self, text: str) -> Iterator[Tuple[int, Hashable]]:
+        """text에서 찾은 키워드를 (끝 위치, 값)으로 순서대로 반환합니다. (겹치는 키워드 포함)"""
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        state = 0
+        for end, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for value in outputs[state]:
+                yield end, value
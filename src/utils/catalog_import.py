@@ -0,0 +1,230 @@
+"""
+스프레드시트(XLSX / XLS) 칵테일 메뉴를 db에 저장합니다.
+
+- .xlsx 는 openpyxl read-only 모드로 행 단위 스트리밍
+- .xls 는 xlrd on_demand 모드로 시트 단위 로딩
+- 여러 파일/시트는 프로세스 풀에서 병렬로 파싱하고, 저장은 data_to_db의 일괄 저장 경로 사용
+- 워커는 정리된 행을 청크 단위로 시트별 임시 파일에 기록하고 (시트 전체를 메모리에 올리거나 되돌려 보내지 않음)
+  부모는 작업을 제출한 순서(파일, 시트 순)대로 임시 파일을 읽어 저장하므로
+  여러 시트에 같은 이름이 있으면 항상 나중 시트의 행이 남습니다.
+- 저장이 끝나면 "비슷한 칵테일" 유사도 테이블을 다시 계산합니다. (조회 쪽에서는 계산하지 않음)
+
+사용 예:
+    python -m src.utils.catalog_import menu.xlsx supplier_a.xls --workers 4
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.db.conn import db_connect
+from src.services.similarity import refresh_similarity
+from src.utils.data_to_db import normalize_cocktail_row, upsert_cocktails
+
+# 헤더(소문자, 공백 정리) -> Cocktail 테이블 컬럼
+HEADER_ALIASES = {
+    'cocktail name': 'name',
+    'cocktail': 'name',
+    'name': 'name',
+    'ingredients': 'ingredients',
+    'ingredient': 'ingredients',
+    'recipe': 'ingredients',
+    'garnish': 'garnish',
+    'glassware': 'glassware',
+    'glass': 'glassware',
+    'preparation': 'preparation',
+    'method': 'preparation',
+    'price': 'price',
+    'notes': 'note',
+    'note': 'note',
+}
+
+# 헤더 행을 찾을 때 확인할 최대 행 수 (시트 상단에 제목 행이 있는 경우 대비)
+HEADER_SCAN_ROWS = 10
+
+# 워커가 임시 파일에 한 번에 기록하는 행 수 (워커/부모 메모리 상한)
+CHUNK_ROWS = 500
+
+
+def map_header(header_row) -> Dict[int, str]:
+    """헤더 행에서 {열 번호: Cocktail 컬럼} 매핑을 만듭니다."""
+    mapping = {}
+    for idx, cell in enumerate(header_row):
+        if cell is None:
+            continue
+        key = ' '.join(str(cell).replace('\ufeff', '').split()).lower()
+        column = HEADER_ALIASES.get(key)
+        if column and column not in mapping.values():
+            mapping[idx] = column
+    return mapping
+
+
+def _map_rows(rows: Iterator[tuple]) -> Iterator[tuple]:
+    """원시 행 이터레이터에서 헤더를 찾은 뒤 정리된 Cocktail 튜플을 돌려줍니다."""
+    mapping = None
+    for scanned, row in enumerate(rows):
+        if mapping is None:
+            candidate = map_header(row)
+            if 'name' in candidate.values() and 'ingredients' in candidate.values():
+                mapping = candidate
+            elif scanned >= HEADER_SCAN_ROWS:
+                return
+            continue
+
+        record = {column: row[idx] for idx, column in mapping.items() if idx < len(row)}
+        normalized = normalize_cocktail_row(record)
+        if normalized:
+            yield normalized
+
+
+def iter_xlsx_rows(path: str, sheet_name: str) -> Iterator[tuple]:
+    """openpyxl read-only 모드로 시트를 한 행씩 읽습니다."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from _map_rows(workbook[sheet_name].iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+
+def iter_xls_rows(path: str, sheet_name: str) -> Iterator[tuple]:
+    """xlrd on_demand 모드로 필요한 시트만 읽습니다."""
+    import xlrd
+
+    workbook = xlrd.open_workbook(path, on_demand=True)
+    try:
+        sheet = workbook.sheet_by_name(sheet_name)
+        rows = (
+            tuple(None if cell.ctype == xlrd.XL_CELL_EMPTY else cell.value for cell in sheet.row(r))
+            for r in range(sheet.nrows)
+        )
+        yield from _map_rows(rows)
+    finally:
+        workbook.release_resources()
+
+
+def list_sheets(path: str) -> List[str]:
+    """워크북의 시트 이름 목록을 반환합니다."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.xlsx':
+        from openpyxl import load_workbook
+        workbook = load_workbook(path, read_only=True)
+        try:
+            return list(workbook.sheetnames)
+        finally:
+            workbook.close()
+    if ext == '.xls':
+        import xlrd
+        workbook = xlrd.open_workbook(path, on_demand=True)
+        try:
+            return workbook.sheet_names()
+        finally:
+            workbook.release_resources()
+    raise ValueError(f"지원하지 않는 파일 형식: {path}")
+
+
+def parse_sheet(path: str, sheet_name: str, out_path: str) -> Tuple[str, str, int]:
+    """
+    시트 하나를 파싱하여 정리된 Cocktail 튜플을 CHUNK_ROWS개씩 out_path에 기록합니다. (워커 프로세스에서 실행)
+    워커가 들고 있는 행은 청크 하나뿐이고, 부모에게는 행 수만 돌려줍니다.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    reader = iter_xlsx_rows if ext == '.xlsx' else iter_xls_rows
+    count = 0
+    chunk = []
+    with open(out_path, 'wb') as f:
+        for row in reader(path, sheet_name):
+            chunk.append(row)
+            if len(chunk) >= CHUNK_ROWS:
+                pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+            count += len(chunk)
+    return path, sheet_name, count
+
+
+def iter_parsed_rows(out_path: str) -> Iterator[tuple]:
+    """parse_sheet가 기록한 임시 파일을 청크 단위로 읽어 한 행씩 돌려줍니다."""
+    with open(out_path, 'rb') as f:
+        while True:
+            try:
+                chunk = pickle.load(f)
+            except EOFError:
+                return
+            yield from chunk
+
+
+def import_catalog(paths: List[str], sheets: Optional[List[str]] = None,
+                   workers: Optional[int] = None) -> Dict[Tuple[str, str], int]:
+    """
+    여러 스프레드시트 파일을 병렬로 파싱하여 Cocktail 테이블에 일괄 저장합니다.
+    저장은 paths / 시트 순서대로 하므로 같은 이름의 칵테일은 나중에 나온 시트의 값이 남습니다.
+
+    Args:
+        paths: .xlsx / .xls 파일 경로 리스트
+        sheets: 가져올 시트 이름 (None이면 모든 시트)
+        workers: 파싱 프로세스 수 (None이면 CPU 수)
+
+    Returns:
+        {(파일, 시트): 저장한 행 수}
+    """
+    tasks = []
+    for path in paths:
+        for sheet_name in list_sheets(path):
+            if sheets is None or sheet_name in sheets:
+                tasks.append((path, sheet_name))
+
+    results = {}
+    if not tasks:
+        return results
+
+    # 저장은 메인 프로세스의 한 연결에서만 수행 (SQLite 동시 쓰기 방지)
+    conn = db_connect()
+    try:
+        with tempfile.TemporaryDirectory(prefix="ktail-import-") as tmp_dir, \
+                ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(parse_sheet, path, sheet_name, os.path.join(tmp_dir, f"{i}.pkl"))
+                for i, (path, sheet_name) in enumerate(tasks)
+            ]
+            # 제출 순서대로 기다림: 앞 시트를 저장하는 동안 뒤 시트는 계속 파싱됨
+            for i, future in enumerate(futures):
+                path, sheet_name, _ = future.result()
+                out_path = os.path.join(tmp_dir, f"{i}.pkl")
+                saved = upsert_cocktails(iter_parsed_rows(out_path), conn)
+                os.remove(out_path)
+                results[(path, sheet_name)] = saved
+                print(f"{os.path.basename(path)} [{sheet_name}]: {saved}개 저장")
+
+        if any(results.values()):
+            print(f"유사도 {refresh_similarity(cursor=conn.cursor())}행 갱신")
+    finally:
+        conn.close()
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="XLSX/XLS 칵테일 메뉴를 DB로 가져옵니다.")
+    parser.add_argument('paths', nargs='+', help=".xlsx / .xls 파일")
+    parser.add_argument('--sheets', nargs='+', default=None, help="가져올 시트 (기본: 전체)")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    results = import_catalog(args.paths, args.sheets, args.workers)
+    print(f"총 {sum(results.values())}개 저장.")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
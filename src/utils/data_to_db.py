@@ -2,52 +2,127 @@
 정제된 csv 데이터를 db에 저장합니다.
 """
 
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
 from src.db.conn import db_connect
+from src.db.cocktail import cocktail_ingredient_replace
+from src.services.similarity import refresh_similarity
 import pandas as pd
 
-def load_csv_to_sqlite(csv_path: str):
-    df = pd.read_csv(csv_path, encoding='utf-8')
-    df.columns = [col.strip() for col in df.columns]
+# 원본 컬럼명 -> Cocktail 테이블 컬럼
+CSV_COLUMNS = {
+    'Cocktail Name': 'name',
+    'Ingredients': 'ingredients',
+    'Garnish': 'garnish',
+    'Glassware': 'glassware',
+    'Preparation': 'preparation',
+    'Price': 'price',
+    'Notes': 'note',
+}
+
+UPSERT_BATCH_SIZE = 500
+
+
+def _text(value):
+    return value.strip() if isinstance(value, str) else None
+
+
+def _price(value):
+    if isinstance(value, str):
+        value = value.replace('$', '').replace(',', '').strip()
+        if not value:
+            return None
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if pd.isna(price) else price
 
-    conn = db_connect()
-    cursor = conn.cursor()
 
+def normalize_cocktail_row(record: dict):
+    """
+    {name, ingredients, garnish, glassware, preparation, price, note} 딕셔너리를
+    Cocktail 테이블 INSERT용 튜플로 정리합니다. 이름이나 재료가 없으면 None.
+    """
+    name_txt = _text(record.get('name'))
+    ingredients_txt = _text(record.get('ingredients'))
+    if not name_txt or not ingredients_txt:
+        return None
 
-    for _, row in df.iterrows():
-        name = row.get('Cocktail Name')
-        ingredients = row.get('Ingredients')
-        garnish = row.get('Garnish')
-        glassware = row.get('Glassware')
-        preparation = row.get('Preparation')
-        price = row.get('Price')
-        note = row.get('Notes')
-
-        name_txt        = name.strip()        if isinstance(name, str)        else None
-        ingredients_txt = ingredients.strip() if isinstance(ingredients, str) else None
-        garnish_txt     = garnish.strip()     if isinstance(garnish, str)     else None
-        glassware_txt   = glassware.strip()   if isinstance(glassware, str)   else None
-        prep_txt        = preparation.strip() if isinstance(preparation, str)  else None
-        note_txt        = note.strip()        if isinstance(note, str)        else None
-        price_val       = float(price)        if pd.notna(price)               else None
-
-        cursor.execute("""
+    return (
+        name_txt,
+        ingredients_txt,
+        _text(record.get('garnish')),
+        _text(record.get('glassware')),
+        _text(record.get('preparation')),
+        _price(record.get('price')),
+        _text(record.get('note')),
+    )
+
+
+def upsert_cocktails(rows, conn=None, batch_size: int = UPSERT_BATCH_SIZE) -> int:
+    """
+    정리된 칵테일 튜플들을 batch_size 단위로 일괄 저장(INSERT OR REPLACE)하고
+    CocktailIngredient 테이블도 함께 갱신합니다.
+
+    Returns:
+        저장한 행 수
+    """
+    own_conn = conn is None
+    conn = conn or db_connect()
+    cursor = conn.cursor()
+    count = 0
+    batch = []
+
+    def flush():
+        cursor.executemany("""
         INSERT OR REPLACE INTO Cocktail
           (name, ingredients, garnish, glassware, preparation, price, note)
         VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            name_txt,
-            ingredients_txt,
-            garnish_txt,
-            glassware_txt,
-            prep_txt,
-            price_val,
-            note_txt
-        ))
+        """, batch)
+        for row in batch:
+            cocktail_ingredient_replace(row[0], row[1], cursor)
+        conn.commit()
+
+    try:
+        for row in rows:
+            if row is None:
+                continue
+            batch.append(row)
+            if len(batch) >= batch_size:
+                flush()
+                count += len(batch)
+                batch = []
+        if batch:
+            flush()
+            count += len(batch)
+    finally:
+        if own_conn:
+            conn.close()
 
-    conn.commit()
-    conn.close()
-    print(f"{len(df)} 저장.")
+    return count
+
+
+def load_csv_to_sqlite(csv_path: str):
+    df = pd.read_csv(csv_path, encoding='utf-8')
+    df.columns = [col.strip() for col in df.columns]
 
+    rows = (
+        normalize_cocktail_row({
+            column: row.get(source)
+            for source, column in CSV_COLUMNS.items()
+        })
+        for _, row in df.iterrows()
+    )
+    saved = upsert_cocktails(rows)
+    print(f"{saved} 저장.")
+    # 조회 쪽(similar_cocktails)은 읽기만 하므로 저장한 뒤 여기서 유사도 테이블을 갱신
+    print(f"유사도 {refresh_similarity()}행 갱신.")
 
 
-load_csv_to_sqlite("../../data/cocktails.csv")
+if __name__ == "__main__":
+    load_csv_to_sqlite("../../data/cocktails.csv")
@@ -0,0 +1,283 @@
+"""
+재료 맛 프로필
+
+재료명(canonical_ingredient 기본 재료명)의 단어를 규칙표에 맞춰 맛 차원별 세기(0~1) 벡터로 바꾸고,
+사용자가 입력한 맛 표현("sweet sour refreshing", "스모키하고 독한")도 같은 공간의 벡터로 바꿉니다.
+칵테일 벡터는 재료 분량(ml 환산)으로 가중 평균합니다. (search_index.FlavorIndex)
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+FLAVOR_DIMS = ('sweet', 'sour', 'bitter', 'strong', 'smoky', 'herbal', 'fruity', 'spicy', 'creamy', 'fizzy')
+
+# 재료명 단어 -> 맛 (브랜드명은 대표 재료로 취급)
+INGREDIENT_FLAVORS: Dict[str, Dict[str, float]] = {
+    # 증류주
+    'gin': {'strong': 1.0, 'herbal': 0.5},
+    'genever': {'strong': 1.0, 'herbal': 0.4},
+    'vodka': {'strong': 1.0},
+    'rum': {'strong': 1.0, 'sweet': 0.2},
+    'cachaca': {'strong': 1.0, 'fruity': 0.2},
+    'pisco': {'strong': 1.0, 'fruity': 0.3},
+    'tequila': {'strong': 1.0, 'herbal': 0.2},
+    'mezcal': {'strong': 1.0, 'smoky': 1.0},
+    'whiskey': {'strong': 1.0, 'sweet': 0.1},
+    'whisky': {'strong': 1.0, 'sweet': 0.1},
+    'bourbon': {'strong': 1.0, 'sweet': 0.2},
+    'rye': {'strong': 1.0, 'spicy': 0.3},
+    'scotch': {'strong': 1.0, 'smoky': 0.5},
+    'islay': {'smoky': 1.0},
+    'malt': {'strong': 0.8},
+    'brandy': {'strong': 1.0, 'fruity': 0.3},
+    'cognac': {'strong': 1.0, 'fruity': 0.3},
+    'hine': {'strong': 1.0, 'fruity': 0.3},
+    'calvados': {'strong': 1.0, 'fruity': 0.5},
+    'armagnac': {'strong': 1.0, 'fruity': 0.3},
+    'absinthe': {'strong': 1.0, 'herbal': 1.0},
+    'glenrothes': {'strong': 1.0, 'sweet': 0.1},
+    'eau': {'strong': 1.0, 'fruity': 0.5},
+    'aquavit': {'strong': 1.0, 'herbal': 0.6},
+    'arrack': {'strong': 1.0, 'sweet': 0.2},
+    'spirit': {'strong': 1.0},
+    # 리큐어 / 아로마타이즈드 와인
+    'liqueur': {'sweet': 0.8, 'strong': 0.3},
+    'maraschino': {'sweet': 0.6, 'fruity': 0.4},
+    'amaretto': {'sweet': 0.8},
+    'triplum': {'sweet': 0.6, 'fruity': 0.6},
+    'curacao': {'sweet': 0.6, 'fruity': 0.6},
+    'cointreau': {'sweet': 0.6, 'fruity': 0.6},
+    'limoncello': {'sweet': 0.8, 'sour': 0.3, 'fruity': 0.5},
+    'falernum': {'sweet': 0.7, 'spicy': 0.4},
+    'benedictine': {'sweet': 0.6, 'herbal': 0.8},
+    'chartreuse': {'herbal': 1.0, 'sweet': 0.4, 'strong': 0.5},
+    'germain': {'sweet': 0.7, 'fruity': 0.5},
+    'elderflower': {'sweet': 0.5, 'fruity': 0.5},
+    'creme': {'sweet': 0.9},
+    'cacao': {'sweet': 0.6, 'creamy': 0.2},
+    'espresso': {'bitter': 0.5, 'sweet': 0.3},
+    'coffee': {'bitter': 0.5},
+    'vermouth': {'herbal': 0.6, 'bitter': 0.3, 'sweet': 0.3},
+    'quina': {'bitter': 0.6, 'herbal': 0.4},
+    'kina': {'bitter': 0.6, 'herbal': 0.4},
+    'lillet': {'sweet': 0.3, 'fruity': 0.4},
+    'americano': {'bitter': 0.6, 'herbal': 0.3},
+    'sherry': {'strong': 0.3},
+    'port': {'sweet': 0.5, 'fruity': 0.4},
+    'pommeau': {'sweet': 0.4, 'fruity': 0.6},
+    'pineau': {'sweet': 0.5, 'fruity': 0.5},
+    'aperitif': {'sweet': 0.3, 'bitter': 0.4, 'herbal': 0.3},
+    'fortified': {'sweet': 0.4, 'strong': 0.4},
+    'wine': {'fruity': 0.4, 'sour': 0.2},
+    'madeira': {'sweet': 0.4, 'strong': 0.3},
+    'drambuie': {'sweet': 0.7, 'herbal': 0.4, 'strong': 0.5},
+    'genepy': {'herbal': 1.0, 'strong': 0.5},
+    # 비터 / 아마로
+    'bitters': {'bitter': 1.0, 'herbal': 0.5},
+    'bitter': {'bitter': 1.0},
+    'campari': {'bitter': 1.0, 'sweet': 0.3},
+    'aperol': {'bitter': 0.6, 'sweet': 0.4, 'fruity': 0.3},
+    'aperitivo': {'bitter': 0.6, 'sweet': 0.3},
+    'amaro': {'bitter': 0.8, 'herbal': 0.6},
+    'fernet': {'bitter': 1.0, 'herbal': 1.0},
+    'cynar': {'bitter': 0.8, 'herbal': 0.5},
+    'classico': {'bitter': 0.7},
+    'punt': {'bitter': 0.5, 'herbal': 0.4},
+    # 감미료
+    'syrup': {'sweet': 1.0},
+    'sugar': {'sweet': 1.0},
+    'honey': {'sweet': 1.0},
+    'agave': {'sweet': 0.9},
+    'nectar': {'sweet': 0.9},
+    'grenadine': {'sweet': 0.9, 'fruity': 0.5},
+    'orgeat': {'sweet': 0.9, 'creamy': 0.3},
+    'demerara': {'sweet': 1.0},
+    'gomme': {'sweet': 1.0},
+    'gum': {'sweet': 1.0},
+    'cordial': {'sweet': 0.8, 'fruity': 0.4},
+    # 산미 / 과일
+    'lemon': {'sour': 1.0, 'fruity': 0.3},
+    'lime': {'sour': 1.0, 'fruity': 0.3},
+    'grapefruit': {'sour': 0.7, 'bitter': 0.3, 'fruity': 0.5},
+    'citrus': {'sour': 0.8},
+    'yuzu': {'sour': 0.9, 'fruity': 0.4},
+    'orange': {'fruity': 0.8, 'sweet': 0.3, 'sour': 0.2},
+    'pineapple': {'fruity': 1.0, 'sweet': 0.5, 'sour': 0.3},
+    'cranberry': {'fruity': 0.8, 'sour': 0.5},
+    'pomegranate': {'fruity': 0.8, 'sour': 0.3},
+    'cherry': {'fruity': 0.9, 'sweet': 0.3},
+    'apricot': {'fruity': 0.9, 'sweet': 0.3},
+    'peach': {'fruity': 0.9, 'sweet': 0.4},
+    'apple': {'fruity': 0.8, 'sour': 0.2},
+    'pear': {'fruity': 0.8},
+    'banana': {'fruity': 0.8, 'sweet': 0.4},
+    'banane': {'fruity': 0.8, 'sweet': 0.4},
+    'passion': {'fruity': 1.0, 'sour': 0.4},
+    'mango': {'fruity': 1.0, 'sweet': 0.4},
+    'berry': {'fruity': 0.9},
+    'raspberries': {'fruity': 0.9, 'sour': 0.2},
+    'raspberry': {'fruity': 0.9, 'sour': 0.2},
+    'strawberry': {'fruity': 0.9, 'sweet': 0.3},
+    'blackberry': {'fruity': 0.9},
+    'watermelon': {'fruity': 0.9},
+    'melon': {'fruity': 0.9, 'sweet': 0.3},
+    'grape': {'fruity': 0.8, 'sweet': 0.3},
+    'plum': {'fruity': 0.8, 'sour': 0.2},
+    'lychee': {'fruity': 0.9, 'sweet': 0.3},
+    'guava': {'fruity': 0.9, 'sweet': 0.3},
+    'kiwi': {'fruity': 0.8, 'sour': 0.3},
+    'kumquat': {'fruity': 0.6, 'sour': 0.6},
+    'tomato': {'sour': 0.3, 'fruity': 0.2},
+    'cucumber': {'herbal': 0.4},
+    'violettes': {'sweet': 0.6, 'herbal': 0.3},
+    # 허브 / 향신료
+    'mint': {'herbal': 1.0},
+    'basil': {'herbal': 1.0},
+    'thyme': {'herbal': 1.0},
+    'rosemary': {'herbal': 1.0},
+    'sage': {'herbal': 1.0},
+    'celery': {'herbal': 0.8},
+    'hibiscus': {'fruity': 0.5, 'sour': 0.3},
+    'tea': {'herbal': 0.5, 'bitter': 0.3},
+    'ginger': {'spicy': 1.0},
+    'pepper': {'spicy': 1.0},
+    'chili': {'spicy': 1.0},
+    'jalapeno': {'spicy': 1.0},
+    'cinnamon': {'spicy': 0.7, 'sweet': 0.3},
+    'allspice': {'spicy': 0.8},
+    'mole': {'spicy': 0.6, 'bitter': 0.4},
+    'clove': {'spicy': 0.8},
+    'nutmeg': {'spicy': 0.6},
+    'cardamom': {'spicy': 0.6, 'herbal': 0.3},
+    'anise': {'herbal': 0.8, 'sweet': 0.2},
+    'vanilla': {'sweet': 0.6, 'creamy': 0.2},
+    'smoked': {'smoky': 1.0},
+    'smoke': {'smoky': 1.0},
+    'lapsang': {'smoky': 1.0},
+    # 크림 / 탄산
+    'cream': {'creamy': 1.0, 'sweet': 0.2},
+    'milk': {'creamy': 0.9},
+    'egg': {'creamy': 0.8},
+    'coconut': {'creamy': 0.6, 'sweet': 0.4, 'fruity': 0.3},
+    'chocolate': {'sweet': 0.4, 'bitter': 0.4},
+    'soda': {'fizzy': 1.0},
+    'tonic': {'fizzy': 1.0, 'bitter': 0.4},
+    'sparkling': {'fizzy': 1.0},
+    'champagne': {'fizzy': 1.0, 'fruity': 0.3},
+    'prosecco': {'fizzy': 1.0, 'fruity': 0.3},
+    'cava': {'fizzy': 1.0},
+    'beer': {'fizzy': 0.8},
+    'ale': {'fizzy': 0.8},
+    'cider': {'fizzy': 0.5, 'fruity': 0.6},
+    'mineral': {'fizzy': 0.8},
+    'cola': {'fizzy': 1.0, 'sweet': 0.6},
+}
+
+# 맛 표현 -> 맛 벡터 (한국어는 어간으로 등록, "달콤한" 처럼 어미가 붙어도 앞부분으로 찾음)
+TASTE_WORDS: Dict[str, Dict[str, float]] = {
+    'sweet': {'sweet': 1.0},
+    'sour': {'sour': 1.0},
+    'tart': {'sour': 1.0},
+    'citrusy': {'sour': 0.8, 'fruity': 0.5},
+    'bitter': {'bitter': 1.0},
+    'strong': {'strong': 1.0},
+    'boozy': {'strong': 1.0},
+    'dry': {'strong': 0.6, 'bitter': 0.4},
+    'smoky': {'smoky': 1.0},
+    'herbal': {'herbal': 1.0},
+    'fresh': {'herbal': 0.5, 'sour': 0.5},
+    'fruity': {'fruity': 1.0},
+    'tropical': {'fruity': 1.0, 'sweet': 0.5},
+    'spicy': {'spicy': 1.0},
+    'creamy': {'creamy': 1.0},
+    'rich': {'creamy': 0.6, 'sweet': 0.4},
+    'fizzy': {'fizzy': 1.0},
+    'bubbly': {'fizzy': 1.0},
+    'sparkling': {'fizzy': 1.0},
+    'light': {'fizzy': 0.6, 'sour': 0.3},
+    'refreshing': {'sour': 0.6, 'fizzy': 0.6, 'fruity': 0.3, 'herbal': 0.3},
+    '달콤': {'sweet': 1.0},
+    '달달': {'sweet': 1.0},
+    '단맛': {'sweet': 1.0},
+    '새콤': {'sour': 1.0},
+    '상큼': {'sour': 0.7, 'fruity': 0.5},
+    '신맛': {'sour': 1.0},
+    '쌉쌀': {'bitter': 1.0},
+    '씁쓸': {'bitter': 1.0},
+    '쓴맛': {'bitter': 1.0},
+    '독한': {'strong': 1.0},
+    '강한': {'strong': 1.0},
+    '도수': {'strong': 1.0},
+    '스모키': {'smoky': 1.0},
+    '훈연': {'smoky': 1.0},
+    '허브': {'herbal': 1.0},
+    '과일': {'fruity': 1.0},
+    '프루티': {'fruity': 1.0},
+    '매콤': {'spicy': 1.0},
+    '매운': {'spicy': 1.0},
+    '크리미': {'creamy': 1.0},
+    '부드러운': {'creamy': 0.7, 'sweet': 0.3},
+    '탄산': {'fizzy': 1.0},
+    '청량': {'fizzy': 0.7, 'sour': 0.5},
+    '시원': {'fizzy': 0.6, 'sour': 0.5, 'herbal': 0.3},
+}
+
+# 단위 -> ml 환산 (가중치용 대략값)
+UNIT_ML = {
+    'oz': 30, 'ml': 1, 'cl': 10, 'l': 1000, 'part': 30, 'parts': 30,
+    'dash': 1, 'dashes': 1, 'drop': 0.05, 'drops': 0.05, 'bsp': 5, 'spoon': 5,
+    'tsp': 5, 'tbsp': 15, 'cup': 240, 'cups': 240, 'c': 240, 'splash': 7,
+    'float': 15, 'rinse': 2, 'mist': 1, 'top': 60, 'fill': 90, 'pinch': 0.5,
+    'scoop': 60, 'scoops': 60,
+}
+# 단위를 알 수 없거나 수량이 없는 재료 (가니시성 재료 등)
+DEFAULT_ML = 5
+
+_WORD_RE = re.compile(r'\w+')
+_KOREAN_STEMS = sorted((w for w in TASTE_WORDS if not w.isascii()), key=len, reverse=True)
+_DIM_INDEX = {dim: i for i, dim in enumerate(FLAVOR_DIMS)}
+
+
+def _vector(flavors: Dict[str, float]) -> np.ndarray:
+    vector = np.zeros(len(FLAVOR_DIMS))
+    for dim, value in flavors.items():
+        vector[_DIM_INDEX[dim]] += value
+    return vector
+
+
+@lru_cache(maxsize=8192)
+def ingredient_profile(key: str) -> Tuple[float, ...]:
+    """재료 키의 맛 벡터 (차원별 0~1, 규칙에 없는 재료는 0 벡터)"""
+    vector = np.zeros(len(FLAVOR_DIMS))
+    for word in _WORD_RE.findall(key):
+        flavors = INGREDIENT_FLAVORS.get(word)
+        if flavors:
+            vector += _vector(flavors)
+    return tuple(np.minimum(vector, 1.0))
+
+
+def amount_ml(amount: Optional[float], unit: Optional[str]) -> float:
+    """재료 분량을 대략적인 ml로 환산합니다. (가중 평균용)"""
+    if unit in UNIT_ML:
+        return (amount if amount else 1.0) * UNIT_ML[unit]
+    return DEFAULT_ML
+
+
+def taste_vector(text: str) -> Optional[np.ndarray]:
+    """
+    맛 표현(영어/한국어)과 재료 단어를 맛 벡터로 바꿉니다.
+    알아볼 수 있는 단어가 없으면 None.
+    """
+    vector = np.zeros(len(FLAVOR_DIMS))
+    for word in _WORD_RE.findall(text.lower()):
+        flavors = TASTE_WORDS.get(word)
+        if flavors is None and not word.isascii():
+            flavors = next((TASTE_WORDS[stem] for stem in _KOREAN_STEMS if word.startswith(stem)), None)
+        if flavors is not None:
+            vector += _vector(flavors)
+        else:
+            vector += np.array(ingredient_profile(word))
+    return vector if vector.any() else None
@@ -0,0 +1,250 @@
+"""
+재료 정규화 (canonicalization)
+
+"2 oz Junipero Gin", "1.5 oz Gin", "Gin" 처럼 수량/단위/상표만 다른 재료 문자열을
+같은 기본 재료("gin")로 모읍니다. 분석 모듈, 검색 인덱스, 유사도 작업이 같은 함수를 사용합니다.
+
+    1. 수량, 단위, 괄호 메모 제거 (ingredient_parser.parse_ingredient)
+    2. 소문자, 악센트/아포스트로피 제거, 구두점과 숫자는 공백으로
+    3. fresh / muddled / sliced 같은 수식어, 손질 표현 제거 (남는 것이 없으면 재료가 아님 -> None)
+    4. 조회표(상표/제품명/재료명, 과일/허브 등 맛 재료, 머리 명사)에서 가장 오른쪽 항목을 핵심 명사로 봄
+       (영어 재료명은 핵심 명사가 뒤에 오므로 "Luxardo ... Cherry Liqueur" -> "cherry liqueur")
+    5. 핵심 명사가 syrup / juice / soda / twist 같은 머리 명사(HEAD_NOUNS)이면 바로 앞 항목을 수식어로 붙임
+       ("Tonic Syrup" -> "tonic syrup", "Grapefruit Soda" -> "grapefruit soda", "Orange Twist" -> "orange peel")
+       "Orange Blossom Water" 처럼 수식어와 묶여 다른 재료가 되는 표현은 조회표에 통째로 둡니다.
+    조회표에 걸리는 항목이 없으면 2~3단계까지 정리한 문자열을 그대로 씁니다.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Optional
+
+from .ingredient_parser import parse_ingredient
+
+# 재료를 구분하지 않는 수식어, 손질/분량 표현
+MODIFIER_WORDS = {
+    'fresh', 'freshly', 'squeezed', 'pressed', 'house', 'made', 'housemade', 'homemade',
+    'organic', 'chilled', 'cold', 'large', 'small', 'batch', 'premium', 'rich', 'muddled',
+    'juiced', 'zested', 'grated', 'cored', 'chopped', 'sliced', 'crushed', 'torched', 'toasted',
+    'roasted', 'dehydrated', 'drained', 'finely', 'whole', 'half', 'medium', 'big', 'handful',
+    'pinch', 'pieces', 'chunks', 'strip', 'cube', 'cubes', 'stick', 'pkg', 'packages', 'bsp',
+    'leaf', 'leaves', 'sprig', 'sprigs', 'seedless', 'good', 'quality', 'assorted',
+    'the', 'a', 'of', 'w', 'no',
+}
+
+# 조회표: 정규화한 표현 -> 기본 재료
+# 같은 위치에서는 긴 표현이 먼저 맞으므로 "ginger beer"는 "ginger"나 "beer"보다 우선합니다.
+# 과일/허브/향신료처럼 머리 명사의 수식어가 될 수 있는 재료는 FLAVOR_TERMS에 둡니다.
+CANONICAL_TERMS = {
+    # 진
+    'gin': 'gin', 'london dry gin': 'gin', 'old tom gin': 'gin', 'genever': 'gin',
+    'junipero': 'gin', 'tanqueray': 'gin', 'beefeater': 'gin', 'hendricks': 'gin',
+    'plymouth': 'gin', 'genevieve': 'gin', 'hotaling': 'gin',
+    # 보드카
+    'vodka': 'vodka', 'karlssons': 'vodka', 'hophead': 'vodka', 'titos': 'vodka',
+    'grey goose': 'vodka', 'absolut': 'vodka', 'ketel one': 'vodka',
+    # 럼 / 카샤사
+    'rum': 'rum', 'rhum': 'rum', 'rhum agricole': 'rum', 'pink pigeon': 'rum',
+    'english harbour': 'rum', 'bacardi': 'rum', 'plantation': 'rum', 'appleton': 'rum',
+    'smith cross': 'rum', 'arrack': 'arrack',
+    'cachaca': 'cachaca', 'ypioca': 'cachaca',
+    # 아가베
+    'tequila': 'tequila', 'chinaco': 'tequila', 'patron': 'tequila', 'espolon': 'tequila',
+    'mezcal': 'mezcal', 'del maguey': 'mezcal',
+    # 위스키
+    'whiskey': 'whiskey', 'whisky': 'whiskey', 'bourbon': 'bourbon', 'hirsch': 'bourbon',
+    'rye': 'rye whiskey', 'rye whiskey': 'rye whiskey', 'old potrero': 'rye whiskey',
+    'rittenhouse': 'rye whiskey', 'scotch': 'scotch', 'single malt': 'scotch',
+    'glenrothes': 'scotch', 'laphroaig': 'scotch', 'nikka': 'whiskey', 'jameson': 'whiskey',
+    'jack daniels': 'whiskey', 'woodford reserve': 'bourbon', 'ardbeg': 'scotch', 'compass box': 'scotch',
+    # 브랜디
+    'brandy': 'brandy', 'cognac': 'cognac', 'h by hine': 'cognac', 'hine': 'cognac', 'armagnac': 'brandy',
+    'calvados': 'calvados', 'applejack': 'calvados', 'lairds': 'calvados',
+    'chateau de montifaud': 'cognac', 'kirsch': 'eau de vie', 'slivovitz': 'eau de vie', 'mirabelle': 'eau de vie',
+    'aquavit': 'aquavit', 'everclear': 'neutral spirit', 'pisco': 'pisco', 'barsol': 'pisco',
+    'eau de vie': 'eau de vie', 'pineau des charentes': 'fortified wine',
+    'pommeau': 'fortified wine',
+    # 와인 / 맥주 / 사케
+    'sherry': 'sherry', 'fino': 'sherry', 'manzanilla': 'sherry', 'amontillado': 'sherry',
+    'oloroso': 'sherry', 'pedro ximenez': 'sherry', 'port': 'port', 'madeira': 'madeira',
+    'champagne': 'sparkling wine', 'prosecco': 'sparkling wine', 'cava': 'sparkling wine',
+    'sparkling wine': 'sparkling wine', 'cremant': 'sparkling wine',
+    'wine': 'wine', 'red wine': 'wine', 'white wine': 'wine',
+    'riesling': 'wine', 'gruner veltliner': 'wine', 'zin': 'wine', 'pinot noir': 'wine', 'sauternes': 'wine',
+    'moscato': 'wine', 'brachetto': 'wine', 'sparkling': 'sparkling wine', 'east india solera': 'sherry',
+    'beer': 'beer', 'ale': 'beer', 'lager': 'beer', 'stout': 'beer', 'porter': 'beer', 'ipa': 'beer',
+    'sake': 'sake',
+    # 베르무트 / 아페리티프
+    'vermouth': 'vermouth', 'dry vermouth': 'dry vermouth', 'sweet vermouth': 'sweet vermouth',
+    'vermouth di torino': 'sweet vermouth', 'vermouth rosso': 'sweet vermouth',
+    'rosso vermouth': 'sweet vermouth', 'punt e mes': 'sweet vermouth',
+    'carpano antica': 'sweet vermouth', 'vermouth bianco': 'blanc vermouth',
+    'blanc vermouth': 'blanc vermouth', 'dolin blanc': 'blanc vermouth', 'bianco vermouth': 'blanc vermouth',
+    'lillet': 'aperitif wine', 'cocchi americano': 'aperitif wine', 'kina': 'aperitif wine',
+    'quina': 'aperitif wine', 'dubonnet': 'aperitif wine', 'byrrh': 'aperitif wine',
+    'bonal': 'aperitif wine', 'chinato': 'aperitif wine', 'gentiane': 'aperitif wine',
+    # 리큐어
+    'maraschino': 'maraschino liqueur', 'maraschino liqueur': 'maraschino liqueur',
+    'cherry liqueur': 'cherry liqueur', 'cherry heering': 'cherry liqueur',
+    'cherry herring': 'cherry liqueur', 'sangue morlacco': 'cherry liqueur',
+    'ginger liqueur': 'ginger liqueur', 'kings ginger': 'ginger liqueur', 'apricot liqueur': 'apricot liqueur',
+    'elderflower liqueur': 'elderflower liqueur', 'st germain': 'elderflower liqueur',
+    'st germaine': 'elderflower liqueur', 'triple sec': 'orange liqueur',
+    'cointreau': 'orange liqueur', 'triplum': 'orange liqueur', 'curacao': 'orange liqueur',
+    'grand marnier': 'orange liqueur', 'mandarine napoleon': 'orange liqueur', 'orange liqueur': 'orange liqueur',
+    'coffee liqueur': 'coffee liqueur', 'kahlua': 'coffee liqueur', 'espresso liqueur': 'coffee liqueur',
+    'espresso italian liqueur': 'coffee liqueur', 'amaretto': 'amaretto', 'limoncello': 'limoncello',
+    'creme de cassis': 'creme de cassis', 'creme de banane': 'banana liqueur',
+    'creme de cacao': 'creme de cacao', 'creme de menthe': 'creme de menthe',
+    'creme de mure': 'berry liqueur', 'creme de framboise': 'berry liqueur', 'creme de peche': 'peach liqueur',
+    'creme de violette': 'violet liqueur', 'liqueur de violettes': 'violet liqueur',
+    'chartreuse': 'chartreuse', 'benedictine': 'benedictine', 'drambuie': 'drambuie',
+    'falernum': 'falernum', 'allspice dram': 'allspice dram', 'absinthe': 'absinthe',
+    'pastis': 'absinthe', 'herbsaint': 'absinthe', 'genepy': 'genepy', 'strega': 'herbal liqueur',
+    'pimms': 'liqueur', 'tuaca': 'liqueur', 'ancho reyes': 'chili liqueur', 'sambuca': 'anise liqueur',
+    'anisette': 'anise liqueur', 'anis': 'anise liqueur', 'pamplemousse': 'grapefruit liqueur',
+    'banane': 'banana liqueur', 'abricot': 'apricot liqueur', 'creme de noyaux': 'almond liqueur',
+    'noyeau': 'almond liqueur', 'nocino': 'walnut liqueur', 'angioletto': 'hazelnut liqueur',
+    'creme yvette': 'violet liqueur', 'shrubb': 'orange liqueur', 'fragoli': 'berry liqueur',
+    # 쌉쌀한 리큐어
+    'amaro': 'amaro', 'amer picon': 'amaro', 'fernet': 'amaro', 'cynar': 'amaro', 'averna': 'amaro', 'montenegro': 'amaro',
+    'calisaya': 'amaro', 'cardamaro': 'amaro', 'amargo': 'amaro', 'branca menta': 'amaro',
+    'campari': 'campari', 'aperol': 'aperol', 'aperitivo': 'bitter aperitivo',
+    'bitter': 'bitter aperitivo', 'bitter bianco': 'bitter aperitivo', 'gran classico': 'bitter aperitivo',
+    # 비터스
+    'bitters': 'bitters', 'angostura': 'aromatic bitters', 'angostura bitters': 'aromatic bitters',
+    'aromatic bitters': 'aromatic bitters', 'peychauds': 'peychauds bitters',
+    'peychauds bitters': 'peychauds bitters', 'orange bitters': 'orange bitters',
+    'chocolate bitters': 'chocolate bitters', 'mole bitters': 'chocolate bitters',
+    'celery bitters': 'celery bitters', 'grapefruit bitters': 'grapefruit bitters',
+    'lemon bitters': 'lemon bitters', 'tincture': 'tincture',
+    # 시럽 / 감미료
+    'simple': 'simple syrup', 'simple syrup': 'simple syrup', 'sugar syrup': 'simple syrup',
+    'cane syrup': 'simple syrup', 'gum syrup': 'simple syrup', 'gomme': 'simple syrup',
+    'demerara syrup': 'demerara syrup', 'brown sugar syrup': 'demerara syrup', 'honey syrup': 'honey syrup', 'honey': 'honey',
+    'agave': 'agave syrup', 'agave nectar': 'agave syrup', 'agave syrup': 'agave syrup',
+    'maple syrup': 'maple syrup', 'grenadine': 'grenadine', 'orgeat': 'orgeat',
+    'orgeat syrup': 'orgeat', 'cinnamon syrup': 'cinnamon syrup', 'ginger syrup': 'ginger syrup',
+    'pineapple gum syrup': 'pineapple syrup', 'pineapple gomme syrup': 'pineapple syrup',
+    'pineapple syrup': 'pineapple syrup', 'pineapple gum': 'pineapple syrup', 'elderflower syrup': 'elderflower syrup',
+    'sugar': 'sugar', 'brown sugar': 'sugar', 'sugar cube': 'sugar', 'cordial': 'cordial',
+    'shrub': 'shrub', 'sweet n sour': 'sour mix', 'sweet n sour mix': 'sour mix',
+    # 주스 / 과일
+    'lemon juice': 'lemon juice', 'lime juice': 'lime juice', 'orange juice': 'orange juice',
+    'grapefruit juice': 'grapefruit juice', 'pineapple juice': 'pineapple juice',
+    'cranberry juice': 'cranberry juice', 'apple juice': 'apple juice',
+    'pomegranate juice': 'pomegranate juice', 'puree': 'fruit puree', 'sorbet': 'sorbet',
+    # 탄산 / 물
+    'soda water': 'soda water', 'club soda': 'soda water', 'cream soda': 'cream soda',
+    'sparkling water': 'soda water', 'mineral water': 'soda water', 'seltzer': 'soda water',
+    'tonic': 'tonic water', 'tonic water': 'tonic water', 'tonic syrup': 'tonic syrup', 'ginger beer': 'ginger beer',
+    'ginger brew': 'ginger beer', 'ginger ale': 'ginger ale', 'cola': 'cola', 'lemonade': 'lemonade',
+    'water': 'water', 'orange blossom water': 'orange flower water', 'orange flower water': 'orange flower water',
+    'rose water': 'rose water', 'rosewater': 'rose water', 'coconut water': 'coconut water',
+    'hot water': 'water', 'cider': 'cider', 'apple cider': 'cider',
+    # 유제품 / 달걀
+    'egg': 'egg', 'whole egg': 'egg', 'egg white': 'egg white', 'egg yolk': 'egg yolk',
+    'cream': 'cream', 'heavy cream': 'cream', 'milk': 'milk', 'coconut milk': 'coconut milk',
+    'coconut cream': 'coconut cream', 'cream of coconut': 'coconut cream',
+    # 기타
+    'ice': 'ice', 'olive brine': 'olive brine', 'pickle brine': 'olive brine', 'coffee': 'coffee',
+    'espresso': 'coffee', 'tea': 'tea', 'earl grey': 'tea', 'salt': 'salt',
+}
+
+# 과일 / 허브 / 향신료: 혼자 쓰이면 그 재료, 머리 명사 앞에서는 수식어 ("cherry" + "syrup" -> "cherry syrup")
+FLAVOR_TERMS = {
+    'lemon': 'lemon', 'lemons': 'lemon', 'lime': 'lime', 'limes': 'lime', 'orange': 'orange',
+    'satsuma': 'orange', 'grapefruit': 'grapefruit', 'yuzu': 'yuzu', 'kalamansi': 'kalamansi',
+    'cherry': 'cherry', 'cherries': 'cherry', 'raspberry': 'raspberry', 'raspberries': 'raspberry',
+    'strawberry': 'strawberry', 'strawberries': 'strawberry', 'blackberry': 'blackberry',
+    'blackberries': 'blackberry', 'cranberry': 'cranberry', 'cranberries': 'cranberry',
+    'gooseberry': 'gooseberry', 'passion fruit': 'passion fruit', 'watermelon': 'watermelon',
+    'cantaloupe': 'melon', 'melon': 'melon', 'pear': 'pear', 'peach': 'peach', 'apricot': 'apricot',
+    'mango': 'mango', 'lychee': 'lychee', 'pineapple': 'pineapple', 'pinapple': 'pineapple',
+    'pomegranate': 'pomegranate', 'grape': 'grape', 'grapes': 'grape', 'plum': 'plum', 'apple': 'apple',
+    'kiwi': 'kiwi', 'kumquat': 'kumquat', 'kumquats': 'kumquat', 'banana': 'banana', 'guava': 'guava',
+    'fig': 'fig', 'coconut': 'coconut', 'rhubarb': 'rhubarb', 'tomato': 'tomato', 'tomatoes': 'tomato',
+    'carrot': 'carrot', 'cucumber': 'cucumber', 'cucumbers': 'cucumber', 'celery': 'celery',
+    'olive': 'olive', 'olives': 'olive', 'potato': 'potato', 'jalapeno': 'jalapeno', 'chili': 'chili',
+    'pepperoncini': 'chili', 'pepper': 'pepper', 'peppercorns': 'pepper', 'vanilla': 'vanilla', 'cardamom': 'cardamom',
+    'lavender': 'lavender', 'lavander': 'lavender', 'hibiscus': 'hibiscus', 'cinnamon': 'cinnamon',
+    'nutmeg': 'nutmeg', 'clove': 'clove', 'cloves': 'clove', 'star anise': 'star anise',
+    'allspice': 'allspice', 'ginger': 'ginger', 'ginger root': 'ginger', 'pistachio': 'pistachio',
+    'pecan': 'pecan', 'almond': 'almond', 'walnut': 'walnut', 'peanut': 'peanut', 'chocolate': 'chocolate',
+    'cacao': 'chocolate', 'cocao': 'chocolate', 'mint': 'mint', 'basil': 'basil', 'sage': 'sage',
+    'rosemary': 'rosemary', 'thyme': 'thyme', 'elderflower': 'elderflower', 'elder flower': 'elderflower', 'dill': 'dill', 'cilantro': 'cilantro', 'tarragon': 'tarragon',
+}
+
+# 머리 명사: (앞에 맛 재료가 있을 때의 형식, 없을 때의 기본 재료)
+# 기본 재료가 None이면 맛 재료 없이는 재료로 보지 않습니다. ("slice" -> None)
+HEAD_NOUNS = {
+    'syrup': ('{} syrup', 'syrup'), 'syrups': ('{} syrup', 'syrup'),
+    'juice': ('{} juice', 'juice'), 'nectar': ('{} juice', 'juice'),
+    'soda': ('{} soda', 'soda water'),
+    'liqueur': ('{} liqueur', 'liqueur'), 'liquor': ('{} liqueur', 'liqueur'),
+    'licor': ('{} liqueur', 'liqueur'), 'schnapps': ('{} liqueur', 'liqueur'),
+    'jam': ('{} jam', 'jam'), 'marmalade': ('{} jam', 'jam'), 'preserves': ('{} jam', 'jam'),
+    'twist': ('{} peel', 'citrus peel'), 'peel': ('{} peel', 'citrus peel'), 'zest': ('{} peel', 'citrus peel'),
+    'swath': ('{} peel', 'citrus peel'), 'coin': ('{} peel', 'citrus peel'),
+    'wheel': ('{}', None), 'wheels': ('{}', None), 'slice': ('{}', None), 'slices': ('{}', None),
+    'wedge': ('{}', None), 'wedges': ('{}', None),
+}
+
+# 맛 재료 외에 머리 명사의 수식어가 되는 조회표 항목 ("tonic" + "bitters"는 bitters 그대로)
+HEAD_MODIFIERS = {
+    'tonic': 'tonic', 'honey': 'honey', 'coffee': 'coffee', 'espresso': 'coffee', 'tea': 'tea',
+    'earl grey': 'tea', 'cola': 'cola',
+}
+
+_SEPARATOR_RE = re.compile(r"[^a-z0-9가-힣]+")
+_DIGITS_RE = re.compile(r"\b\d+\b")
+_TERMS = {**FLAVOR_TERMS, **CANONICAL_TERMS}
+_TERMS_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(term) for term in sorted({*_TERMS, *HEAD_NOUNS}, key=len, reverse=True)) + r")\b"
+)
+
+
+def normalize_ingredient_name(name: str) -> str:
+    """소문자, 악센트/아포스트로피 제거, 구두점과 숫자 제거, 수식어 제거"""
+    text = unicodedata.normalize('NFKD', name.lower())
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.replace("'", '').replace('’', '')
+    text = _DIGITS_RE.sub(' ', _SEPARATOR_RE.sub(' ', text))
+    return ' '.join(word for word in text.split() if word not in MODIFIER_WORDS)
+
+
+def _modifier(term: str) -> Optional[str]:
+    return FLAVOR_TERMS.get(term) or HEAD_MODIFIERS.get(term)
+
+
+@lru_cache(maxsize=None)
+def canonical_ingredient(raw: str) -> Optional[str]:
+    """
+    재료 문자열("2 oz Junipero Gin*")을 기본 재료명("gin")으로 바꿉니다.
+    수량이 붙은 원문과 파싱된 재료명 모두 받을 수 있습니다.
+    수식어/손질 표현만 있는 항목("muddled", "1", 빈 문자열)은 재료가 아니므로 None을 반환합니다.
+    """
+    name = normalize_ingredient_name(parse_ingredient(raw).ingredient) if raw and raw.strip() else ''
+    if not name:
+        return None
+
+    matches = _TERMS_RE.findall(name)
+    if not matches:
+        return name
+    head = matches[-1]
+    if head not in HEAD_NOUNS:
+        return _TERMS[head]
+
+    # 머리 명사: 바로 앞 항목이 맛 재료이면 수식어로 붙이고,
+    # 같은 머리 명사로 끝나는 재료("curacao" -> "orange liqueur")이면 그 재료를 씀
+    pattern, default = HEAD_NOUNS[head]
+    if len(matches) > 1:
+        previous = matches[-2]
+        modifier = _modifier(previous)
+        if modifier:
+            return pattern.format(modifier)
+        canonical = _TERMS.get(previous)
+        if default and canonical and canonical.endswith(default.split()[-1]):
+            return canonical
+    return default
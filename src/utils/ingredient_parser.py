@@ -0,0 +1,136 @@
+"""
+재료 문자열 파서
+
+"1.5 oz Mezcal, 1 oz Hibiscus Simple Syrup*, .5 oz Lime Juice" 형태의 재료 문자열을
+(순서, 수량, 단위, 원문, 재료명) 단위로 분리합니다.
+수입(import) 시 한 번만 파싱하여 CocktailIngredient 테이블에 저장하는 용도입니다.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+
+
+class ParsedIngredient(NamedTuple):
+    position: int
+    amount: Optional[float]
+    unit: Optional[str]
+    raw: str
+    ingredient: str
+
+
+# 수량 뒤에 올 수 있는 단위 (소문자 기준)
+UNITS = {
+    'oz', 'ml', 'cl', 'l', 'part', 'parts', 'dash', 'dashes', 'drop', 'drops',
+    'bsp', 'tsp', 'tbsp', 'cup', 'cups', 'c', 'splash', 'float', 'pinch',
+    'scoop', 'scoops', 'bottle', 'bottles', 'piece', 'pieces', 'pc', 'slice',
+    'slices', 'sprig', 'sprigs', 'leaf', 'leaves', 'cube', 'cubes', 'count',
+    'whole', 'spoon', 'inch', 'disc', 'stick', 'rinse', 'top', 'mist', 'fill',
+}
+
+# 수량 없이 쓰이는 단위 (예: "top Soda Water", "mist Laphroaig", "oz Ginger snaps")
+BARE_UNITS = {'top', 'mist', 'rinse', 'float', 'splash', 'fill', 'dash', 'pinch', 'oz', 'ml'}
+
+_AMOUNT_RE = re.compile(
+    r'^(?P<amount>\d+\s+\d+/\d+|\d+/\d+|\d*\.\d+|\d+)'
+    r'(?:\s*-\s*(?:\d*\.\d+|\d+))?'
+    r'\s*'
+)
+_WORD_RE = re.compile(r'^(?P<word>[A-Za-z]+)\.?(?:\s+|$)')
+_PAREN_RE = re.compile(r'\([^)]*\)')
+_SPACE_RE = re.compile(r'\s+')
+
+# CocktailService 검색용 정리 규칙 (기존 _clean_ingredients 와 동일)
+_CLEAN_AMOUNT_RE = re.compile(r'\d+\.?\d*\s*(oz|ml|dash|drops?|cup|tsp|tbsp)')
+_CLEAN_SYMBOL_RE = re.compile(r'[,\n\r\*\-\+\(\)]')
+
+
+def split_ingredients(text: str) -> List[str]:
+    """괄호 안의 쉼표는 무시하고 재료 문자열을 쉼표 기준으로 나눕니다."""
+    if not text:
+        return []
+
+    parts = []
+    depth = 0
+    start = 0
+    for i, ch in enumerate(text):
+        if ch == '(':
+            depth += 1
+        elif ch == ')' and depth:
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _parse_amount(token: str) -> Optional[float]:
+    """"1 1/2", "3/4", ".75", "2" 형태의 수량을 float로 변환합니다."""
+    token = token.strip()
+    try:
+        if ' ' in token:
+            whole, frac = token.split(None, 1)
+            num, den = frac.split('/')
+            return float(whole) + float(num) / float(den)
+        if '/' in token:
+            num, den = token.split('/')
+            return float(num) / float(den)
+        return float(token)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def parse_ingredient(raw: str, position: int = 0) -> ParsedIngredient:
+    """재료 한 개("1.5 oz Mezcal")를 수량/단위/재료명으로 분리합니다."""
+    raw = raw.strip()
+    rest = raw
+    amount = None
+    unit = None
+
+    m = _AMOUNT_RE.match(rest)
+    if m:
+        amount = _parse_amount(m.group('amount'))
+        rest = rest[m.end():]
+
+    w = _WORD_RE.match(rest)
+    if w:
+        word = w.group('word').lower()
+        if (amount is not None and word in UNITS) or (amount is None and word in BARE_UNITS):
+            unit = word
+            rest = rest[w.end():]
+
+    ingredient = _PAREN_RE.sub(' ', rest).replace('*', ' ')
+    ingredient = _SPACE_RE.sub(' ', ingredient).strip(' .')
+    if not ingredient:
+        ingredient = raw
+
+    return ParsedIngredient(position, amount, unit, raw, ingredient)
+
+
+def parse_ingredients(text: str) -> List[ParsedIngredient]:
+    """재료 문자열 전체를 ParsedIngredient 리스트로 변환합니다."""
+    return [parse_ingredient(raw, position) for position, raw in enumerate(split_ingredients(text))]
+
+
+def ingredient_label(raw: str) -> str:
+    """분석 모듈에서 사용하던 재료 키 (괄호 앞부분)를 반환합니다."""
+    return raw.split('(')[0].strip()
+
+
+def ingredient_key(ingredient: str) -> str:
+    """파싱된 재료명을 칵테일 간 비교용 키로 만듭니다. (유사도, 재고 조회 공용)"""
+    return ingredient.strip().lower()
+
+
+@lru_cache(maxsize=4096)
+def clean_ingredient_text(ingredients: str) -> str:
+    """검색용으로 수량과 기호를 제거하고 소문자로 정리한 문자열을 반환합니다."""
+    if not ingredients:
+        return ""
+
+    cleaned = _CLEAN_AMOUNT_RE.sub('', ingredients.lower())
+    cleaned = _CLEAN_SYMBOL_RE.sub(' ', cleaned)
+    cleaned = _SPACE_RE.sub(' ', cleaned).strip()
+    return cleaned
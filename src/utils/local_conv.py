@@ -1,14 +1,179 @@
-from src.db.cocktail import *
+"""
+DB 데이터를 로컬 파일(CSV / XLSX)로 내보냅니다.
+
+테이블 전체를 한 번에 읽지 않고 fetchmany 청크 단위로 읽어 바로 기록하므로
+테이블 크기와 관계없이 메모리 사용량이 일정합니다.
+
+사용 예:
+    python -m src.utils.local_conv --format csv --out data/export
+    python -m src.utils.local_conv --format xlsx --out data/export --tables Cocktail
+"""
+
+import argparse
 import csv
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.db.conn import db_connect
+
+CHUNK_SIZE = 1000
+
+# 내보낼 테이블 (DB에 존재하는 테이블만 내보냄. 주문이 SQLite에 저장된 경우 Orders 포함)
+EXPORT_TABLES = ('Cocktail', 'Orders')
+
+
+def print_progress(table: str, done: int, total: int):
+    """진행 상황을 한 줄로 갱신하며 출력합니다."""
+    percent = (done / total * 100) if total else 100.0
+    end = "\n" if done >= total else ""
+    print(f"\r{table}: {done:,}/{total:,} ({percent:.1f}%)", end=end, flush=True)
+
+
+def _existing_tables(conn) -> set:
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+    return {row[0] for row in rows}
+
+
+def iter_table_chunks(conn, table: str, chunk_size: int = CHUNK_SIZE):
+    """
+    테이블을 chunk_size 행씩 읽어 (컬럼명, 행 리스트)를 순서대로 돌려줍니다.
+    첫 번째 값은 컬럼명 리스트이고 이후 값들은 행 청크입니다.
+    """
+    if table not in _existing_tables(conn):
+        raise ValueError(f"존재하지 않는 테이블: {table}")
+
+    cursor = conn.cursor()
+    cursor.execute(f'SELECT * FROM "{table}"')
+    yield [col[0] for col in cursor.description]
+
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield rows
+
+
+def _count_rows(conn, table: str) -> int:
+    return conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+
+
+def db_to_csv(table: str = 'Cocktail', out_path: str = None, chunk_size: int = CHUNK_SIZE,
+              progress=print_progress) -> int:
+    """
+    테이블을 CSV 파일로 스트리밍 저장합니다.
+
+    Returns:
+        저장한 행 수
+    """
+    out_path = out_path or f"{table}.csv"
+    conn = db_connect()
+    try:
+        total = _count_rows(conn, table)
+        chunks = iter_table_chunks(conn, table, chunk_size)
+        columns = next(chunks)
+        done = 0
+
+        with open(out_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for rows in chunks:
+                writer.writerows(rows)
+                done += len(rows)
+                if progress:
+                    progress(table, done, total)
+
+        if progress and done == 0:
+            progress(table, 0, 0)
+        return done
+    finally:
+        conn.close()
+
+
+def db_to_xlsx(table: str = 'Cocktail', out_path: str = None, chunk_size: int = CHUNK_SIZE,
+               progress=print_progress) -> int:
+    """
+    테이블을 XLSX 파일로 스트리밍 저장합니다.
+    xlsxwriter의 constant_memory 모드를 사용하여 행을 기록하는 즉시 디스크로 내보냅니다.
+
+    Returns:
+        저장한 행 수
+    """
+    import xlsxwriter
+
+    out_path = out_path or f"{table}.xlsx"
+    conn = db_connect()
+    workbook = xlsxwriter.Workbook(out_path, {'constant_memory': True})
+    try:
+        worksheet = workbook.add_worksheet(table[:31])
+        header_format = workbook.add_format({'bold': True})
+
+        total = _count_rows(conn, table)
+        chunks = iter_table_chunks(conn, table, chunk_size)
+        columns = next(chunks)
+        worksheet.write_row(0, 0, columns, header_format)
+        done = 0
+
+        # constant_memory 모드에서는 반드시 행 순서대로 기록해야 함
+        for rows in chunks:
+            for row in rows:
+                done += 1
+                worksheet.write_row(done, 0, row)
+            if progress:
+                progress(table, done, total)
+
+        if progress and done == 0:
+            progress(table, 0, 0)
+        return done
+    finally:
+        workbook.close()
+        conn.close()
+
+
+def download_local_data(out_dir: str = '.', fmt: str = 'csv', tables=EXPORT_TABLES,
+                        chunk_size: int = CHUNK_SIZE, progress=print_progress) -> dict:
+    """
+    DB에 존재하는 내보내기 대상 테이블을 out_dir에 저장합니다.
+
+    Returns:
+        {테이블명: 저장한 행 수}
+    """
+    if fmt not in ('csv', 'xlsx'):
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+
+    os.makedirs(out_dir, exist_ok=True)
+    export = db_to_csv if fmt == 'csv' else db_to_xlsx
+
+    conn = db_connect()
+    try:
+        existing = _existing_tables(conn)
+    finally:
+        conn.close()
+
+    results = {}
+    for table in tables:
+        if table not in existing:
+            continue
+        out_path = os.path.join(out_dir, f"{table}.{fmt}")
+        results[table] = export(table, out_path, chunk_size=chunk_size, progress=progress)
+    return results
+
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DB 데이터를 CSV/XLSX로 내보냅니다.")
+    parser.add_argument('--format', dest='fmt', choices=['csv', 'xlsx'], default='csv')
+    parser.add_argument('--out', default='.', help="저장할 폴더")
+    parser.add_argument('--tables', nargs='+', default=list(EXPORT_TABLES))
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
 
-print(cocktail_select())
+    results = download_local_data(args.out, args.fmt, args.tables, args.chunk_size)
+    for table, count in results.items():
+        print(f"{table}: {count:,}행 저장 완료")
+    return 0
 
 
-# def db_to_csv():
-#
-#   return 0
-#
-# def download_local_data() :
-#   return 0
-#
+if __name__ == "__main__":
+    main()